@@ -0,0 +1,65 @@
+"""Compare per-resort fetches with the batched search fetch.
+
+Run from the repository root:
+
+    python benchmarks/bench_batch.py
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import time
+
+import aiohttp
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from custom_components.fnugg.api import FnuggApiClient, FnuggResortBatcher  # noqa: E402
+from custom_components.fnugg.sensor import FnuggData  # noqa: E402
+from payloads import make_blog_post, make_resort  # noqa: E402
+from stub_server import StubFnuggApi  # noqa: E402
+
+LATENCY = 0.02
+
+
+async def run(resort_count, batched, missing=()):
+    """Update ``resort_count`` resorts once and return (requests, seconds)."""
+    resorts = [make_resort(resort_id) for resort_id in range(1, resort_count + 1)]
+    posts = {str(resort_id): [make_blog_post(resort_id)] for resort_id in range(1, resort_count + 1)}
+    stub = StubFnuggApi(resorts, posts, latency=LATENCY, missing=missing)
+    base_url = await stub.start()
+    try:
+        async with aiohttp.ClientSession() as session:
+            client = FnuggApiClient(session, base_url=base_url)
+            batcher = FnuggResortBatcher(client, delay=0) if batched else None
+            datas = [
+                FnuggData(client, str(resort_id), f"Resort {resort_id}", batcher=batcher)
+                for resort_id in range(1, resort_count + 1)
+            ]
+            start = time.perf_counter()
+            results = await asyncio.gather(*(data.update_data() for data in datas))
+            elapsed = time.perf_counter() - start
+            assert all(results)
+    finally:
+        await stub.stop()
+    return stub.requests, elapsed
+
+
+async def main():
+    print(f"{'resorts':>7} {'mode':>8} {'requests':>8} {'resort/search':>13} {'wall ms':>8}")
+    for resort_count in (1, 10, 50):
+        # "partial" leaves every tenth resort out of the batch to exercise the fallback
+        for mode in ("single", "batched", "partial"):
+            missing = range(10, resort_count + 1, 10) if mode == "partial" else ()
+            requests, elapsed = await run(resort_count, mode != "single", missing)
+            split = f"{requests['resort']}/{requests['search']}"
+            print(
+                f"{resort_count:>7} {mode:>8} "
+                f"{sum(requests.values()):>8} {split:>13} {elapsed * 1000:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
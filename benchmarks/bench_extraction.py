@@ -0,0 +1,120 @@
+"""Compare the compiled sensor extraction with hand-written extraction.
+
+Three cases build the resort sensors from the same ``_source``:
+
+* ``handwritten``: the chained ``.get()`` calls used before the sensor table,
+  which only read the top elevation
+* ``interpreted``: the sensor table, walking each entry's path on its own
+* ``compiled``: ``extract_resort``, the table flattened into lookup lists
+  read by one function
+
+The script checks that all three agree on the sensors they share.
+
+Run from the repository root:
+
+    python benchmarks/bench_extraction.py
+"""
+from __future__ import annotations
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from custom_components.fnugg.descriptions import SENSOR_DESCRIPTIONS  # noqa: E402
+from custom_components.fnugg.extraction import extract_resort  # noqa: E402
+from payloads import make_resort  # noqa: E402
+
+ROUNDS = 20000
+DIRECTION = ['N', 'NNE', 'NE', 'ENE', 'E', 'ESE', 'SE', 'SSE', 'S', 'SSW', 'SW', 'WSW', 'W', 'WNW', 'NW', 'NNW', 'N']
+
+
+def handwritten(source):
+    """The extraction as it was written before the sensor table."""
+    conditions = source.get("conditions", {}).get("combined", {}).get("top", {})
+    lifts = source.get("lifts", {})
+    lifts_total = int(lifts.get("count", 0))
+    lifts_open = int(lifts.get("open", 0))
+    lifts_percentage = round((lifts_open / lifts_total * 100) if lifts_total > 0 else 0)
+    slopes = source.get("slopes", {})
+    slopes_total = int(slopes.get("count", 0))
+    slopes_open = int(slopes.get("open", 0))
+    slopes_percentage = round((slopes_open / slopes_total * 100) if slopes_total > 0 else 0)
+    current_report = source.get("conditions", {}).get("current_report", {}).get("top", {})
+    images = source.get("images", {})
+    wind_direction = conditions.get("wind", {}).get("degree")
+    wind_direction_text = DIRECTION[int((wind_direction + 11.25) / 22.5)] if wind_direction is not None else None
+    return {
+        "temp": conditions.get("temperature", {}).get("value"),
+        "wind_speed": conditions.get("wind", {}).get("mps"),
+        "wind_direction": wind_direction,
+        "wind_direction_text": wind_direction_text,
+        "condition_text": conditions.get("condition_description"),
+        "snow_depth": conditions.get("snow", {}).get("depth_slope"),
+        "new_snow": conditions.get("snow", {}).get("today"),
+        "lifts_total": lifts_total,
+        "lifts_open": lifts_open,
+        "lifts_percentage": lifts_percentage,
+        "lifts_status_text": f"{lifts_open} of {lifts_total} lifts open ({lifts_percentage}%)",
+        "slopes_total": slopes_total,
+        "slopes_open": slopes_open,
+        "slopes_percentage": slopes_percentage,
+        "slopes_status_text": f"{slopes_open} of {slopes_total} slopes open ({slopes_percentage}%)",
+        "resort_status": source.get("resort_status") or ("Open" if source.get("resort_open") else "Closed"),
+        "resort_opening_date": source.get("resort_opening_date", ""),
+        "resort_closing_date": source.get("resort_closing_date", ""),
+        "last_updated": source.get("last_updated", ""),
+        "daily_report": current_report.get("condition_description"),
+        "resort_image": images.get("image_full"),
+        "resort_open": source.get("resort_open"),
+        "resort_open_override": source.get("resort_open_override"),
+    }
+
+
+TABLE = [
+    description for description in SENSOR_DESCRIPTIONS.values()
+    if description.source is not None or description.compute is not None
+]
+
+
+def interpreted(source):
+    """The sensor table walked entry by entry, without compiling it."""
+    values = {}
+    for description in TABLE:
+        value = None
+        if description.source is not None:
+            value = source
+            for key in description.source.split("."):
+                value = value.get(key) if isinstance(value, dict) else None
+            if value is not None and description.transform is not None:
+                value = description.transform(value)
+        values[description.key] = description.default if value is None else value
+    for description in TABLE:
+        if description.compute is not None:
+            values[description.key] = description.compute(values)
+    return values
+
+
+def main():
+    source = make_resort(1)["_source"]
+    expected = handwritten(source)
+    for case in (interpreted, extract_resort):
+        values = case(source)
+        mismatched = {key for key in expected if values[key] != expected[key]}
+        if mismatched:
+            raise SystemExit(f"{case.__name__} differs on {sorted(mismatched)}")
+
+    print(f"{'case':>12} {'sensors':>8} {'us/payload':>11}")
+    for name, case in (
+        ("handwritten", handwritten),
+        ("interpreted", interpreted),
+        ("compiled", extract_resort),
+    ):
+        seconds = min(timeit.repeat(lambda: case(source), number=ROUNDS, repeat=5))
+        print(f"{name:>12} {len(case(source)):>8} {seconds / ROUNDS * 1e6:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
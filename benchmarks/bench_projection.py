@@ -0,0 +1,85 @@
+"""Measure bytes transferred and decode time for the resort fetch.
+
+Compares three cases against the local stub API:
+
+* ``full``: the old fetch, the whole document decoded with ``json.loads``
+* ``ignored``: ``sourceFields`` sent but ignored by the server, decoded with
+  ``project_document``, which also drops the unused paths
+* ``projected``: ``sourceFields`` honored by the server
+
+Run from the repository root:
+
+    python benchmarks/bench_projection.py
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import aiohttp
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from custom_components.fnugg.projection import (  # noqa: E402
+    RESORT_TREE,
+    SOURCE_FIELDS,
+    project_document,
+)
+from payloads import make_resort  # noqa: E402
+from stub_server import StubFnuggApi  # noqa: E402
+
+ROUNDS = 200
+
+
+def measure(decode, raw):
+    """Return (mean decode ms, peak decode KiB) for ``raw``."""
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        decode(raw)
+    elapsed = (time.perf_counter() - start) / ROUNDS
+    tracemalloc.start()
+    decode(raw)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed * 1000, peak / 1024
+
+
+async def fetch(session, base_url, params):
+    async with session.get(f"{base_url}/get/resort/1/", params=params) as resp:
+        return await resp.read()
+
+
+async def main():
+    print(f"{'lifts':>5} {'case':>10} {'bytes':>8} {'decode ms':>10} {'peak KiB':>9}")
+    for lifts in (5, 30, 200):
+        resort = make_resort(1, lifts=lifts, slopes=lifts)
+        stub = StubFnuggApi([resort])
+        base_url = await stub.start()
+        fields = {"sourceFields": ",".join(SOURCE_FIELDS)}
+        try:
+            async with aiohttp.ClientSession() as session:
+                full = await fetch(session, base_url, {})
+                projected = await fetch(session, base_url, fields)
+        finally:
+            await stub.stop()
+
+        def project(raw):
+            return project_document(raw, RESORT_TREE)
+
+        cases = (
+            ("full", full, json.loads),
+            ("ignored", full, project),
+            ("projected", projected, project),
+        )
+        for name, raw, decode in cases:
+            decode_ms, peak = measure(decode, raw)
+            print(f"{lifts:>5} {name:>10} {len(raw):>8} {decode_ms:>10.3f} {peak:>9.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
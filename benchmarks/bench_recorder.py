@@ -0,0 +1,261 @@
+"""Estimate the recorder database growth caused by the Fnugg entities.
+
+Resorts are fetched from the local stub API every update interval for a
+number of simulated days, with the payloads changing a little between
+fetches. Every state the entities would write is passed through a model of
+the recorder:
+
+* each state change adds a ``states`` row
+* the attributes are stored once per distinct JSON in ``state_attributes``,
+  the way the recorder deduplicates them, after dropping the attributes the
+  entity class marks as unrecorded
+
+The same run is counted twice: ``before`` records every attribute and keeps
+the per-scale mobile picture URLs of the blog post in its attributes, as
+earlier versions did; ``after`` applies the current entity classes. Results
+are reported per day and per kind of entity.
+
+Run from the repository root:
+
+    python benchmarks/bench_recorder.py
+    python benchmarks/bench_recorder.py --resorts 50 --days 3 --output recorder.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+
+import aiohttp
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from homeassistant.components.sensor import SensorEntity  # noqa: E402
+
+from custom_components.fnugg.aggregates import (  # noqa: E402
+    RANKED_METRICS,
+    RESORTS_OPEN,
+    FnuggAggregates,
+)
+from custom_components.fnugg.api import FnuggApiClient  # noqa: E402
+from custom_components.fnugg.blog import build_blog_sensor  # noqa: E402
+from custom_components.fnugg.const import UPDATE_INTERVAL  # noqa: E402
+from custom_components.fnugg.descriptions import (  # noqa: E402
+    METRIC_SENSORS,
+    sensor_description,
+)
+from custom_components.fnugg.sensor import (  # noqa: E402
+    Fnugg,
+    FnuggAggregateSensor,
+    FnuggBlogSensor,
+    FnuggData,
+    FnuggMetricSensor,
+)
+from payloads import make_blog_post, make_resort, vary_resort  # noqa: E402
+from stub_server import StubFnuggApi  # noqa: E402
+
+ROUNDS_PER_DAY = int(86400 // UPDATE_INTERVAL.total_seconds())
+
+
+def unrecorded(entity_class):
+    """Return the attribute names the recorder skips for an entity class."""
+    return entity_class._unrecorded_attributes | SensorEntity._entity_component_unrecorded_attributes
+
+
+def base_attributes(sensor_id):
+    """Return the attributes Home Assistant adds from an entity description."""
+    description = sensor_description(sensor_id)
+    attrs = {"friendly_name": f"Resort {description.name or sensor_id}"}
+    if description.icon:
+        attrs["icon"] = description.icon
+    if description.native_unit_of_measurement:
+        attrs["unit_of_measurement"] = description.native_unit_of_measurement
+    if description.device_class:
+        attrs["device_class"] = str(description.device_class)
+    if description.state_class:
+        attrs["state_class"] = str(description.state_class)
+    return attrs
+
+
+def legacy_blog_attributes(post):
+    """Return the blog sensor attributes including the mobile picture URLs."""
+    attrs = dict(build_blog_sensor(post)[1])
+    for scale, sizes in ((post.get("images") or {}).get("mobile") or {}).items():
+        for size, url in sizes.items():
+            attrs[f"image_mobile_{scale}_{size}"] = url
+    return attrs
+
+
+class RecorderModel:
+    """Rows and bytes the recorder would add for a stream of state writes."""
+
+    def __init__(self, apply_unrecorded):
+        """Initialize an empty database."""
+        self._apply_unrecorded = apply_unrecorded
+        self._last = {}
+        self._shared_attrs = set()
+        self.groups = {}
+
+    def write(self, group, entity_id, state, attrs, excluded=frozenset()):
+        """Record one state write, unless it repeats the current state."""
+        if self._last.get(entity_id) == (state, attrs):
+            return
+        self._last[entity_id] = (state, attrs)
+        counts = self.groups.setdefault(
+            group,
+            {"states_rows": 0, "state_bytes": 0, "attributes_rows": 0, "attributes_bytes": 0},
+        )
+        counts["states_rows"] += 1
+        counts["state_bytes"] += len(str(state))
+        if self._apply_unrecorded:
+            attrs = {key: value for key, value in attrs.items() if key not in excluded}
+        shared = json.dumps(attrs, default=str, separators=(",", ":"))
+        if shared not in self._shared_attrs:
+            self._shared_attrs.add(shared)
+            counts["attributes_rows"] += 1
+            counts["attributes_bytes"] += len(shared)
+
+    def totals(self):
+        """Return the counts summed over all groups."""
+        totals = dict.fromkeys(("states_rows", "state_bytes", "attributes_rows", "attributes_bytes"), 0)
+        for counts in self.groups.values():
+            for key, value in counts.items():
+                totals[key] += value
+        return totals
+
+
+async def run(resorts, lifts, days, metrics):
+    """Simulate ``days`` of updates and return the before and after models."""
+    rnd = random.Random(resorts)
+    documents = [make_resort(resort_id, lifts=lifts, slopes=lifts) for resort_id in range(1, resorts + 1)]
+    posts = {str(resort_id): [make_blog_post(resort_id)] for resort_id in range(1, resorts + 1)}
+    stub = StubFnuggApi(documents, blog_posts=posts)
+    base_url = await stub.start()
+
+    models = {"before": RecorderModel(False), "after": RecorderModel(True)}
+    aggregates = FnuggAggregates()
+    aggregate_sensors = [
+        FnuggAggregateSensor(aggregates, sensor_id) for sensor_id in (*RANKED_METRICS, RESORTS_OPEN)
+    ]
+    base = {}
+
+    def write(group, entity_id, sensor_id, sensor, entity_class, legacy_attrs=None):
+        if sensor_id not in base:
+            base[sensor_id] = base_attributes(sensor_id)
+        attrs = {**(sensor[1] or {}), **base[sensor_id]}
+        excluded = unrecorded(entity_class)
+        models["after"].write(group, entity_id, sensor[0], attrs, excluded)
+        if legacy_attrs is not None:
+            attrs = {**legacy_attrs, **base[sensor_id]}
+        models["before"].write(group, entity_id, sensor[0], attrs)
+
+    try:
+        async with aiohttp.ClientSession() as session:
+            client = FnuggApiClient(session, base_url=base_url)
+            datas = [
+                FnuggData(client, str(resort_id), f"Resort {resort_id}")
+                for resort_id in range(1, resorts + 1)
+            ]
+            for round_index in range(days * ROUNDS_PER_DAY):
+                if round_index:
+                    for document in stub.resorts.values():
+                        vary_resort(document, rnd, share=0.02)
+                if round_index % ROUNDS_PER_DAY == ROUNDS_PER_DAY // 2:
+                    # A new blog post for every resort once a day
+                    post_id = round_index // ROUNDS_PER_DAY + 2
+                    for site in posts:
+                        posts[site] = [make_blog_post(site, post_id)]
+                await asyncio.gather(*(data.update_data() for data in datas))
+
+                for data in datas:
+                    resort_id = data.resort_id
+                    aggregates.async_update_resort(resort_id, data._resort_name, data.sensors)
+                    for sensor_id, sensor in data.sensors.items():
+                        if sensor_description(sensor_id).entity_registry_enabled_default:
+                            write("resort", f"{resort_id}.{sensor_id}", sensor_id, sensor, Fnugg)
+                    post = posts[resort_id][0]["_source"]
+                    write(
+                        "blog",
+                        f"{resort_id}.blog_post_title",
+                        "blog_post_title",
+                        build_blog_sensor(post),
+                        FnuggBlogSensor,
+                        legacy_blog_attributes(post),
+                    )
+                    if metrics:
+                        for sensor_id in METRIC_SENSORS:
+                            write(
+                                "metrics",
+                                f"{resort_id}.{sensor_id}",
+                                sensor_id,
+                                data.build_metric_sensor(sensor_id),
+                                FnuggMetricSensor,
+                            )
+                for entity in aggregate_sensors:
+                    write(
+                        "aggregates",
+                        entity._sensor_id,
+                        entity._sensor_id,
+                        entity._build_sensor(),
+                        FnuggAggregateSensor,
+                    )
+    finally:
+        await stub.stop()
+    return models, sum(stub.requests.values())
+
+
+def per_day(counts, days):
+    return {key: round(value / days, 1) for key, value in counts.items()}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resorts", type=int, default=10, help="number of resorts")
+    parser.add_argument("--lifts", type=int, default=30, help="lifts per resort")
+    parser.add_argument("--days", type=int, default=2, help="simulated days")
+    parser.add_argument(
+        "--no-metrics",
+        dest="metrics",
+        action="store_false",
+        help="leave the diagnostic metric sensors disabled, as they are by default",
+    )
+    parser.add_argument("--output", help="write the JSON results to this file")
+    args = parser.parse_args()
+
+    models, requests = await run(args.resorts, args.lifts, args.days, args.metrics)
+    report = {
+        "resorts": args.resorts,
+        "lifts": args.lifts,
+        "days": args.days,
+        "metric_sensors": args.metrics,
+        "requests_per_day": round(requests / args.days, 1),
+    }
+    print(
+        f"{'':>10} {'group':>10} {'states/day':>11} {'attr rows/day':>14} {'attr KiB/day':>13}",
+        file=sys.stderr,
+    )
+    for name, model in models.items():
+        groups = {group: per_day(counts, args.days) for group, counts in model.groups.items()}
+        groups["total"] = per_day(model.totals(), args.days)
+        report[name] = groups
+        for group, counts in groups.items():
+            print(
+                f"{name:>10} {group:>10} {counts['states_rows']:>11.0f} "
+                f"{counts['attributes_rows']:>14.0f} {counts['attributes_bytes'] / 1024:>13.1f}",
+                file=sys.stderr,
+            )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,254 @@
+"""Measure the cost of FnuggData.update_data() against the local stub API.
+
+Every scenario updates a number of resorts for a few rounds, changing the
+payloads a little between rounds the way a running resort does. For each
+scenario it reports:
+
+* ``update_ms``: latency of single ``update_data()`` calls (mean, p50, p95, max)
+* ``round_ms``: wall time to update all resorts once
+* ``alloc_peak_kib`` / ``alloc_retained_kib``: tracemalloc peak and retained
+  memory for one traced round
+* ``state_writes`` / ``state_writes_skipped``: state writes the entities
+  would make, using the same comparison as the entities themselves
+* ``requests`` and ``bytes``: served by the stub, per round
+* ``failures``: calls that raised or returned False
+
+Results are written as JSON, so runs on two versions can be compared.
+Resort documents recorded from the real API (``get/resort/{id}`` responses
+saved as ``*.json``) can be used instead of synthetic ones with
+``--recorded DIR``.
+
+Run from the repository root:
+
+    python benchmarks/bench_update.py --output results.json
+    python benchmarks/bench_update.py --quick
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import copy
+import glob
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+import aiohttp
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from custom_components.fnugg import api  # noqa: E402
+from custom_components.fnugg.api import FnuggApiClient, FnuggResortBatcher  # noqa: E402
+from custom_components.fnugg.sensor import FnuggData  # noqa: E402
+from payloads import make_resort, vary_resort  # noqa: E402
+from stub_server import StubFnuggApi  # noqa: E402
+
+MANIFEST = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "custom_components",
+    "fnugg",
+    "manifest.json",
+)
+
+# (name, resorts, lifts, latency seconds, error rate, batched)
+SCENARIOS = [
+    *(
+        (f"{resorts}x{lifts}", resorts, lifts, 0.0, 0.0, True)
+        for resorts in (1, 10, 100)
+        for lifts in (5, 30, 200)
+    ),
+    ("10x30-single", 10, 30, 0.0, 0.0, False),
+    ("10x30-slow", 10, 30, 0.25, 0.0, True),
+    ("10x30-slow-single", 10, 30, 0.25, 0.0, False),
+    ("10x30-erroring", 10, 30, 0.0, 0.2, False),
+    ("100x30-erroring", 100, 30, 0.0, 0.2, True),
+]
+QUICK = ("1x5", "10x30", "10x30-single", "10x30-slow", "10x30-erroring")
+
+
+def load_recorded(directory):
+    """Return the resort documents saved in ``directory``."""
+    resorts = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+        with open(path, encoding="utf-8") as file:
+            resorts.append(json.load(file))
+    if not resorts:
+        raise SystemExit(f"No *.json resort documents in {directory}")
+    return resorts
+
+
+def count_writes(previous, sensors):
+    """Return (writes, skipped) for one update of all sensors of a resort."""
+    writes = 0
+    for sensor_id, sensor in sensors.items():
+        if previous.get(sensor_id) != sensor:
+            writes += 1
+    return writes, len(sensors) - writes
+
+
+def percentile(values, share):
+    """Return the value below which ``share`` of ``values`` fall."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * share))]
+
+
+async def run_scenario(name, resorts, lifts, latency, error_rate, batched, rounds, recorded):
+    """Run one scenario and return its result dict."""
+    rnd = random.Random(name)
+    if recorded:
+        documents = [copy.deepcopy(recorded[i % len(recorded)]) for i in range(resorts)]
+        for resort_id, document in enumerate(documents, start=1):
+            document["_id"] = str(resort_id)
+    else:
+        documents = [make_resort(resort_id, lifts=lifts, slopes=lifts) for resort_id in range(1, resorts + 1)]
+    stub = StubFnuggApi(documents, latency=latency, error_rate=error_rate)
+    base_url = await stub.start()
+
+    latencies = []
+    round_times = []
+    failures = 0
+    writes = skipped = 0
+    peak = retained = 0
+    try:
+        async with aiohttp.ClientSession() as session:
+            client = FnuggApiClient(session, base_url=base_url)
+            batcher = FnuggResortBatcher(client, delay=0) if batched else None
+            datas = [
+                FnuggData(client, str(resort_id), f"Resort {resort_id}", batcher=batcher)
+                for resort_id in range(1, resorts + 1)
+            ]
+            previous = [{} for _ in datas]
+
+            async def timed_update(data):
+                start = time.perf_counter()
+                try:
+                    updated = await data.update_data()
+                except api.FnuggApiError:
+                    updated = False
+                latencies.append(time.perf_counter() - start)
+                return updated
+
+            # The last round is traced; tracing slows it down, so it is not timed
+            for round_index in range(rounds + 1):
+                traced = round_index == rounds
+                if round_index:
+                    for document in stub.resorts.values():
+                        if "conditions" in document["_source"] and "lifts" in document["_source"]:
+                            vary_resort(document, rnd)
+                if traced:
+                    latencies_before = len(latencies)
+                    tracemalloc.start()
+                    before = tracemalloc.get_traced_memory()[0]
+                start = time.perf_counter()
+                results = await asyncio.gather(*(timed_update(data) for data in datas))
+                elapsed = time.perf_counter() - start
+                if traced:
+                    current, peak = tracemalloc.get_traced_memory()
+                    tracemalloc.stop()
+                    retained = current - before
+                    del latencies[latencies_before:]
+                else:
+                    round_times.append(elapsed)
+                failures += results.count(False)
+                # The first round creates the entities, so it does not count
+                for index, data in enumerate(datas):
+                    if round_index and results[index]:
+                        written, unchanged = count_writes(previous[index], data.sensors)
+                        writes += written
+                        skipped += unchanged
+                    if results[index]:
+                        previous[index] = data.sensors
+    finally:
+        await stub.stop()
+
+    requests = sum(stub.requests.values())
+    return {
+        "scenario": name,
+        "resorts": resorts,
+        "lifts": lifts,
+        "latency_s": latency,
+        "error_rate": error_rate,
+        "batched": batched,
+        "rounds": rounds,
+        "update_ms": {
+            "mean": statistics.fmean(latencies) * 1000,
+            "p50": percentile(latencies, 0.5) * 1000,
+            "p95": percentile(latencies, 0.95) * 1000,
+            "max": max(latencies) * 1000,
+        },
+        "round_ms": statistics.fmean(round_times) * 1000,
+        "alloc_peak_kib": peak / 1024,
+        "alloc_retained_kib": retained / 1024,
+        "state_writes": writes,
+        "state_writes_skipped": skipped,
+        "requests": requests / (rounds + 1),
+        "bytes": stub.bytes_sent / (rounds + 1),
+        "failures": failures,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", help="write the JSON results to this file")
+    parser.add_argument("--rounds", type=int, default=5, help="timed rounds per scenario")
+    parser.add_argument("--quick", action="store_true", help="run a small subset of the scenarios")
+    parser.add_argument("--scenario", action="append", help="run only this scenario (repeatable)")
+    parser.add_argument("--recorded", help="directory of recorded resort documents")
+    parser.add_argument(
+        "--retry-delay",
+        type=float,
+        default=0.01,
+        help="base retry delay in seconds for erroring servers",
+    )
+    args = parser.parse_args()
+
+    # Retries back off from this base delay; the real one would dominate the timings
+    api.RETRY_BASE_DELAY = args.retry_delay
+    recorded = load_recorded(args.recorded) if args.recorded else None
+    selected = args.scenario or (QUICK if args.quick else None)
+
+    with open(MANIFEST, encoding="utf-8") as file:
+        version = json.load(file)["version"]
+    results = []
+    print(
+        f"{'scenario':>18} {'mean ms':>8} {'p95 ms':>8} {'round ms':>9} "
+        f"{'peak KiB':>9} {'writes':>7} {'skipped':>8} {'req/rnd':>8} {'fail':>5}",
+        file=sys.stderr,
+    )
+    for scenario in SCENARIOS:
+        if selected and scenario[0] not in selected:
+            continue
+        result = await run_scenario(*scenario, args.rounds, recorded)
+        results.append(result)
+        print(
+            f"{result['scenario']:>18} {result['update_ms']['mean']:>8.2f} "
+            f"{result['update_ms']['p95']:>8.2f} {result['round_ms']:>9.1f} "
+            f"{result['alloc_peak_kib']:>9.0f} {result['state_writes']:>7} "
+            f"{result['state_writes_skipped']:>8} {result['requests']:>8.1f} "
+            f"{result['failures']:>5}",
+            file=sys.stderr,
+        )
+
+    report = {
+        "version": version,
+        "python": platform.python_version(),
+        "aiohttp": aiohttp.__version__,
+        "recorded": bool(recorded),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
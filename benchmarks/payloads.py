@@ -0,0 +1,127 @@
+"""Synthetic Fnugg API payloads for the benchmarks."""
+from __future__ import annotations
+
+import random
+
+DAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+DIFFICULTIES = ("green", "blue", "red", "black")
+
+
+def make_resort(resort_id, lifts=30, slopes=40, seed=None):
+    """Return a resort document shaped like ``get/resort/{id}``."""
+    rnd = random.Random(seed if seed is not None else resort_id)
+    lift_list = [
+        {
+            "id": int(resort_id) * 1000 + i,
+            "name": f"Lift {i}",
+            "status": rnd.randint(0, 1),
+            "slope_difficulty": rnd.choice(DIFFICULTIES),
+        }
+        for i in range(lifts)
+    ]
+    slope_list = [
+        {
+            "id": int(resort_id) * 1000 + 500 + i,
+            "name": f"Slope {i}",
+            "status": rnd.randint(0, 1),
+            "difficulty": rnd.choice(DIFFICULTIES),
+        }
+        for i in range(slopes)
+    ]
+
+    def elevation():
+        return {
+            "temperature": {"value": rnd.randint(-20, 5), "unit": "celsius"},
+            "wind": {"mps": round(rnd.uniform(0, 15), 1), "degree": rnd.randint(0, 359), "speed": "Light breeze"},
+            "condition_description": rnd.choice(("Clear", "Cloudy", "Snow")),
+            "snow": {"depth_slope": rnd.randint(0, 250), "depth_terrain": rnd.randint(0, 200), "today": rnd.randint(0, 30), "week": rnd.randint(0, 80)},
+            "symbol": {"fnugg_id": rnd.randint(1, 20), "yr_id": rnd.randint(1, 20), "name": "Sun"},
+            "last_updated": "2025-01-10T07:00:00+01:00",
+        }
+
+    return {
+        "_index": "fnugg",
+        "_type": "resort",
+        "_id": str(resort_id),
+        "_source": {
+            "name": f"Resort {resort_id}",
+            "site_path": f"resort-{resort_id}",
+            "description": "Lorem ipsum dolor sit amet. " * 80,
+            "contact": {"phone": "+47 12345678", "email": f"post@resort{resort_id}.no", "address": "Skiveien 1"},
+            "location": {"lat": 58 + rnd.uniform(0, 12), "lng": 5 + rnd.uniform(0, 25)},
+            "region": ["Østlandet"],
+            "resort_open": bool(rnd.randint(0, 1)),
+            "resort_open_override": None,
+            "resort_status": None,
+            "resort_opening_date": "2024-11-30T00:00:00+01:00",
+            "resort_closing_date": "2025-04-21T00:00:00+02:00",
+            "last_updated": "2025-01-10T07:12:00+01:00",
+            "conditions": {
+                "combined": {"top": elevation(), "bottom": elevation()},
+                "current_report": {"top": elevation(), "bottom": elevation()},
+                "forecast": {
+                    "long": [elevation() for _ in range(10)],
+                    "today": {"top": elevation(), "bottom": elevation()},
+                },
+            },
+            "lifts": {"count": lifts, "open": sum(lift["status"] for lift in lift_list), "list": lift_list},
+            "slopes": {"count": slopes, "open": sum(slope["status"] for slope in slope_list), "list": slope_list},
+            "opening_hours": {
+                **{day: {"from": "09:00", "to": "16:30"} for day in DAYS[:6]},
+                "sunday": {"from": "10:00", "to": "16:00"},
+                "exception_days": [
+                    {"date": "2024-12-24T00:00:00Z", "closed": True},
+                    {"date": "2024-12-31T00:00:00Z", "from": "10:00", "to": "14:00"},
+                    {"date": "2025-04-18T00:00:00Z", "from": "09:00", "to": "17:00"},
+                ],
+            },
+            "images": {
+                "image_full": f"https://cdn.fnugg.no/resort/{resort_id}/full.jpg",
+                "image_1_1_s": f"https://cdn.fnugg.no/resort/{resort_id}/1_1_s.jpg",
+                "image_16_9_m": f"https://cdn.fnugg.no/resort/{resort_id}/16_9_m.jpg",
+            },
+            "webcams": [
+                {"name": f"Cam {i}", "url": f"https://cam.fnugg.no/{resort_id}/{i}.jpg"}
+                for i in range(8)
+            ],
+            "trailmap": {"image": f"https://cdn.fnugg.no/resort/{resort_id}/map.jpg", "geojson": [[rnd.random(), rnd.random()] for _ in range(200)]},
+        },
+    }
+
+
+def make_blog_post(resort_id, post_id=1):
+    """Return a blog post hit shaped like ``search?type=blog_post``."""
+    return {
+        "_id": f"{resort_id}-{post_id}",
+        "_source": {
+            "title": f"News from resort {resort_id} #{post_id}",
+            "description": "Fresh snow and all lifts running.",
+            "date": "2025-01-09T10:00:00+01:00",
+            "modified": "2025-01-09T11:00:00+01:00",
+            "site": {"id": int(resort_id)},
+            "author": {"name": "Resort staff"},
+            "images": {
+                "image_full": f"https://cdn.fnugg.no/blog/{resort_id}/{post_id}/full.jpg",
+                "image_16_9_m": f"https://cdn.fnugg.no/blog/{resort_id}/{post_id}/16_9_m.jpg",
+                "mobile": {
+                    scale: {size: f"https://cdn.fnugg.no/blog/{resort_id}/{post_id}/{scale}_{size}.jpg" for size in ("s", "m", "l")}
+                    for scale in ("1x", "2x", "3x")
+                },
+            },
+        },
+    }
+
+
+def vary_resort(resort, rnd, share=0.1):
+    """Change conditions and a ``share`` of the lift statuses in place.
+
+    Stands in for what changes between two fetches of a running resort.
+    """
+    source = resort["_source"]
+    top = source["conditions"]["combined"]["top"]
+    top["temperature"]["value"] += rnd.choice((-1, 0, 1))
+    top["wind"]["mps"] = round(rnd.uniform(0, 15), 1)
+    lifts = source["lifts"]["list"]
+    for lift in rnd.sample(lifts, round(len(lifts) * share)):
+        lift["status"] = 1 - lift["status"]
+    source["lifts"]["open"] = sum(lift["status"] for lift in lifts)
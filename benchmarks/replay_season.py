@@ -0,0 +1,457 @@
+"""Replay a ski season through the integration on a simulated clock.
+
+A timeline of resort payloads is served by the local stub API. Lifts open
+and close with the opening hours, including the exception days. Snow falls
+overnight and settles, temperature and wind follow the day, and blog posts
+appear every few days. The clock jumps from one minute to the next without
+waiting. Resorts are fetched through ``FnuggData.update_data()`` when their
+adaptive interval is up, in one batched request per round, and failed
+fetches are retried like the coordinator does. Blog posts are fetched every
+6 hours.
+
+The entity layer is replayed on top. Resort, lift and blog sensors are
+compared after every fetch, the opening hours sensors once a minute, and the
+cross-resort sensors after every round. Every state write goes through the
+recorder model of ``bench_recorder.py``. For each simulated day it reports:
+
+* ``cpu_ms``: process CPU time spent on the day
+* ``peak_kib``: tracemalloc peak during the day
+* ``state_writes``: states the entities would write
+* ``recorder_rows``: ``states`` plus new ``state_attributes`` rows
+* ``http_calls``: requests served by the stub
+* ``events``: resort events the coordinator would fire
+
+Run from the repository root:
+
+    python benchmarks/replay_season.py
+    python benchmarks/replay_season.py --resorts 20 --start 2025-01-01 --days 14
+    python benchmarks/replay_season.py --recorded DIR --output season.json
+
+Tracing memory slows the replay down; use ``--no-trace-memory`` for CPU
+times closer to a real installation.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import copy
+import datetime
+import json
+import math
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import timedelta
+from unittest import mock
+
+import aiohttp
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from homeassistant.util import dt as dt_util  # noqa: E402
+
+from custom_components.fnugg.aggregates import (  # noqa: E402
+    RANKED_METRICS,
+    RESORTS_OPEN,
+    FnuggAggregates,
+)
+from custom_components.fnugg.api import FnuggApiClient, FnuggResortBatcher  # noqa: E402
+from custom_components.fnugg.blog import build_blog_sensor  # noqa: E402
+from custom_components.fnugg.const import (  # noqa: E402
+    BLOG_POSTS_PER_SITE,
+    DEFAULT_BLOG_INTERVAL,
+    DEFAULT_MAX_DATA_AGE,
+    DEFAULT_MAX_INTERVAL,
+    DEFAULT_MIN_INTERVAL,
+)
+from custom_components.fnugg.descriptions import LIFT_PREFIX, sensor_description  # noqa: E402
+from custom_components.fnugg.events import resort_events  # noqa: E402
+from custom_components.fnugg.polling import compute_update_interval  # noqa: E402
+from custom_components.fnugg.projection import (  # noqa: E402
+    BLOG_SEARCH_TREE,
+    BLOG_SOURCE_FIELDS,
+)
+from custom_components.fnugg.schedule import OpeningSchedule  # noqa: E402
+from custom_components.fnugg.sensor import (  # noqa: E402
+    SCHEDULE_SENSORS,
+    Fnugg,
+    FnuggAggregateSensor,
+    FnuggBlogSensor,
+    FnuggData,
+    FnuggScheduleSensor,
+)
+from bench_recorder import RecorderModel, base_attributes, unrecorded  # noqa: E402
+from bench_update import load_recorded  # noqa: E402
+from payloads import make_blog_post, make_resort  # noqa: E402
+from simulate_season import OPENING_HOURS, SEASON, TZ  # noqa: E402
+from stub_server import StubFnuggApi  # noqa: E402
+
+DEFAULT_START = datetime.date(2024, 11, 1)
+DEFAULT_END = datetime.date(2025, 5, 1)
+STEP = timedelta(minutes=1)
+# Share of season days with snowfall, and of days with a new blog post
+SNOW_DAYS = 0.3
+BLOG_DAYS = 0.3
+# Chance that an open lift is on hold for two hours (wind, maintenance)
+LIFT_HOLD = 0.08
+
+
+def _rnd(*key):
+    """Return a generator seeded by integers, the same for every run."""
+    return random.Random(hash(key))
+
+
+class ResortTimeline:
+    """Payload of one resort as a function of the simulated time."""
+
+    def __init__(self, document, seed):
+        """Prepare the season of ``document``, which is changed in place."""
+        self.document = document
+        self.seed = seed
+        source = document["_source"]
+        source["opening_hours"] = copy.deepcopy(OPENING_HOURS)
+        source["resort_opening_date"] = SEASON[0].isoformat()
+        source["resort_closing_date"] = SEASON[1].isoformat()
+        self.schedule = OpeningSchedule(OPENING_HOURS)
+
+        rnd = random.Random(seed)
+        first, last = SEASON[0].date() - timedelta(days=30), SEASON[1].date()
+        self.snowfall = {}
+        self.depth = {}
+        depth = 0.0
+        day = first
+        while day <= last:
+            if rnd.random() < SNOW_DAYS:
+                self.snowfall[day] = rnd.choice((1, 2, 3, 5, 8, 12, 20, 30))
+            # Snow settles a little every day
+            depth = depth * 0.985 + self.snowfall.get(day, 0)
+            self.depth[day] = depth
+            day += timedelta(days=1)
+        self.blog_posts = sorted(
+            datetime.datetime.combine(day, datetime.time(rnd.randint(8, 14)), TZ)
+            for day in self.depth
+            if rnd.random() < BLOG_DAYS
+        )
+
+    def apply(self, now):
+        """Update the document to what the API serves at ``now``."""
+        local = now.astimezone(TZ)
+        today = local.date()
+        source = self.document["_source"]
+        in_season = SEASON[0] <= now <= SEASON[1]
+        is_open = in_season and self.schedule.is_open(local)
+        source["resort_open"] = is_open
+
+        # Snow falls between midnight and six
+        falling = self.snowfall.get(today, 0) * min(1.0, local.hour / 6)
+        snow = {
+            "depth_slope": round(self.depth.get(today - timedelta(days=1), 0) + falling),
+            "depth_terrain": round((self.depth.get(today - timedelta(days=1), 0) + falling) * 0.8),
+            "today": round(falling),
+            "week": sum(self.snowfall.get(today - timedelta(days=d), 0) for d in range(7)),
+        }
+        hourly = _rnd(self.seed, today.toordinal(), local.hour)
+        temperature = -6 + 4 * math.sin(2 * math.pi * (local.hour - 9) / 24) + hourly.uniform(-1, 1)
+        for elevation, offset in (("top", 0), ("bottom", 4)):
+            report = source["conditions"]["combined"][elevation]
+            report["snow"] = snow
+            report["temperature"]["value"] = round(temperature + offset)
+            report["wind"]["mps"] = round(hourly.uniform(0, 12), 1)
+            report["last_updated"] = datetime.datetime.combine(today, datetime.time(7), TZ).isoformat()
+
+        for kind in ("lifts", "slopes"):
+            items = source[kind]["list"]
+            for item in items:
+                if not is_open:
+                    item["status"] = 0
+                else:
+                    hold = _rnd(self.seed, item["id"], today.toordinal(), local.hour // 2)
+                    item["status"] = int(hold.random() >= LIFT_HOLD)
+            source[kind]["open"] = sum(item["status"] for item in items)
+
+    def latest_post(self, resort_id, now):
+        """Return the latest blog post published before ``now``, or None."""
+        published = [when for when in self.blog_posts if when <= now]
+        if not published:
+            return None
+        post = make_blog_post(resort_id, len(published))
+        post["_source"]["date"] = published[-1].isoformat()
+        post["_source"]["modified"] = published[-1].isoformat()
+        return post
+
+
+class SimulatedClock:
+    """Time source for ``dt_util`` while replaying."""
+
+    def __init__(self, start):
+        """Start the clock at ``start``."""
+        self.now = start
+
+    def utcnow(self):
+        return self.now.astimezone(dt_util.UTC)
+
+    def local(self, time_zone=None):
+        return self.now.astimezone(time_zone or TZ)
+
+
+class Replay:
+    """Resorts, entities and counters of one replay."""
+
+    def __init__(self, timelines, datas, stub):
+        """Initialize the replay."""
+        self.timelines = timelines
+        self.datas = datas
+        self.stub = stub
+        self.recorder = RecorderModel(True)
+        self.aggregates = FnuggAggregates()
+        self.aggregate_sensors = [
+            FnuggAggregateSensor(self.aggregates, sensor_id)
+            for sensor_id in (*RANKED_METRICS, RESORTS_OPEN)
+        ]
+        self.events = 0
+        self._base = {}
+
+    def write(self, entity_id, sensor_id, sensor, entity_class):
+        """Pass a sensor tuple to the recorder model, as the entity would."""
+        if sensor_id not in self._base:
+            self._base[sensor_id] = base_attributes(sensor_id)
+        attrs = {**(sensor[1] or {}), **self._base[sensor_id]}
+        group = "lift_status" if sensor_id.startswith(LIFT_PREFIX) else sensor_id
+        self.recorder.write(group, entity_id, sensor[0], attrs, unrecorded(entity_class))
+
+    def after_fetch(self, data, previous):
+        """Replay the entities and events of a resort after a fetch."""
+        resort_id = data.resort_id
+        if previous:
+            self.events += len(resort_events(previous, data.sensors, data.lift_names))
+        self.aggregates.async_update_resort(resort_id, data.resort_name, data.sensors)
+        for sensor_id, sensor in data.sensors.items():
+            if sensor_id in SCHEDULE_SENSORS:
+                continue
+            if sensor_description(sensor_id).entity_registry_enabled_default:
+                self.write(f"{resort_id}.{sensor_id}", sensor_id, sensor, Fnugg)
+
+    def tick(self, now):
+        """Replay the opening hours sensors, recomputed once a minute and written on change."""
+        for data in self.datas:
+            for sensor_id, sensor in data.build_schedule_sensors(now).items():
+                self.write(f"{data.resort_id}.{sensor_id}", sensor_id, sensor, FnuggScheduleSensor)
+
+    def after_round(self):
+        """Replay the cross-resort sensors."""
+        for entity in self.aggregate_sensors:
+            self.write(entity._sensor_id, entity._sensor_id, entity._build_sensor(), FnuggAggregateSensor)
+
+    def blog(self, result):
+        """Replay the blog sensors from a blog search result."""
+        latest = {}
+        for hit in result.get("hits", {}).get("hits", []):
+            source = hit.get("_source") or {}
+            latest.setdefault(str(source.get("site", {}).get("id")), source)
+        for data in self.datas:
+            if data.resort_id in latest:
+                self.write(
+                    f"{data.resort_id}.blog_post_title",
+                    "blog_post_title",
+                    build_blog_sensor(latest[data.resort_id]),
+                    FnuggBlogSensor,
+                )
+
+
+async def replay(documents, start, end, trace_memory):
+    """Replay ``documents`` from ``start`` to ``end``.
+
+    Returns one row per day and the recorder model of the whole replay.
+    """
+    timelines = [ResortTimeline(document, seed) for seed, document in enumerate(documents)]
+    stub = StubFnuggApi(documents)
+    base_url = await stub.start()
+    clock = SimulatedClock(datetime.datetime.combine(start, datetime.time(), TZ))
+    end_time = datetime.datetime.combine(end, datetime.time(), TZ)
+    min_interval = timedelta(minutes=DEFAULT_MIN_INTERVAL)
+    max_interval = timedelta(minutes=DEFAULT_MAX_INTERVAL)
+    max_data_age = timedelta(minutes=DEFAULT_MAX_DATA_AGE)
+
+    days = []
+    try:
+        async with aiohttp.ClientSession() as session:
+            client = FnuggApiClient(session, base_url=base_url)
+            batcher = FnuggResortBatcher(client, delay=0)
+            datas = [
+                FnuggData(client, document["_id"], document["_source"]["name"], batcher=batcher)
+                for document in documents
+            ]
+            state = Replay(timelines, datas, stub)
+            next_fetch = [clock.now] * len(datas)
+            failures = [0] * len(datas)
+            next_blog = clock.now
+
+            with mock.patch.object(dt_util, "utcnow", clock.utcnow), mock.patch.object(
+                dt_util, "now", clock.local
+            ):
+                day = clock.now.date()
+                totals = _totals(state)
+                cpu = time.process_time()
+                if trace_memory:
+                    tracemalloc.start()
+                while clock.now < end_time:
+                    now = clock.now
+                    due = [index for index, when in enumerate(next_fetch) if when <= now]
+                    if due:
+                        for index in due:
+                            timelines[index].apply(now)
+                        previous = [datas[index].sensors for index in due]
+                        results = await asyncio.gather(
+                            *(datas[index].update_data() for index in due),
+                            return_exceptions=True,
+                        )
+                        for index, old, result in zip(due, previous, results):
+                            data = datas[index]
+                            if result is True:
+                                state.after_fetch(data, old)
+                                failures[index] = 0
+                            else:
+                                failures[index] += 1
+                            next_fetch[index] = now + compute_update_interval(
+                                now,
+                                data.schedule,
+                                *data.season,
+                                data.resort_open,
+                                data.new_snow,
+                                min_interval,
+                                max_interval,
+                                failures[index],
+                                max_data_age - (now - data.fetched_at) if data.fetched_at else None,
+                            )
+                        state.after_round()
+                    if now >= next_blog:
+                        stub.blog_posts = {
+                            data.resort_id: [post]
+                            for data, timeline in zip(datas, timelines)
+                            if (post := timeline.latest_post(data.resort_id, now)) is not None
+                        }
+                        state.blog(await client.async_get("/search", _blog_params(datas), BLOG_SEARCH_TREE))
+                        next_blog = now + DEFAULT_BLOG_INTERVAL
+                    state.tick(now.astimezone(TZ))
+
+                    clock.now = now + STEP
+                    if clock.now.astimezone(TZ).date() != day:
+                        peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+                        current = _totals(state)
+                        days.append(_day_row(day, current, totals, time.process_time() - cpu, peak))
+                        day, totals, cpu = clock.now.astimezone(TZ).date(), current, time.process_time()
+                        if trace_memory:
+                            tracemalloc.reset_peak()
+                if trace_memory:
+                    tracemalloc.stop()
+    finally:
+        await stub.stop()
+    return days, state.recorder
+
+
+def _blog_params(datas):
+    """Return the parameters of the blog coordinator's search."""
+    return {
+        "type": "blog_post",
+        "facet": "site:" + ",".join(data.resort_id for data in datas),
+        "sort": "date:desc",
+        "size": str(len(datas) * BLOG_POSTS_PER_SITE),
+        "sourceFields": ",".join(BLOG_SOURCE_FIELDS),
+    }
+
+
+def _totals(state):
+    totals = state.recorder.totals()
+    return {
+        "state_writes": totals["states_rows"],
+        "recorder_rows": totals["states_rows"] + totals["attributes_rows"],
+        "http_calls": state.stub.total_requests,
+        "events": state.events,
+    }
+
+
+def _day_row(day, current, previous, cpu_seconds, peak):
+    return {
+        "date": day.isoformat(),
+        "cpu_ms": round(cpu_seconds * 1000, 1),
+        "peak_kib": round(peak / 1024, 1) if peak is not None else None,
+        **{key: current[key] - previous[key] for key in current},
+    }
+
+
+def _summary(days, key):
+    values = [row[key] for row in days if row[key] is not None]
+    if not values:
+        return None
+    return {"mean": round(statistics.fmean(values), 1), "max": max(values), "total": round(sum(values), 1)}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resorts", type=int, default=5, help="number of synthetic resorts")
+    parser.add_argument("--lifts", type=int, default=30, help="lifts per synthetic resort")
+    parser.add_argument("--recorded", help="directory of recorded resort documents to replay instead")
+    parser.add_argument("--start", type=datetime.date.fromisoformat, default=DEFAULT_START)
+    parser.add_argument("--end", type=datetime.date.fromisoformat, default=DEFAULT_END)
+    parser.add_argument("--days", type=int, help="replay this many days from --start")
+    parser.add_argument("--no-trace-memory", dest="trace_memory", action="store_false")
+    parser.add_argument("--output", help="write the JSON results to this file")
+    args = parser.parse_args()
+
+    if args.recorded:
+        documents = [copy.deepcopy(document) for document in load_recorded(args.recorded)]
+        for resort_id, document in enumerate(documents, start=1):
+            document["_id"] = str(resort_id)
+    else:
+        documents = [make_resort(resort_id, lifts=args.lifts, slopes=args.lifts) for resort_id in range(1, args.resorts + 1)]
+    end = args.start + timedelta(days=args.days) if args.days else args.end
+
+    wall = time.perf_counter()
+    days, recorder = await replay(documents, args.start, end, args.trace_memory)
+    wall = time.perf_counter() - wall
+    simulated = (end - args.start).total_seconds()
+
+    print(
+        f"{'date':>10} {'cpu ms':>8} {'peak KiB':>9} {'writes':>7} {'rows':>6} {'http':>5} {'events':>6}",
+        file=sys.stderr,
+    )
+    for row in days:
+        print(
+            f"{row['date']:>10} {row['cpu_ms']:>8.1f} {row['peak_kib'] or '-':>9} "
+            f"{row['state_writes']:>7} {row['recorder_rows']:>6} {row['http_calls']:>5} {row['events']:>6}",
+            file=sys.stderr,
+        )
+    print(f"{len(days)} days replayed in {wall:.1f} s, {simulated / wall:.0f}x real time", file=sys.stderr)
+
+    report = {
+        "resorts": len(documents),
+        "start": args.start.isoformat(),
+        "end": end.isoformat(),
+        "speedup": round(simulated / wall),
+        "per_day": {
+            key: _summary(days, key)
+            for key in ("cpu_ms", "peak_kib", "state_writes", "recorder_rows", "http_calls", "events")
+        },
+        # Sensors by the state writes they made over the whole replay
+        "writes_by_sensor": dict(
+            sorted(
+                ((group, counts["states_rows"]) for group, counts in recorder.groups.items()),
+                key=lambda item: -item[1],
+            )
+        ),
+        "days": days,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump({key: report[key] for key in ("per_day", "writes_by_sensor")}, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,192 @@
+"""Count API requests over a simulated year with adaptive polling.
+
+Steps a simulated clock from one summer to the next through a season of
+synthetic resort data. It compares the adaptive interval with the fixed
+20 minute interval. The resort opens 2024-11-30 and closes 2025-04-21,
+with weekday and weekend hours and powder days at random.
+
+A second run injects API outages of 10 minutes to 36 hours at random. It
+reports the requests, how many of them failed, how long the sensors showed
+data from before a failed fetch, how long they were unavailable because the
+data got older than the maximum data age, and the oldest data shown. It
+compares retrying failed fetches with keeping the adaptive interval.
+
+Run from the repository root:
+
+    python benchmarks/simulate_season.py
+"""
+from __future__ import annotations
+
+from collections import Counter
+import datetime
+import math
+import os
+import random
+import sys
+from datetime import timedelta
+from zoneinfo import ZoneInfo
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_components.fnugg.const import (  # noqa: E402
+    DEFAULT_MAX_DATA_AGE,
+    DEFAULT_MAX_INTERVAL,
+    DEFAULT_MIN_INTERVAL,
+    UPDATE_INTERVAL,
+)
+from custom_components.fnugg.polling import (  # noqa: E402
+    compute_update_interval,
+    parse_season_date,
+)
+from custom_components.fnugg.schedule import OpeningSchedule  # noqa: E402
+
+TZ = ZoneInfo("Europe/Oslo")
+START = datetime.datetime(2024, 6, 1, tzinfo=TZ)
+END = datetime.datetime(2025, 6, 1, tzinfo=TZ)
+SEASON = (
+    parse_season_date("2024-11-30T00:00:00+01:00"),
+    parse_season_date("2025-04-21T00:00:00+02:00"),
+)
+OPENING_HOURS = {
+    **{day: {"from": "09:00", "to": "16:30"} for day in ("monday", "tuesday", "wednesday", "friday")},
+    "thursday": {"from": "09:00", "to": "20:00"},
+    "saturday": {"from": "09:00", "to": "17:00"},
+    "sunday": {"from": "09:00", "to": "17:00"},
+    "exception_days": [
+        {"date": "2024-12-24T00:00:00Z", "closed": True},
+        {"date": "2024-12-31T00:00:00Z", "from": "10:00", "to": "14:00"},
+    ],
+}
+# API outages injected over the simulated year
+OUTAGES = 20
+
+
+def phase(now):
+    if now < SEASON[0] - timedelta(days=7) or now > SEASON[1]:
+        return "off-season"
+    if now < SEASON[0]:
+        return "pre-season"
+    return "season"
+
+
+def make_outages(count, seed=1):
+    """Return ``count`` outages as sorted (start, end) pairs."""
+    rnd = random.Random(seed)
+    outages = []
+    for _ in range(count):
+        start = START + (END - START) * rnd.random()
+        minutes = math.exp(rnd.uniform(math.log(10), math.log(36 * 60)))
+        outages.append((start, start + timedelta(minutes=minutes)))
+    return sorted(outages)
+
+
+def simulate(
+    min_minutes=DEFAULT_MIN_INTERVAL,
+    max_minutes=DEFAULT_MAX_INTERVAL,
+    seed=1,
+    outages=(),
+    retry=True,
+    max_data_age_minutes=DEFAULT_MAX_DATA_AGE,
+):
+    """Return request counts per phase and staleness for one simulated year.
+
+    Fetches during one of ``outages`` fail. With ``retry`` the next fetch
+    follows the retry schedule, otherwise the adaptive interval is kept.
+    """
+    rnd = random.Random(seed)
+    powder_days = {
+        SEASON[0].date() + timedelta(days=day)
+        for day in range((SEASON[1] - SEASON[0]).days)
+        if rnd.random() < 0.15
+    }
+    in_season = OpeningSchedule(OPENING_HOURS)
+    off_season = OpeningSchedule(None)
+    min_interval = timedelta(minutes=min_minutes)
+    max_interval = timedelta(minutes=max_minutes)
+
+    max_data_age = timedelta(minutes=max_data_age_minutes)
+
+    requests = Counter()
+    staleness = {
+        "failed": 0,
+        "stale": timedelta(0),
+        "unavailable": timedelta(0),
+        "max_age": timedelta(0),
+    }
+    now = last_success = START
+    failures = 0
+    while now < END:
+        requests[phase(now)] += 1
+        if any(start <= now < end for start, end in outages):
+            failures += 1
+            staleness["failed"] += 1
+        else:
+            failures = 0
+            last_success = now
+        season_open = SEASON[0] <= now <= SEASON[1]
+        interval = compute_update_interval(
+            now,
+            in_season if season_open else off_season,
+            *SEASON,
+            season_open,
+            rnd.randint(5, 30) if now.date() in powder_days else 0,
+            min_interval,
+            max_interval,
+            failures if retry else 0,
+            max_data_age - (now - last_success),
+        )
+        later = min(now + interval, END)
+        if failures:
+            staleness["stale"] += later - now
+        expiry = last_success + max_data_age
+        if later > expiry:
+            staleness["unavailable"] += later - max(now, expiry)
+        staleness["max_age"] = max(staleness["max_age"], later - last_success)
+        now = later
+    return requests, staleness
+
+
+def _hours(value):
+    return value.total_seconds() / 3600
+
+
+def main():
+    fixed = Counter()
+    now = START
+    while now < END:
+        fixed[phase(now)] += 1
+        now += UPDATE_INTERVAL
+
+    print(f"{'polling':>22} {'off-season':>10} {'pre-season':>10} {'season':>7} {'total':>7}")
+    rows = [("fixed 20 min", fixed)]
+    rows.append((f"adaptive {DEFAULT_MIN_INTERVAL}-{DEFAULT_MAX_INTERVAL} min", simulate()[0]))
+    rows.append(("adaptive 10-120 min", simulate(10, 120)[0]))
+    for name, counts in rows:
+        print(
+            f"{name:>22} {counts['off-season']:>10} {counts['pre-season']:>10} "
+            f"{counts['season']:>7} {sum(counts.values()):>7}"
+        )
+
+    outages = make_outages(OUTAGES)
+    down = sum((end - start for start, end in outages), timedelta(0))
+    print()
+    print(f"with {len(outages)} outages, {_hours(down):.0f} hours in total")
+    print(
+        f"{'polling':>22} {'requests':>8} {'failed':>6} {'stale h':>7} "
+        f"{'unavail h':>9} {'max age h':>9}"
+    )
+    rows = [
+        ("fixed 20 min", simulate(20, 20, outages=outages)),
+        ("adaptive, no retry", simulate(outages=outages, retry=False)),
+        ("adaptive, retry", simulate(outages=outages)),
+    ]
+    for name, (counts, staleness) in rows:
+        print(
+            f"{name:>22} {sum(counts.values()):>8} {staleness['failed']:>6} "
+            f"{_hours(staleness['stale']):>7.1f} {_hours(staleness['unavailable']):>9.1f} "
+            f"{_hours(staleness['max_age']):>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
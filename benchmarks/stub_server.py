@@ -0,0 +1,111 @@
+"""Local stand-in for api.fnugg.no used by the benchmarks."""
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+
+from aiohttp import web
+
+
+class StubFnuggApi:
+    """Serve ``/get/resort/{id}/`` and ``/search`` from in-memory payloads.
+
+    Blog searches honour ``sort`` and ``size`` like the real API. ``missing``
+    resorts are left out of batched search responses, ``latency`` delays
+    every response, and ``error_rate`` answers that share of requests with
+    HTTP 500.
+    """
+
+    def __init__(self, resorts, blog_posts=None, latency=0.0, missing=(), error_rate=0.0):
+        """Initialize the stub."""
+        self.resorts = {str(resort["_id"]): resort for resort in resorts}
+        self.blog_posts = blog_posts or {}
+        self.latency = latency
+        self.missing = {str(resort_id) for resort_id in missing}
+        self.error_rate = error_rate
+        self.requests = Counter()
+        self.bytes_sent = 0
+        self._errors = 0.0
+        self._runner = None
+        self.base_url = None
+
+    async def start(self):
+        """Start serving on a free localhost port and return the base URL."""
+        app = web.Application()
+        app.router.add_get("/get/resort/{resort_id}/", self._get_resort)
+        app.router.add_get("/search", self._search)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}"
+        return self.base_url
+
+    async def stop(self):
+        """Stop the server."""
+        await self._runner.cleanup()
+
+    @property
+    def total_requests(self):
+        """Return the number of requests served."""
+        return sum(self.requests.values())
+
+    async def _respond(self, endpoint, payload):
+        self.requests[endpoint] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self._errors += self.error_rate
+        if self._errors >= 1:
+            self._errors -= 1
+            return web.Response(status=500, text="stub error")
+        response = web.json_response(payload)
+        self.bytes_sent += len(response.body)
+        return response
+
+    async def _get_resort(self, request):
+        resort = self.resorts.get(request.match_info["resort_id"])
+        if resort is None:
+            self.requests["resort"] += 1
+            return web.Response(status=404)
+        return await self._respond("resort", self._project(resort, request.query.get("sourceFields")))
+
+    async def _search(self, request):
+        query = request.query
+        facet = query.get("facet", "")
+        if query.get("type") == "blog_post":
+            sites = facet.partition(":")[2].split(",") if facet else []
+            hits = [post for site in sites for post in self.blog_posts.get(site, [])]
+            total = len(hits)
+            field, _, order = query.get("sort", "").partition(":")
+            if field:
+                hits.sort(key=lambda post: post["_source"].get(field) or "", reverse=order == "desc")
+            hits = hits[:int(query.get("size", 10))]
+            return await self._respond("blog", {"hits": {"total": total, "hits": hits}})
+        if facet.startswith("id:"):
+            ids = [resort_id for resort_id in facet[3:].split(",") if resort_id not in self.missing]
+            hits = [self.resorts[resort_id] for resort_id in ids if resort_id in self.resorts]
+        else:
+            start = int(query.get("from", 0))
+            hits = list(self.resorts.values())[start:start + int(query.get("size", 10))]
+        hits = [self._project(hit, query.get("sourceFields")) for hit in hits]
+        return await self._respond("search", {"hits": {"total": len(self.resorts), "hits": hits}})
+
+    @staticmethod
+    def _project(hit, source_fields):
+        """Apply ``sourceFields`` filtering the way the real API does."""
+        if not source_fields:
+            return hit
+        projected = {}
+        for path in source_fields.split(","):
+            src, dst = hit["_source"], projected
+            keys = path.split(".")
+            for key in keys[:-1]:
+                if not isinstance(src, dict) or key not in src:
+                    break
+                src = src[key]
+                dst = dst.setdefault(key, {})
+            else:
+                if isinstance(src, dict) and keys[-1] in src:
+                    dst[keys[-1]] = src[keys[-1]]
+        return {**hit, "_source": projected}
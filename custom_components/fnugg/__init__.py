@@ -1,17 +1,131 @@
 """The Fnugg integration."""
 from __future__ import annotations
 
+import asyncio
+from datetime import timedelta
+
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
+
+from .aggregates import async_get_aggregates
+from .api import FnuggResortBatcher, async_get_client
+from .blog import FnuggBlogCoordinator
+from .const import (
+    CONF_BATCH_FETCH,
+    CONF_BLOG_INTERVAL,
+    CONF_MAX_DATA_AGE,
+    CONF_MAX_INTERVAL,
+    CONF_MIN_INTERVAL,
+    CONF_SLOPE_SENSORS,
+    DATA_BATCHER,
+    DATA_BLOG,
+    DEFAULT_BATCH_FETCH,
+    DEFAULT_BLOG_INTERVAL,
+    DEFAULT_MAX_DATA_AGE,
+    DEFAULT_MAX_INTERVAL,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_SLOPE_SENSORS,
+    DOMAIN,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+)
+from .coordinator import FnuggDataUpdateCoordinator
+from .scheduler import async_get_scheduler
+from .sensor import FnuggData
+from .services import async_setup_services
 
-from .const import DOMAIN
+PLATFORMS: list[str] = ["image", "sensor"]
 
-PLATFORMS: list[str] = ["sensor"]
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Fnugg services."""
+    async_setup_services(hass)
+    return True
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Fnugg from a config entry."""
     hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = entry.data
+    client = async_get_client(hass)
+    scheduler = async_get_scheduler(hass)
+
+    batcher = None
+    if entry.options.get(CONF_BATCH_FETCH, DEFAULT_BATCH_FETCH):
+        if DATA_BATCHER not in hass.data[DOMAIN]:
+            hass.data[DOMAIN][DATA_BATCHER] = FnuggResortBatcher(client, hass=hass)
+        batcher = hass.data[DOMAIN][DATA_BATCHER]
+
+    fnugg_data = FnuggData(
+        client,
+        entry.data["resort_id"],
+        entry.data["name"],
+        batcher=batcher,
+        slope_sensors=entry.options.get(CONF_SLOPE_SENSORS, DEFAULT_SLOPE_SENSORS),
+    )
+    coordinator = FnuggDataUpdateCoordinator(
+        hass,
+        fnugg_data,
+        store=Store(hass, STORAGE_VERSION, f"{STORAGE_KEY}.{entry.entry_id}"),
+        min_interval=timedelta(
+            minutes=entry.options.get(CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL)
+        ),
+        max_interval=timedelta(
+            minutes=entry.options.get(CONF_MAX_INTERVAL, DEFAULT_MAX_INTERVAL)
+        ),
+        max_data_age=timedelta(
+            minutes=entry.options.get(CONF_MAX_DATA_AGE, DEFAULT_MAX_DATA_AGE)
+        ),
+        scheduler=scheduler,
+        phase_key=batcher,
+    )
+    entry.async_on_unload(coordinator.async_cancel_expiry)
+
+    # Blog posts are fetched by one coordinator for all resorts, next to the
+    # resort fetch rather than after it
+    if DATA_BLOG not in hass.data[DOMAIN]:
+        hass.data[DOMAIN][DATA_BLOG] = FnuggBlogCoordinator(hass, client, scheduler)
+    blog = hass.data[DOMAIN][DATA_BLOG]
+    blog_interval = entry.options.get(CONF_BLOG_INTERVAL)
+    await blog.async_add_resort(
+        entry.data["resort_id"],
+        timedelta(minutes=blog_interval) if blog_interval else DEFAULT_BLOG_INTERVAL,
+    )
+
+    # Start from the last good snapshot and refresh in the background, so a
+    # slow or unreachable API does not hold up setup. The refreshes after a
+    # restart are spread by phase instead of all starting at once
+    if await coordinator.async_restore_snapshot():
+        entry.async_create_background_task(
+            hass,
+            _async_refresh_later(coordinator, scheduler.startup_delay(coordinator.phase_key)),
+            f"{DOMAIN} {entry.title} refresh",
+        )
+    else:
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except Exception:
+            await _async_remove_blog_resort(hass, entry)
+            raise
+
+    hass.data[DOMAIN][entry.entry_id] = coordinator
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+
+    # Report each update to the sensors across all resorts
+    aggregates = async_get_aggregates(hass)
+    resort_id = str(entry.data["resort_id"])
+
+    @callback
+    def _async_update_aggregates() -> None:
+        if coordinator.data_expired:
+            aggregates.async_remove_resort(resort_id)
+        else:
+            aggregates.async_update_resort(resort_id, entry.title, coordinator.data)
+
+    _async_update_aggregates()
+    entry.async_on_unload(coordinator.async_add_listener(_async_update_aggregates))
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
@@ -19,8 +133,45 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
+    # Withdrawn first, so entries unloading together do not hand the
+    # aggregate sensors to each other
+    aggregates = async_get_aggregates(hass)
+    aggregates.async_remove_platform(entry.entry_id)
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        # The delayed snapshot save would be lost, and a reload right after
+        # would have to wait for the API
+        await coordinator.async_save_snapshot()
+        await _async_remove_blog_resort(hass, entry)
+        aggregates.async_remove_resort(str(entry.data["resort_id"]))
+        # Only once the old aggregate entities are gone can they be added elsewhere
+        aggregates.async_hand_off()
+        if coordinator.phase_key is coordinator:
+            async_get_scheduler(hass).unregister(coordinator)
 
     return unload_ok
+
+async def _async_refresh_later(
+    coordinator: FnuggDataUpdateCoordinator, delay: float
+) -> None:
+    """Refresh a restored coordinator after ``delay`` seconds."""
+    await asyncio.sleep(delay)
+    await coordinator.async_refresh()
+
+async def _async_remove_blog_resort(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Stop fetching blog posts for the entry's resort."""
+    blog = hass.data[DOMAIN][DATA_BLOG]
+    blog.async_remove_resort(entry.data["resort_id"])
+    if not blog.resort_ids:
+        hass.data[DOMAIN].pop(DATA_BLOG)
+        async_get_scheduler(hass).unregister(blog)
+        await blog.async_shutdown()
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored snapshot of a deleted entry."""
+    await Store(hass, STORAGE_VERSION, f"{STORAGE_KEY}.{entry.entry_id}").async_remove()
+
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload a config entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
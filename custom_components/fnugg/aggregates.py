@@ -0,0 +1,190 @@
+"""Rankings and counts across all configured resorts.
+
+Every resort coordinator reports its sensors here after an update. Each
+ranked metric keeps the current value per resort plus a max-heap that is
+only pushed to when a resort's value changes; outdated heap entries are
+skipped when the top is read and dropped when the heap grows too large.
+An update costs O(log n) per changed metric and never scans all resorts.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+import heapq
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import AGGREGATE_TOP_N, DATA_AGGREGATES, DOMAIN
+
+# Resort sensors ranked across resorts, by aggregate sensor id
+RANKED_METRICS = {
+    "top_new_snow": "new_snow",
+    "top_snow_depth": "snow_depth",
+    "top_lifts_percentage": "lifts_percentage",
+    "top_slopes_percentage": "slopes_percentage",
+}
+RESORTS_OPEN = "resorts_open"
+
+
+def _number(sensor) -> float | None:
+    """Return the value of a sensor tuple as a number, None if it is not one."""
+    value = sensor[0] if sensor is not None else None
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return value
+
+
+class _RankedMetric:
+    """Values of one metric by resort, with a lazily pruned max-heap."""
+
+    __slots__ = ("values", "_heap")
+
+    def __init__(self) -> None:
+        self.values: dict[str, float] = {}
+        self._heap: list[tuple[float, str]] = []
+
+    def set(self, resort_id: str, value: float | None) -> bool:
+        """Record a resort's value, returning True if it changed."""
+        if value is None:
+            return self.discard(resort_id)
+        if self.values.get(resort_id) == value:
+            return False
+        self.values[resort_id] = value
+        heapq.heappush(self._heap, (-value, resort_id))
+        if len(self._heap) > 2 * len(self.values) + AGGREGATE_TOP_N:
+            self._heap = [(-value, rid) for rid, value in self.values.items()]
+            heapq.heapify(self._heap)
+        return True
+
+    def discard(self, resort_id: str) -> bool:
+        """Forget a resort, returning True if it had a value."""
+        return self.values.pop(resort_id, None) is not None
+
+    def top(self, count: int) -> list[tuple[str, float]]:
+        """Return the ``count`` highest (resort id, value) pairs."""
+        picked: list[tuple[str, float]] = []
+        while self._heap and len(picked) < count:
+            negated, resort_id = heapq.heappop(self._heap)
+            if self.values.get(resort_id) == -negated and all(
+                resort_id != rid for rid, _ in picked
+            ):
+                picked.append((resort_id, -negated))
+        for resort_id, value in picked:
+            heapq.heappush(self._heap, (-value, resort_id))
+        return picked
+
+
+class FnuggAggregates:
+    """Top resorts per metric and the number of open resorts."""
+
+    def __init__(self) -> None:
+        """Initialize empty aggregates."""
+        self._metrics = {key: _RankedMetric() for key in RANKED_METRICS}
+        self._names: dict[str, str] = {}
+        self._open: set[str] = set()
+        self._listeners: list[Callable[[], None]] = []
+        # Top (resort id, value) pairs per ranked aggregate sensor id
+        self.tops: dict[str, list[tuple[str, float]]] = {key: [] for key in RANKED_METRICS}
+        # Callbacks adding the aggregate sensors, by entry with a loaded sensor platform
+        self._platforms: dict[str, Callable[[], None]] = {}
+        # Entry whose sensor platform provides the aggregate sensors
+        self.owner: str | None = None
+
+    @property
+    def open_count(self) -> int:
+        """Return the number of open resorts."""
+        return len(self._open)
+
+    def resort_name(self, resort_id: str) -> str:
+        """Return the name of a reported resort."""
+        return self._names.get(resort_id, resort_id)
+
+    @callback
+    def async_update_resort(
+        self, resort_id: str, name: str, sensors: dict[str, tuple]
+    ) -> None:
+        """Take the current sensors of one resort into account."""
+        self._names[resort_id] = name
+        changed = False
+        for key, metric in RANKED_METRICS.items():
+            if self._metrics[key].set(resort_id, _number(sensors.get(metric))):
+                changed |= self._refresh_top(key)
+        is_open = bool((sensors.get("resort_open") or (None,))[0])
+        if is_open != (resort_id in self._open):
+            if is_open:
+                self._open.add(resort_id)
+            else:
+                self._open.discard(resort_id)
+            changed = True
+        if changed:
+            self._async_notify()
+
+    @callback
+    def async_remove_resort(self, resort_id: str) -> None:
+        """Drop a resort that is no longer configured or has no usable data."""
+        changed = False
+        for key, ranked in self._metrics.items():
+            if ranked.discard(resort_id):
+                changed |= self._refresh_top(key)
+        if resort_id in self._open:
+            self._open.discard(resort_id)
+            changed = True
+        self._names.pop(resort_id, None)
+        if changed:
+            self._async_notify()
+
+    def _refresh_top(self, key: str) -> bool:
+        """Recompute a ranking, returning True if it changed."""
+        top = self._metrics[key].top(AGGREGATE_TOP_N)
+        if top == self.tops[key]:
+            return False
+        self.tops[key] = top
+        return True
+
+    @callback
+    def async_add_platform(self, entry_id: str, add_sensors: Callable[[], None]) -> None:
+        """Offer an entry's sensor platform, adding the sensors if none provides them."""
+        self._platforms[entry_id] = add_sensors
+        self.async_hand_off()
+
+    @callback
+    def async_remove_platform(self, entry_id: str) -> None:
+        """Withdraw an entry's sensor platform before it unloads."""
+        self._platforms.pop(entry_id, None)
+        if self.owner == entry_id:
+            self.owner = None
+
+    @callback
+    def async_hand_off(self) -> None:
+        """Add the sensors to another loaded platform if none provides them.
+
+        Only the platform's add callback is used, so the other entry is not
+        reloaded.
+        """
+        if self.owner is None and self._platforms:
+            self.owner, add_sensors = next(iter(self._platforms.items()))
+            add_sensors()
+
+    @callback
+    def async_add_listener(self, update_callback: Callable[[], None]) -> CALLBACK_TYPE:
+        """Call ``update_callback`` whenever an aggregate changes."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def _async_notify(self) -> None:
+        for update_callback in list(self._listeners):
+            update_callback()
+
+
+@callback
+def async_get_aggregates(hass: HomeAssistant) -> FnuggAggregates:
+    """Return the aggregates shared by all entries."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_AGGREGATES not in domain_data:
+        domain_data[DATA_AGGREGATES] = FnuggAggregates()
+    return domain_data[DATA_AGGREGATES]
@@ -0,0 +1,419 @@
+"""Helpers for talking to the Fnugg API."""
+from __future__ import annotations
+
+import asyncio
+from contextlib import nullcontext
+from email.utils import parsedate_to_datetime
+import json
+import logging
+import random
+import time
+from typing import Any, Iterable
+
+import aiohttp
+import async_timeout
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    API_BASE_URL,
+    BATCH_DELAY,
+    BREAKER_COOLDOWN,
+    BREAKER_MAX_COOLDOWN,
+    BREAKER_THRESHOLD,
+    DATA_CLIENT,
+    DOMAIN,
+    MAX_RETRIES,
+    REQUEST_TIMEOUT,
+    RETRY_BASE_DELAY,
+    RETRY_MAX_DELAY,
+)
+from .metrics import THROTTLED, FnuggMetrics
+from .projection import SEARCH_TREE, SOURCE_FIELDS, project_document
+from .scheduler import PRIORITY_DEFAULT, FnuggScheduler, async_get_scheduler
+
+_LOGGER = logging.getLogger(__name__)
+
+HEADERS = {
+    "accept": "application/json",
+    "content-type": "application/json",
+}
+
+
+class FnuggApiError(HomeAssistantError):
+    """Error to indicate a request to the Fnugg API failed.
+
+    ``transient`` errors (connection problems, timeouts, HTTP 429 and 5xx)
+    are worth retrying; anything else is an answer from the API. ``kind``
+    names the error in the metrics.
+    """
+
+    def __init__(self, message, transient=True, retry_after=None, kind="connection"):
+        """Initialize the error."""
+        super().__init__(message)
+        self.transient = transient
+        self.retry_after = retry_after
+        self.kind = kind
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """Return the seconds a ``Retry-After`` header asks to wait, or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=dt_util.UTC)
+    return max(0.0, (when - dt_util.utcnow()).total_seconds())
+
+
+class FnuggApiClient:
+    """Shared client for all requests to the Fnugg API.
+
+    Requests go through Home Assistant's pooled keep-alive session. Each
+    attempt is bounded by ``timeout`` from sending the request until the body
+    is read, and the response is always released. Transient failures are
+    retried with exponential backoff and full jitter, waiting at least as long
+    as a ``Retry-After`` header asks.
+
+    After ``BREAKER_THRESHOLD`` requests in a row have failed, the circuit
+    opens: requests fail right away for ``BREAKER_COOLDOWN`` seconds, then a
+    single trial request decides whether it closes again. Every failed trial
+    doubles the cooldown, up to ``BREAKER_MAX_COOLDOWN``. Meanwhile the
+    coordinators keep serving their last good data.
+
+    With a ``scheduler``, every attempt waits for a request slot and token
+    from it, by the priority the caller gives.
+
+    Latency per endpoint, payload sizes, decode times and errors of every
+    attempt are recorded in ``metrics``.
+    """
+
+    def __init__(
+        self,
+        session,
+        base_url=API_BASE_URL,
+        timeout=REQUEST_TIMEOUT,
+        retries=MAX_RETRIES,
+        scheduler: FnuggScheduler | None = None,
+    ):
+        """Initialize the client."""
+        self._session = session
+        self._scheduler = scheduler
+        self.base_url = base_url
+        self._timeout = timeout
+        self._retries = retries
+        self._failures = 0
+        self._cooldown = BREAKER_COOLDOWN
+        self._open_until: float | None = None
+        self._trial_running = False
+        self.metrics = FnuggMetrics()
+
+    @property
+    def circuit_open(self) -> bool:
+        """Return True while requests are paused after repeated failures."""
+        return self._open_until is not None
+
+    @property
+    def consecutive_failures(self) -> int:
+        """Return the number of requests in a row that failed."""
+        return self._failures
+
+    async def async_get(
+        self,
+        path: str,
+        params: dict[str, str] | None = None,
+        tree=None,
+        endpoint: str | None = None,
+        metrics: Iterable[FnuggMetrics] = (),
+        priority: int = PRIORITY_DEFAULT,
+    ) -> Any:
+        """GET ``path`` and return the document, projected by ``tree`` if given.
+
+        ``endpoint`` labels the request in the metrics, and ``metrics`` also
+        receive its payload size and decode time. ``priority`` orders the
+        request among those waiting for the scheduler.
+        """
+        endpoint = endpoint or path
+        try:
+            trial = self._check_circuit(path)
+        except FnuggApiError as err:
+            self.metrics.record_error(err.kind)
+            raise
+        try:
+            attempt = 0
+            while True:
+                try:
+                    result = await self._async_request(
+                        path, params, tree, endpoint, metrics, priority
+                    )
+                except FnuggApiError as err:
+                    self.metrics.record_error(err.kind)
+                    if not err.transient:
+                        # The API answered, so it is reachable
+                        self._record_success()
+                        raise
+                    delay = self._retry_delay(attempt, err.retry_after)
+                    if trial or delay is None:
+                        self._record_failure(trial, err.retry_after)
+                        raise
+                    attempt += 1
+                    _LOGGER.debug(
+                        "Retrying %s in %.1f seconds (%d/%d): %s",
+                        path,
+                        delay,
+                        attempt,
+                        self._retries,
+                        err,
+                    )
+                    await asyncio.sleep(delay)
+                    continue
+                self._record_success()
+                return result
+        finally:
+            if trial:
+                self._trial_running = False
+
+    async def _async_request(self, path, params, tree, endpoint, metrics, priority) -> Any:
+        """Run one attempt of a request."""
+        scheduled = self._scheduler.request(priority) if self._scheduler else nullcontext()
+        try:
+            async with scheduled:
+                # The timeout starts once the scheduler lets the request through
+                start = time.perf_counter()
+                async with async_timeout.timeout(self._timeout):
+                    async with self._session.get(
+                        f"{self.base_url}{path}", params=params, headers=HEADERS
+                    ) as resp:
+                        if resp.status != 200:
+                            raise FnuggApiError(
+                                f"Fnugg API returned {resp.status} for {path}",
+                                transient=resp.status == 429 or resp.status >= 500,
+                                retry_after=_parse_retry_after(
+                                    resp.headers.get("Retry-After")
+                                ),
+                                kind=f"http_{resp.status}",
+                            )
+                        raw = await resp.read()
+        except asyncio.TimeoutError as err:
+            raise FnuggApiError(
+                f"Timeout fetching {path} from Fnugg", kind="timeout"
+            ) from err
+        except aiohttp.ClientError as err:
+            raise FnuggApiError(f"Error communicating with Fnugg: {err}") from err
+        self.metrics.observe_fetch(endpoint, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        try:
+            result = project_document(raw, tree) if tree is not None else json.loads(raw)
+        except ValueError as err:
+            # Retrying would get the same document, and the API did answer
+            raise FnuggApiError(
+                f"Invalid response for {path}: {err}",
+                transient=False,
+                kind="invalid_response",
+            ) from err
+        decode_seconds = time.perf_counter() - start
+        for recorder in (self.metrics, *metrics):
+            recorder.observe_payload(len(raw), decode_seconds)
+        return result
+
+    def _retry_delay(self, attempt: int, retry_after: float | None) -> float | None:
+        """Return the seconds to wait before retrying, or None to give up."""
+        if attempt >= self._retries or self.circuit_open:
+            return None
+        if retry_after is not None and retry_after > RETRY_MAX_DELAY:
+            return None
+        delay = random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2**attempt))
+        return max(delay, retry_after or 0)
+
+    def _check_circuit(self, path: str) -> bool:
+        """Raise while the circuit is open; return True for a trial request."""
+        if self._open_until is None:
+            return False
+        if self._trial_running or time.monotonic() < self._open_until:
+            raise FnuggApiError(
+                f"Not fetching {path}: Fnugg API requests are paused after repeated failures",
+                kind=THROTTLED,
+            )
+        self._trial_running = True
+        return True
+
+    def _record_success(self) -> None:
+        """Close the circuit."""
+        if self._open_until is not None:
+            _LOGGER.info("Fnugg API is reachable again, resuming requests")
+        self._failures = 0
+        self._cooldown = BREAKER_COOLDOWN
+        self._open_until = None
+
+    def _record_failure(self, trial: bool, retry_after: float | None) -> None:
+        """Count a failed request and open the circuit when needed."""
+        self._failures += 1
+        if trial:
+            self._cooldown = min(self._cooldown * 2, BREAKER_MAX_COOLDOWN)
+        elif self._failures < BREAKER_THRESHOLD and (
+            retry_after is None or retry_after <= RETRY_MAX_DELAY
+        ):
+            return
+        pause = max(self._cooldown, retry_after or 0)
+        if self._open_until is None:
+            _LOGGER.warning(
+                "Pausing Fnugg API requests for %d seconds after %d failed requests",
+                pause,
+                self._failures,
+            )
+        self._open_until = time.monotonic() + pause
+
+
+@callback
+def async_get_client(hass: HomeAssistant) -> FnuggApiClient:
+    """Return the API client shared by the whole integration."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_CLIENT not in domain_data:
+        domain_data[DATA_CLIENT] = FnuggApiClient(
+            async_get_clientsession(hass), scheduler=async_get_scheduler(hass)
+        )
+    return domain_data[DATA_CLIENT]
+
+
+class FnuggResortBatcher:
+    """Serve resort fetches from all entries with a single search request.
+
+    Fetches requested within ``delay`` seconds of each other are collected and
+    sent as one ``search`` query. Each caller gets its own resort hit back, or
+    None when the resort was missing from the response, in which case the
+    caller falls back to ``get/resort/{id}``. When the API cannot be reached
+    every caller gets the error instead, so an outage is not followed by one
+    direct request per resort. The search runs at the highest priority of
+    the resorts in the batch. With ``hass``, the search runs as a background
+    task that is cancelled at shutdown.
+    """
+
+    def __init__(
+        self,
+        client: FnuggApiClient,
+        delay=BATCH_DELAY,
+        hass: HomeAssistant | None = None,
+    ):
+        """Initialize the batcher."""
+        self._client = client
+        self._delay = delay
+        self._hass = hass
+        self._pending: dict[str, list[asyncio.Future]] = {}
+        self._metrics: list[FnuggMetrics] = []
+        self._priority = PRIORITY_DEFAULT
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._flush_task: asyncio.Task | None = None
+
+    async def async_get_resort(
+        self,
+        resort_id: str,
+        metrics: FnuggMetrics | None = None,
+        priority: int = PRIORITY_DEFAULT,
+    ) -> dict[str, Any] | None:
+        """Return the search hit for a resort once the current batch is flushed.
+
+        ``metrics`` receive the size and decode time of the whole batch.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._priority = min(self._priority, priority) if self._pending else priority
+        self._pending.setdefault(str(resort_id), []).append(future)
+        if metrics is not None:
+            self._metrics.append(metrics)
+        if self._flush_handle is None:
+            self._flush_handle = loop.call_later(self._delay, self._schedule_flush)
+        return await future
+
+    def _schedule_flush(self) -> None:
+        """Start flushing the pending batch."""
+        self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        metrics, self._metrics = self._metrics, []
+        flush = self._async_flush(pending, metrics, self._priority)
+        if self._hass is not None:
+            self._flush_task = self._hass.async_create_background_task(
+                flush, f"{DOMAIN} resort batch"
+            )
+        else:
+            self._flush_task = asyncio.get_running_loop().create_task(flush)
+
+    async def _async_flush(
+        self,
+        pending: dict[str, list[asyncio.Future]],
+        metrics: list[FnuggMetrics],
+        priority: int,
+    ) -> None:
+        """Fetch all pending resorts and hand each caller its own hit."""
+        hits: dict[str, dict[str, Any]] = {}
+        try:
+            hits = await self._async_search(list(pending), metrics, priority)
+        except FnuggApiError as err:
+            if err.transient:
+                self._fail(pending, err)
+                return
+            _LOGGER.warning("Batched resort fetch failed, fetching resorts one by one: %s", err)
+        except Exception as err:
+            # A malformed response; every caller gets the error
+            self._fail(pending, err)
+            return
+        except BaseException as err:
+            # Cancelled, most likely at shutdown; no caller may be left waiting
+            self._fail(pending, err)
+            raise
+
+        _LOGGER.debug("Batched resort fetch returned %d of %d resorts", len(hits), len(pending))
+        for resort_id, futures in pending.items():
+            hit = hits.get(resort_id)
+            for future in futures:
+                if not future.done():
+                    future.set_result(hit)
+
+    @staticmethod
+    def _fail(pending: dict[str, list[asyncio.Future]], err: BaseException) -> None:
+        """Hand ``err`` to every caller still waiting, or cancel them with the flush."""
+        for futures in pending.values():
+            for future in futures:
+                if future.done():
+                    continue
+                if isinstance(err, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(err)
+
+    async def _async_search(
+        self, resort_ids: list[str], metrics: list[FnuggMetrics], priority: int
+    ) -> dict[str, dict[str, Any]]:
+        """Run one search request for the given resorts and split it per resort."""
+        params = {
+            "type": "resort",
+            "facet": f"id:{','.join(resort_ids)}",
+            "size": str(len(resort_ids)),
+            "sourceFields": ",".join(SOURCE_FIELDS),
+        }
+        result = await self._client.async_get(
+            "/search",
+            params,
+            SEARCH_TREE,
+            endpoint="search",
+            metrics=metrics,
+            priority=priority,
+        )
+
+        wanted = set(resort_ids)
+        hits = {}
+        for hit in result.get("hits", {}).get("hits", []):
+            resort_id = str(hit.get("_id"))
+            if resort_id in wanted and hit.get("_source"):
+                hits[resort_id] = hit
+        return hits
@@ -0,0 +1,194 @@
+"""Latest blog post for every configured resort, on its own cadence."""
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+import logging
+
+from homeassistant import config_entries
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.update_coordinator import (
+    DataUpdateCoordinator,
+    UpdateFailed,
+)
+
+from .api import FnuggApiClient, FnuggApiError
+from .const import (
+    BATCH_DELAY,
+    BLOG_POSTS_PER_SITE,
+    DEFAULT_BLOG_INTERVAL,
+    DOMAIN,
+)
+from .events import async_fire_resort_events, blog_event, blog_post_changed
+from .projection import BLOG_SEARCH_TREE, BLOG_SOURCE_FIELDS
+from .scheduler import PRIORITY_BACKGROUND, FnuggScheduler
+
+_LOGGER = logging.getLogger(__name__)
+
+BLOG_IMAGE_KEYS = (
+    "image_full",
+    "image_1_1_l",
+    "image_1_1_s",
+    "image_16_9_m",
+    "image_16_9_s",
+    "image_16_9_xl",
+    "image_16_9_xl_nc",
+)
+
+
+def build_blog_sensor(blog):
+    """Return the blog_post_title sensor tuple for a blog post ``_source``."""
+    blog = blog or {}
+    blog_images = blog.get("images") or {}
+    blog_attrs = {
+        "description": (blog.get("description") or "").strip() or None,
+        "date": blog.get("date"),
+        "date_modified": blog.get("modified") or None,
+        "author": (blog.get("author") or {}).get("name") or None,
+    }
+    for key in BLOG_IMAGE_KEYS:
+        if key in blog_images:
+            blog_attrs[key] = blog_images[key]
+
+    return ((blog.get("title") or "").strip() or None, blog_attrs)
+
+
+def _site_id(blog):
+    """Return the resort id a blog post belongs to."""
+    site = blog.get("site")
+    if isinstance(site, dict):
+        site = site.get("id")
+    return str(site) if site is not None else None
+
+
+class FnuggBlogCoordinator(DataUpdateCoordinator[dict[str, tuple]]):
+    """Fetch the latest blog post of all resorts with one search request.
+
+    The data maps each registered resort id to its blog_post_title sensor
+    tuple. A resort that is missing from a response keeps its cached post.
+    With a ``scheduler``, fetches are moved to the coordinator's phase.
+
+    The coordinator is shared by all entries, so it is not tied to the entry
+    that happens to create it and is shut down when the last resort is
+    removed.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client: FnuggApiClient,
+        scheduler: FnuggScheduler | None = None,
+    ) -> None:
+        """Initialize the coordinator."""
+        token = config_entries.current_entry.set(None)
+        try:
+            super().__init__(
+                hass,
+                _LOGGER,
+                name=f"{DOMAIN} blog",
+                update_interval=DEFAULT_BLOG_INTERVAL,
+                request_refresh_debouncer=Debouncer(
+                    hass, _LOGGER, cooldown=BATCH_DELAY, immediate=False
+                ),
+            )
+        finally:
+            config_entries.current_entry.reset(token)
+        self._client = client
+        self._scheduler = scheduler
+        self._intervals: dict[str, timedelta] = {}
+        # Every picture of the latest post by resort, for diagnostics
+        self.images: dict[str, dict] = {}
+        self.data = {}
+
+    @property
+    def resort_ids(self) -> list[str]:
+        """Return the resorts blog posts are fetched for."""
+        return list(self._intervals)
+
+    async def async_add_resort(self, resort_id: str, interval: timedelta) -> None:
+        """Start fetching blog posts for a resort."""
+        self._intervals[str(resort_id)] = interval
+        self.update_interval = min(self._intervals.values())
+        await self.async_request_refresh()
+
+    def async_remove_resort(self, resort_id: str) -> None:
+        """Stop fetching blog posts for a resort."""
+        self._intervals.pop(str(resort_id), None)
+        self.data.pop(str(resort_id), None)
+        self.images.pop(str(resort_id), None)
+        if self._intervals:
+            self.update_interval = min(self._intervals.values())
+
+    async def _async_update_data(self) -> dict[str, tuple]:
+        """Fetch the latest post of every registered resort."""
+        sites = self.resort_ids
+        if not sites:
+            return {}
+
+        size = len(sites) * BLOG_POSTS_PER_SITE
+        try:
+            latest, capped = await self._async_search(sites, size)
+            # Resorts that post often can fill the combined response and push
+            # out the latest post of a quieter one, so those are asked for alone
+            missing = [site_id for site_id in sites if site_id not in latest]
+            if capped and missing:
+                results = await asyncio.gather(
+                    *(self._async_search([site_id], 1) for site_id in missing),
+                    return_exceptions=True,
+                )
+                for site_id, result in zip(missing, results):
+                    if isinstance(result, FnuggApiError):
+                        _LOGGER.debug("Failed to fetch blog post for %s: %s", site_id, result)
+                    elif isinstance(result, BaseException):
+                        raise result
+                    else:
+                        latest.update(result[0])
+        except FnuggApiError as err:
+            raise UpdateFailed(f"Failed to fetch blog posts: {err}") from err
+
+        data = {}
+        for site_id in sites:
+            if site_id in latest:
+                data[site_id] = build_blog_sensor(latest[site_id])
+                self.images[site_id] = latest[site_id].get("images") or {}
+                if blog_post_changed(self.data.get(site_id), data[site_id]):
+                    async_fire_resort_events(self.hass, site_id, [blog_event(data[site_id])])
+            elif site_id in self.data:
+                data[site_id] = self.data[site_id]
+            else:
+                data[site_id] = build_blog_sensor(None)
+        _LOGGER.debug("Blog posts updated for %d of %d resorts", len(latest), len(sites))
+        if self._scheduler is not None:
+            self.update_interval = self._scheduler.stagger(self, min(self._intervals.values()))
+        return data
+
+    async def _async_search(self, sites: list[str], size: int) -> tuple[dict[str, dict], bool]:
+        """Return the latest post ``_source`` by site among the ``size`` newest posts.
+
+        The flag is True when the response was full, so older posts may
+        have been left out.
+        """
+        params = {
+            "type": "blog_post",
+            "facet": f"site:{','.join(sites)}",
+            "sort": "date:desc",
+            "size": str(size),
+            "sourceFields": ",".join(BLOG_SOURCE_FIELDS),
+        }
+        result = await self._client.async_get(
+            "/search",
+            params,
+            BLOG_SEARCH_TREE,
+            endpoint="blog",
+            priority=PRIORITY_BACKGROUND,
+        )
+        hits = result.get("hits", {}).get("hits", [])
+        # Hits are sorted newest first, so the first hit per site is its latest post
+        latest = {}
+        for hit in hits:
+            blog = hit.get("_source") or {}
+            site_id = _site_id(blog)
+            if site_id is not None and site_id not in latest:
+                latest[site_id] = blog
+        return latest, len(hits) >= size
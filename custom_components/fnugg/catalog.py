@@ -0,0 +1,241 @@
+"""Resort catalog shared by config flows."""
+from __future__ import annotations
+
+import asyncio
+from bisect import bisect_left
+import logging
+from typing import Any
+import unicodedata
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .api import FnuggApiClient, FnuggApiError, async_get_client
+from .const import (
+    CATALOG_PAGE_SIZE,
+    CATALOG_STORAGE_KEY,
+    CATALOG_TTL,
+    DATA_CATALOG,
+    DOMAIN,
+    STORAGE_VERSION,
+)
+from .projection import CATALOG_SEARCH_TREE, CATALOG_SOURCE_FIELDS
+from .spatial import ResortIndex
+
+_LOGGER = logging.getLogger(__name__)
+
+# Letters without a Unicode decomposition, folded by hand
+_FOLD = str.maketrans(
+    {"ø": "o", "æ": "ae", "œ": "oe", "ð": "d", "đ": "d", "þ": "th", "ł": "l"}
+)
+
+
+def parse_location(location) -> tuple[float, float] | None:
+    """Return (latitude, longitude) of a resort ``location`` object."""
+    if not isinstance(location, dict):
+        return None
+    latitude = location.get("lat")
+    longitude = next(
+        (location[key] for key in ("lng", "lon", "long") if location.get(key) is not None),
+        None,
+    )
+    try:
+        return float(latitude), float(longitude)
+    except (TypeError, ValueError):
+        return None
+
+
+def fold_name(name: str) -> str:
+    """Return ``name`` case- and diacritic-folded for matching, e.g. "Ål" -> "al"."""
+    decomposed = unicodedata.normalize("NFKD", name.casefold().translate(_FOLD))
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+class FnuggResortCatalog:
+    """Every resort offered by the Fnugg API, indexed by folded name and location.
+
+    The catalog is kept in memory and on disk. Once it is older than
+    ``CATALOG_TTL`` callers still get the cached resorts right away while a
+    refresh runs in the background. A refresh reads the first page of the
+    resort search for the total and then fetches the other pages concurrently.
+    """
+
+    def __init__(self, hass: HomeAssistant, client: FnuggApiClient) -> None:
+        """Initialize the catalog."""
+        self._hass = hass
+        self._client = client
+        self._store = Store(hass, STORAGE_VERSION, CATALOG_STORAGE_KEY)
+        self._loaded = False
+        self._refresh_task: asyncio.Task | None = None
+        self.resorts: dict[str, str] = {}
+        self.fetched_at = None
+        # Folded names and their resort ids, sorted by folded name
+        self._folded: list[str] = []
+        self._ids: list[str] = []
+        # Resort id -> (latitude, longitude), and the tree built over them
+        self.locations: dict[str, tuple[float, float]] = {}
+        self._index = ResortIndex({})
+
+    @property
+    def expired(self) -> bool:
+        """Return True if the catalog is missing or older than the TTL."""
+        return self.fetched_at is None or dt_util.utcnow() - self.fetched_at > CATALOG_TTL
+
+    async def async_get_resorts(self) -> dict[str, str]:
+        """Return resort id -> name, fetching only if nothing is cached."""
+        if not self._loaded:
+            await self._async_load()
+        if not self.resorts:
+            await self.async_refresh()
+        elif self.expired:
+            self._start_refresh()
+        return self.resorts
+
+    async def async_refresh(self) -> None:
+        """Fetch the catalog, joining a refresh that is already running."""
+        # Shield the shared task so a closed flow does not abort it for others
+        await asyncio.shield(self._start_refresh())
+
+    def search(self, query: str, limit: int | None = None) -> list[tuple[str, str]]:
+        """Return (resort id, name) pairs matching ``query``.
+
+        Names starting with the query come first, then names containing it,
+        each in alphabetical order. An empty query matches every resort.
+        """
+        folded = fold_name(query.strip())
+        start = bisect_left(self._folded, folded)
+        end = start
+        while end < len(self._folded) and self._folded[end].startswith(folded):
+            end += 1
+        indexes = list(range(start, end))
+        if folded:
+            indexes.extend(
+                index
+                for index, name in enumerate(self._folded)
+                if folded in name and not start <= index < end
+            )
+        return [(self._ids[index], self.resorts[self._ids[index]]) for index in indexes[:limit]]
+
+    def nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        limit: int | None = None,
+        radius_km: float | None = None,
+    ) -> list[tuple[str, str, float]]:
+        """Return (resort id, name, distance in km) for the nearest resorts."""
+        return [
+            (resort_id, self.resorts[resort_id], distance)
+            for resort_id, distance in self._index.nearest(
+                latitude, longitude, limit, radius_km
+            )
+        ]
+
+    @callback
+    def _start_refresh(self) -> asyncio.Task:
+        """Return the running refresh task, starting one if needed."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = self._hass.async_create_background_task(
+                self._async_fetch(), f"{DOMAIN} catalog refresh"
+            )
+            self._refresh_task.add_done_callback(self._refresh_done)
+        return self._refresh_task
+
+    @staticmethod
+    def _refresh_done(task: asyncio.Task) -> None:
+        """Log a failed refresh nobody waited for."""
+        if not task.cancelled() and (err := task.exception()) is not None:
+            _LOGGER.debug("Resort catalog refresh failed: %s", err)
+
+    async def _async_load(self) -> None:
+        """Load the catalog saved by an earlier refresh."""
+        self._loaded = True
+        if not (stored := await self._store.async_load()):
+            return
+        # Catalogs saved without locations are refreshed in the background
+        fetched_at = (
+            dt_util.parse_datetime(stored["fetched_at"]) if "locations" in stored else None
+        )
+        self._set_resorts(
+            stored["resorts"],
+            fetched_at,
+            {resort_id: tuple(location) for resort_id, location in stored.get("locations", {}).items()},
+        )
+
+    async def _async_fetch(self) -> None:
+        """Fetch every page of the resort search and save the result."""
+        first = await self._async_fetch_page(0)
+        total = first.get("hits", {}).get("total") or 0
+        if isinstance(total, dict):
+            total = total.get("value") or 0
+        pages = [first, *await asyncio.gather(
+            *(
+                self._async_fetch_page(start)
+                for start in range(CATALOG_PAGE_SIZE, total, CATALOG_PAGE_SIZE)
+            )
+        )]
+
+        resorts = {}
+        locations = {}
+        for page in pages:
+            for hit in page.get("hits", {}).get("hits", []):
+                resort_id = hit.get("_id")
+                source = hit.get("_source") or {}
+                name = source.get("name")
+                if resort_id and name:
+                    resorts[str(resort_id)] = str(name)
+                    if (location := parse_location(source.get("location"))) is not None:
+                        locations[str(resort_id)] = location
+        if not resorts:
+            raise FnuggApiError(
+                "No resorts in the Fnugg resort search",
+                transient=False,
+                kind="invalid_response",
+            )
+
+        _LOGGER.debug("Fetched %d resorts in %d pages", len(resorts), len(pages))
+        self._set_resorts(resorts, dt_util.utcnow(), locations)
+        await self._store.async_save(
+            {
+                "fetched_at": self.fetched_at.isoformat(),
+                "resorts": resorts,
+                "locations": locations,
+            }
+        )
+
+    async def _async_fetch_page(self, start: int) -> dict[str, Any]:
+        """Fetch one page of resort ids, names and locations."""
+        params = {
+            "type": "resort",
+            "from": str(start),
+            "size": str(CATALOG_PAGE_SIZE),
+            "sourceFields": ",".join(CATALOG_SOURCE_FIELDS),
+        }
+        return await self._client.async_get(
+            "/search", params, CATALOG_SEARCH_TREE, endpoint="catalog"
+        )
+
+    def _set_resorts(
+        self,
+        resorts: dict[str, str],
+        fetched_at,
+        locations: dict[str, tuple[float, float]],
+    ) -> None:
+        """Replace the catalog and rebuild the name and location indexes."""
+        index = sorted((fold_name(name), resort_id) for resort_id, name in resorts.items())
+        self.resorts = resorts
+        self.fetched_at = fetched_at
+        self._folded = [name for name, _ in index]
+        self._ids = [resort_id for _, resort_id in index]
+        self.locations = locations
+        self._index = ResortIndex(locations)
+
+
+@callback
+def async_get_catalog(hass: HomeAssistant) -> FnuggResortCatalog:
+    """Return the resort catalog shared by all config flows."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_CATALOG not in domain_data:
+        domain_data[DATA_CATALOG] = FnuggResortCatalog(hass, async_get_client(hass))
+    return domain_data[DATA_CATALOG]
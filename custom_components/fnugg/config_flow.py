@@ -5,57 +5,45 @@ import logging
 from typing import Any
 
 import voluptuous as vol
-import aiohttp
 
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.selector import (
     SelectSelector,
     SelectSelectorConfig,
 )
 
-from .const import DOMAIN
+from .api import FnuggApiError
+from .catalog import async_get_catalog
+from .const import (
+    CONF_BATCH_FETCH,
+    CONF_BLOG_INTERVAL,
+    CONF_MAX_DATA_AGE,
+    CONF_MAX_INTERVAL,
+    CONF_MIN_INTERVAL,
+    CONF_SLOPE_SENSORS,
+    DEFAULT_BATCH_FETCH,
+    DEFAULT_BLOG_INTERVAL,
+    DEFAULT_MAX_DATA_AGE,
+    DEFAULT_MAX_INTERVAL,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_SLOPE_SENSORS,
+    DOMAIN,
+    MAX_SEARCH_RESULTS,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
-async def get_resorts(hass: HomeAssistant) -> list[dict[str, str]]:
-    """Get list of available resorts from Fnugg API."""
-    session = async_get_clientsession(hass)
-    resorts = []
-    
+CONF_QUERY = "query"
+
+async def get_resorts(hass: HomeAssistant) -> dict[str, str]:
+    """Get resort id -> name for every resort, from the cache when possible."""
     try:
-        _LOGGER.debug("Fetching resorts from Fnugg API")
-        async with session.get("https://api.fnugg.no/search?size=150") as resp:
-            if resp.status != 200:
-                _LOGGER.error("Failed to get resorts. Status: %s", resp.status)
-                raise CannotConnect
-            
-            data = await resp.json()
-            _LOGGER.debug("Got response from Fnugg API")
-            
-            hits = data.get("hits", {}).get("hits", [])
-            _LOGGER.debug("Found %d resorts", len(hits))
-            
-            for hit in hits:
-                source = hit.get("_source", {})
-                resort_id = hit.get("_id")
-                name = source.get("name")
-                if resort_id and name:
-                    resorts.append({
-                        "label": str(name),
-                        "value": str(resort_id)
-                    })
-                    _LOGGER.debug("Added resort: %s (ID: %s)", name, resort_id)
-            
-            sorted_resorts = sorted(resorts, key=lambda x: x["label"])
-            _LOGGER.debug("Returning %d sorted resorts", len(sorted_resorts))
-            return sorted_resorts
-            
-    except aiohttp.ClientError as err:
-        _LOGGER.error("Error connecting to Fnugg: %s", err)
+        return await async_get_catalog(hass).async_get_resorts()
+    except FnuggApiError as err:
+        _LOGGER.error("Error fetching resorts from Fnugg: %s", err)
         raise CannotConnect from err
 
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -65,18 +53,17 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     def __init__(self):
         """Initialize the config flow."""
-        self._resorts: list[dict[str, str]] = []
+        self._resorts: dict[str, str] = {}
+        self._matches: list[tuple[str, str]] = []
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
-        """Handle the initial step."""
+        """Search the resort catalog by name."""
         errors: dict[str, str] = {}
 
         try:
-            if not self._resorts:
-                self._resorts = await get_resorts(self.hass)
-                _LOGGER.debug("Got %d resorts for config flow", len(self._resorts))
+            self._resorts = await get_resorts(self.hass)
         except CannotConnect:
             errors["base"] = "cannot_connect"
             return self.async_show_form(
@@ -84,12 +71,41 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 errors=errors,
             )
 
+        if user_input is not None:
+            catalog = async_get_catalog(self.hass)
+            query = user_input.get(CONF_QUERY, "").strip()
+            if not query and catalog.locations:
+                # Without a name, offer the resorts nearest to home
+                self._matches = [
+                    (resort_id, f"{name} ({distance:.0f} km)")
+                    for resort_id, name, distance in catalog.nearest(
+                        self.hass.config.latitude,
+                        self.hass.config.longitude,
+                        MAX_SEARCH_RESULTS,
+                    )
+                ]
+            else:
+                self._matches = catalog.search(query, MAX_SEARCH_RESULTS)
+            if self._matches:
+                return await self.async_step_select()
+            errors[CONF_QUERY] = "no_match"
+
+        return self.async_show_form(
+            step_id="user",
+            data_schema=vol.Schema({
+                vol.Optional(CONF_QUERY, default=""): str,
+            }),
+            errors=errors,
+            description_placeholders={"count": str(len(self._resorts))},
+        )
+
+    async def async_step_select(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Pick one of the matching resorts."""
         if user_input is not None:
             resort_id = user_input["resort"]
-            resort_name = next(
-                (resort["label"] for resort in self._resorts if resort["value"] == resort_id),
-                resort_id
-            )
+            resort_name = self._resorts.get(resort_id, resort_id)
 
             await self.async_set_unique_id(resort_id)
             self._abort_if_unique_id_configured()
@@ -100,12 +116,83 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             )
 
         return self.async_show_form(
-            step_id="user",
+            step_id="select",
+            data_schema=vol.Schema({
+                vol.Required("resort"): SelectSelector(
+                    SelectSelectorConfig(
+                        options=[
+                            {"value": resort_id, "label": name}
+                            for resort_id, name in self._matches
+                        ]
+                    )
+                )
+            }),
+        )
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler(config_entry)
+
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle Fnugg options."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize the options flow."""
+        self.config_entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the options."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            if user_input[CONF_MIN_INTERVAL] > user_input[CONF_MAX_INTERVAL]:
+                errors["base"] = "invalid_interval"
+            elif (
+                user_input[CONF_MAX_DATA_AGE]
+                < user_input[CONF_MAX_INTERVAL] + user_input[CONF_MIN_INTERVAL]
+            ):
+                # A failed fetch is retried after the shortest interval, before
+                # the data of the previous fetch gets too old
+                errors["base"] = "invalid_max_data_age"
+            else:
+                return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
             data_schema=vol.Schema({
-                vol.Required("resort"): vol.In({
-                    resort["value"]: resort["label"] 
-                    for resort in self._resorts
-                })
+                vol.Optional(
+                    CONF_BATCH_FETCH,
+                    default=options.get(CONF_BATCH_FETCH, DEFAULT_BATCH_FETCH),
+                ): bool,
+                vol.Optional(
+                    CONF_BLOG_INTERVAL,
+                    default=options.get(
+                        CONF_BLOG_INTERVAL,
+                        int(DEFAULT_BLOG_INTERVAL.total_seconds() // 60),
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=15)),
+                vol.Optional(
+                    CONF_MIN_INTERVAL,
+                    default=options.get(CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Optional(
+                    CONF_MAX_INTERVAL,
+                    default=options.get(CONF_MAX_INTERVAL, DEFAULT_MAX_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Optional(
+                    CONF_MAX_DATA_AGE,
+                    default=options.get(CONF_MAX_DATA_AGE, DEFAULT_MAX_DATA_AGE),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Optional(
+                    CONF_SLOPE_SENSORS,
+                    default=options.get(CONF_SLOPE_SENSORS, DEFAULT_SLOPE_SENSORS),
+                ): bool,
             }),
             errors=errors,
         )
@@ -1,23 +1,118 @@
 """Constants for the Fnugg integration."""
-from homeassistant.components.sensor import (
-    SensorDeviceClass,
-)
-from homeassistant.const import (
-    DEGREE,
-    UnitOfLength,
-    UnitOfSpeed,
-    UnitOfTemperature,
-    PERCENTAGE,
-)
+from datetime import timedelta
 
 DOMAIN = "fnugg"
 
-# Define which sensors are numeric (will have state_class = measurement)
-NUMERIC_SENSORS = [
-    "temp", "wind_speed", "snow_depth", "new_snow",
-    "lifts_open", "lifts_total", "slopes_open", "slopes_total",
-    "lifts_percentage", "slopes_percentage"
-]
+API_BASE_URL = "https://api.fnugg.no"
+
+# How often each resort is fetched from the Fnugg API until the first
+# payload lets the adaptive polling pick an interval
+UPDATE_INTERVAL = timedelta(minutes=20)
+
+# Blog posts change a few times a week, so they are fetched less often
+DEFAULT_BLOG_INTERVAL = timedelta(hours=6)
+
+# Posts requested per resort in the combined blog search
+BLOG_POSTS_PER_SITE = 5
+
+# Seconds a resort fetch waits for other entries to join the same batch
+BATCH_DELAY = 0.5
+# Seconds calls of the refresh service are collected into one fetch per resort
+REFRESH_DEBOUNCE = 2
+
+# Seconds one request attempt may take, body included
+REQUEST_TIMEOUT = 10
+# Retries of a failed request, with exponential backoff from the base delay
+MAX_RETRIES = 2
+RETRY_BASE_DELAY = 1
+# Longest wait (seconds) before a retry; longer Retry-After values pause requests
+RETRY_MAX_DELAY = 30
+# Failed requests in a row that pause all requests to the API
+BREAKER_THRESHOLD = 5
+# Seconds requests are paused, doubled after each failed trial request
+BREAKER_COOLDOWN = 60
+BREAKER_MAX_COOLDOWN = 30 * 60
+
+# Requests to the API per minute, with bursts of up to REQUEST_BURST
+REQUEST_RATE = 30
+REQUEST_BURST = 10
+# Requests to the API running at the same time
+REQUEST_CONCURRENCY = 4
+# Window the first background refreshes after a restart are spread over
+STARTUP_SPREAD = timedelta(minutes=2)
+
+# Options
+CONF_BATCH_FETCH = "batch_fetch"
+DEFAULT_BATCH_FETCH = True
+CONF_BLOG_INTERVAL = "blog_interval"
+CONF_MIN_INTERVAL = "min_interval"
+CONF_MAX_INTERVAL = "max_interval"
+CONF_MAX_DATA_AGE = "max_data_age"
+CONF_SLOPE_SENSORS = "slope_sensors"
+# One sensor per slope adds an entity for every slope, so it is opt-in
+DEFAULT_SLOPE_SENSORS = False
+# Bounds for the adaptive polling interval, in minutes
+DEFAULT_MIN_INTERVAL = 5
+DEFAULT_MAX_INTERVAL = 24 * 60
+# Minutes the last good data is shown before sensors become unavailable
+DEFAULT_MAX_DATA_AGE = 36 * 60
+
+# Persisted last good snapshot per entry
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.snapshot"
+# Seconds snapshot writes are delayed so frequent fetches are coalesced
+SNAPSHOT_SAVE_DELAY = 300
+
+# Rolling history kept per resort for the trend sensors. Fetches closer
+# together than the sample interval replace the newest sample, so the
+# capacity always covers eight days
+HISTORY_SAMPLE_INTERVAL = timedelta(minutes=30)
+HISTORY_CAPACITY = 8 * 24 * 2
+# Samples the temperature trend is fitted over
+TEMPERATURE_TREND_WINDOW = timedelta(hours=3)
+
+# Resort catalog used by the config flow
+CATALOG_STORAGE_KEY = f"{DOMAIN}.catalog"
+# The resort list rarely changes; older catalogs are refreshed in the background
+CATALOG_TTL = timedelta(days=1)
+# Resorts per page of the catalog search
+CATALOG_PAGE_SIZE = 100
+# Most resorts offered for one search in the config flow
+MAX_SEARCH_RESULTS = 50
+# Defaults of the find_resorts service
+DEFAULT_SEARCH_RADIUS = 150
+DEFAULT_SEARCH_LIMIT = 20
+
+# Resort and blog images, cached on disk for the image entities
+IMAGE_CACHE_DIR = f".cache/{DOMAIN}"
+IMAGE_CACHE_STORAGE_KEY = f"{DOMAIN}.images"
+# Least recently used images are removed once the cache is larger than this
+IMAGE_CACHE_MAX_BYTES = 50 * 1024 * 1024
+# How long a cached image is served before it is revalidated with the CDN
+IMAGE_REVALIDATE_INTERVAL = timedelta(hours=6)
+# Bounding box of the JPEG thumbnails made when an image is downloaded
+IMAGE_THUMBNAIL_SIZE = (320, 320)
+
+# Events fired when consecutive resort snapshots differ
+EVENT_LIFT_STATUS_CHANGED = f"{DOMAIN}_lift_status_changed"
+EVENT_RESORT_OPENED = f"{DOMAIN}_resort_opened"
+EVENT_RESORT_CLOSED = f"{DOMAIN}_resort_closed"
+EVENT_NEW_SNOW = f"{DOMAIN}_new_snow"
+EVENT_NEW_BLOG_POST = f"{DOMAIN}_new_blog_post"
+# New snow today (cm) that fires a new snow event when first reached
+NEW_SNOW_THRESHOLDS = (1, 5, 10, 20, 30)
+
+# Resorts listed in the attributes of each cross-resort ranking sensor
+AGGREGATE_TOP_N = 5
+
+# Keys for integration-wide objects in hass.data[DOMAIN]
+DATA_BATCHER = "batcher"
+DATA_CLIENT = "client"
+DATA_BLOG = "blog"
+DATA_CATALOG = "catalog"
+DATA_IMAGES = "images"
+DATA_AGGREGATES = "aggregates"
+DATA_SCHEDULER = "scheduler"
 
 # Add lift status enum
 LIFT_STATUS = {
@@ -25,42 +120,3 @@ LIFT_STATUS = {
     1: "Open",
     None: "Unknown"
 }
-
-
-
-SENSOR_TYPES = {
-    # Basic Info (non-numeric)
-    "resort_status": ["", None, False],
-    "resort_opening_date": ["", None, False],
-    "resort_closing_date": ["", None, False],
-    
-    # Weather Conditions (numeric)
-    "temp": [UnitOfTemperature.CELSIUS, SensorDeviceClass.TEMPERATURE, True],
-    "wind_speed": [UnitOfSpeed.METERS_PER_SECOND, SensorDeviceClass.WIND_SPEED, True],
-    "wind_direction": [DEGREE, None, True],
-    "condition_description": ["", None, False],
-    
-    # Snow Info
-    "snow_depth": [UnitOfLength.CENTIMETERS, None, True],
-    "new_snow": [UnitOfLength.CENTIMETERS, None, True],
-    
-    # Lift Status
-    "lifts_total": ["lifts", None, True],
-    "lifts_open": ["lifts", None, True],
-    "lifts_percentage": [PERCENTAGE, None, True],
-    "lifts_status_text": ["", None, False],  # Text status of lifts
-    
-    # Slope Status
-    "slopes_total": ["slopes", None, True],
-    "slopes_open": ["slopes", None, True],
-    "slopes_percentage": [PERCENTAGE, None, True],
-    "slopes_status": ["", None, False],  # Text status of slopes
-    
-
-    # Facility Status
-    "facility_status": ["", None, False],
-
-    # Blog Post
-    "blog_post_title": ["", None, False],
-
-} 
\ No newline at end of file
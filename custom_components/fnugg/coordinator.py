@@ -0,0 +1,259 @@
+"""Update coordinator for the Fnugg integration."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Hashable
+from datetime import timedelta
+import logging
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import (
+    DataUpdateCoordinator,
+    UpdateFailed,
+)
+from homeassistant.util import dt as dt_util
+
+from .api import FnuggApiError
+from .events import async_fire_resort_events, resort_events
+from .const import (
+    DEFAULT_MAX_DATA_AGE,
+    DEFAULT_MAX_INTERVAL,
+    DEFAULT_MIN_INTERVAL,
+    DOMAIN,
+    SNAPSHOT_SAVE_DELAY,
+    UPDATE_INTERVAL,
+)
+from .polling import compute_update_schedule
+from .scheduler import FnuggScheduler
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class FnuggDataUpdateCoordinator(DataUpdateCoordinator[dict[str, tuple]]):
+    """Fetch data for one resort once per interval and share it with all entities.
+
+    With a ``scheduler``, each fetch is moved to the phase of ``phase_key``
+    within the adaptive interval. Entries sharing a batcher share its phase,
+    so their fetches still land in one batch.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        fnugg_data,
+        store: Store | None = None,
+        min_interval: timedelta = timedelta(minutes=DEFAULT_MIN_INTERVAL),
+        max_interval: timedelta = timedelta(minutes=DEFAULT_MAX_INTERVAL),
+        max_data_age: timedelta = timedelta(minutes=DEFAULT_MAX_DATA_AGE),
+        scheduler: FnuggScheduler | None = None,
+        phase_key: Hashable | None = None,
+    ) -> None:
+        """Initialize the coordinator."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN} {fnugg_data.resort_name}",
+            update_interval=UPDATE_INTERVAL,
+        )
+        self.fnugg_data = fnugg_data
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._max_data_age = max_data_age
+        self._store = store
+        self._scheduler = scheduler
+        self.phase_key = phase_key if phase_key is not None else self
+        self._fetch_task: asyncio.Task | None = None
+        self._unsub_expiry: CALLBACK_TYPE | None = None
+        # True while the data comes from the stored snapshot
+        self.restored = False
+        # Failed fetches in a row, for the retry backoff
+        self._failures = 0
+        # Whether a snapshot is on disk, and whether a newer one is waiting
+        self._snapshot_saved = False
+        self._snapshot_pending = False
+
+    @property
+    def stale(self) -> bool:
+        """Return True if the data is not from the latest fetch attempt."""
+        return self.restored or not self.last_update_success
+
+    @property
+    def fetch_in_progress(self) -> bool:
+        """Return True while a fetch from the API is running."""
+        return self._fetch_task is not None and not self._fetch_task.done()
+
+    @property
+    def data_age(self) -> timedelta | None:
+        """Return how old the last good data is."""
+        if self.fnugg_data.fetched_at is None:
+            return None
+        return dt_util.utcnow() - self.fnugg_data.fetched_at
+
+    @property
+    def data_expired(self) -> bool:
+        """Return True if the last good data is too old to be shown."""
+        age = self.data_age
+        return age is None or age > self._max_data_age
+
+    async def async_restore_snapshot(self) -> bool:
+        """Load the last good snapshot, returning True if there was one."""
+        if self._store is None or not (snapshot := await self._store.async_load()):
+            return False
+        fetched_at = dt_util.parse_datetime(snapshot.get("fetched_at") or "")
+        try:
+            self.fnugg_data.history.load(snapshot.get("history"))
+            self.fnugg_data.apply_document(snapshot["resort"], fetched_at)
+        except (KeyError, TypeError, AttributeError, ValueError) as err:
+            _LOGGER.warning(
+                "Ignoring invalid snapshot for %s: %s", self.fnugg_data.resort_name, err
+            )
+            return False
+        self.data = self.fnugg_data.sensors
+        self.restored = True
+        self._snapshot_saved = True
+        self._schedule_expiry()
+        _LOGGER.debug(
+            "Restored %s from snapshot taken %s ago",
+            self.fnugg_data.resort_name,
+            self.data_age,
+        )
+        return True
+
+    async def async_save_snapshot(self) -> None:
+        """Write a pending snapshot now instead of after the save delay."""
+        if self._store is None or not self._snapshot_pending:
+            return
+        self._snapshot_pending = False
+        await self._store.async_save(self._snapshot())
+
+    @callback
+    def _snapshot(self) -> dict[str, Any]:
+        """Return the data to store."""
+        return {
+            "fetched_at": self.fnugg_data.fetched_at.isoformat(),
+            "resort": self.fnugg_data.document,
+            "history": self.fnugg_data.history.as_dict(),
+        }
+
+    @callback
+    def _schedule_expiry(self) -> None:
+        """Notify entities when the current data passes the maximum age."""
+        self.async_cancel_expiry()
+        self._unsub_expiry = async_track_point_in_utc_time(
+            self.hass,
+            self._handle_expiry,
+            self.fnugg_data.fetched_at + self._max_data_age,
+        )
+
+    @callback
+    def _handle_expiry(self, _now) -> None:
+        """Let entities mark themselves unavailable."""
+        self._unsub_expiry = None
+        _LOGGER.warning(
+            "Data for %s is older than %s", self.fnugg_data.resort_name, self._max_data_age
+        )
+        self.async_update_listeners()
+
+    @callback
+    def async_cancel_expiry(self) -> None:
+        """Cancel the expiry timer."""
+        if self._unsub_expiry:
+            self._unsub_expiry()
+            self._unsub_expiry = None
+
+    async def _async_refresh(self, *args: Any, **kwargs: Any) -> None:
+        """Refresh, also notifying entities after a repeated failure.
+
+        DataUpdateCoordinator only notifies on the first failure in a row,
+        which would leave the data_age attribute at its first stale value.
+        """
+        previous_update_success = self.last_update_success
+        await super()._async_refresh(*args, **kwargs)
+        if not previous_update_success and not self.last_update_success and self.data:
+            self.async_update_listeners()
+
+    async def _async_update_data(self) -> dict[str, tuple]:
+        """Fetch the resort, joining a fetch that is already in flight."""
+        if not self.fetch_in_progress:
+            self._fetch_task = self.hass.async_create_task(
+                self._async_fetch(), f"{self.name} fetch"
+            )
+        else:
+            _LOGGER.debug("Joining in-flight fetch for %s", self.fnugg_data.resort_name)
+        # Shield the shared task so one cancelled caller does not abort it for the others
+        return await asyncio.shield(self._fetch_task)
+
+    @callback
+    def _schedule_next_fetch(self) -> None:
+        """Set the interval until the next fetch, or the retry after a failure.
+
+        A retry comes before the last good data becomes too old, so one
+        failed fetch does not leave the sensors unavailable until the next
+        regular fetch.
+        """
+        fnugg_data = self.fnugg_data
+        age = self.data_age
+        interval, periodic = compute_update_schedule(
+            dt_util.now(),
+            fnugg_data.schedule,
+            *fnugg_data.season,
+            fnugg_data.resort_open,
+            fnugg_data.new_snow,
+            self._min_interval,
+            self._max_interval,
+            self._failures,
+            self._max_data_age - age if age is not None else None,
+        )
+        # Wake-ups timed for the run-up to opening and retries are kept as computed
+        if self._scheduler is not None and periodic:
+            interval = self._scheduler.stagger(
+                self.phase_key, interval, self._min_interval, self._max_interval
+            )
+        self.update_interval = interval
+        _LOGGER.debug(
+            "Next fetch for %s in %s after %d failed fetches",
+            fnugg_data.resort_name,
+            interval,
+            self._failures,
+        )
+
+    async def _async_fetch(self) -> dict[str, Any]:
+        """Run a single fetch against the Fnugg API."""
+        previous = self.data
+        try:
+            updated = await self.fnugg_data.update_data()
+        except FnuggApiError as err:
+            self._failures += 1
+            self._schedule_next_fetch()
+            raise UpdateFailed(str(err)) from err
+        if not updated:
+            self._failures += 1
+            self._schedule_next_fetch()
+            raise UpdateFailed(
+                f"Failed to get data from Fnugg for {self.fnugg_data.resort_name}"
+            )
+        self._failures = 0
+
+        fnugg_data = self.fnugg_data
+        if previous:
+            async_fire_resort_events(
+                self.hass,
+                fnugg_data.resort_id,
+                resort_events(previous, fnugg_data.sensors, fnugg_data.lift_names),
+            )
+        self.restored = False
+        self._schedule_expiry()
+        if self._store is not None and self._snapshot_saved:
+            # Flushed on unload, and by the store itself on the final write at shutdown
+            self._snapshot_pending = True
+            self._store.async_delay_save(self._snapshot, SNAPSHOT_SAVE_DELAY)
+        elif self._store is not None:
+            # Without a snapshot on disk, a reload would wait for the API again
+            await self._store.async_save(self._snapshot())
+            self._snapshot_saved = True
+
+        self._schedule_next_fetch()
+        return fnugg_data.sensors
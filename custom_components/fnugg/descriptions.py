@@ -0,0 +1,218 @@
+"""Static metadata of the Fnugg sensors, built once at import.
+
+Every entity of a kind shares one frozen description, so an entity only
+holds a reference to it. Home Assistant reads the name, unit, device class,
+state class, icon and entity category from the description.
+
+Sensors read from the resort document also name their source path in the
+``_source`` object, an optional transform of the value found there, and an
+optional compute step over the other extracted values. ``extraction``
+compiles these into one function, so a new sensor on an existing path is a
+single entry here.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import (
+    DEGREE,
+    PERCENTAGE,
+    EntityCategory,
+    UnitOfInformation,
+    UnitOfLength,
+    UnitOfSpeed,
+    UnitOfTemperature,
+    UnitOfTime,
+)
+
+MEASUREMENT = SensorStateClass.MEASUREMENT
+TOTAL_INCREASING = SensorStateClass.TOTAL_INCREASING
+
+# Prefix of the per-lift sensor ids
+LIFT_PREFIX = "lift_"
+# Prefix of the per-slope sensor ids, only built when enabled in the options
+SLOPE_PREFIX = "slope_"
+# Slope difficulties with their own count of open slopes
+SLOPE_DIFFICULTIES = ("green", "blue", "red", "black")
+
+# Condition paths by elevation
+TOP = "conditions.combined.top"
+BOTTOM = "conditions.combined.bottom"
+REPORT = "conditions.current_report.top"
+
+COMPASS = ("N", "NNE", "NE", "ENE", "E", "ESE", "SE", "SSE", "S", "SSW", "SW", "WSW", "W", "WNW", "NW", "NNW", "N")
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class FnuggSensorDescription(SensorEntityDescription):
+    """Metadata shared by all Fnugg sensors of one kind."""
+
+    # Dotted path in the resort ``_source`` the value is read from
+    source: str | None = None
+    # Applied to the value found at ``source``
+    transform: Callable[[Any], Any] | None = None
+    # Derives the value from the extracted values once every path is read;
+    # compute steps run in table order
+    compute: Callable[[dict[str, Any]], Any] | None = None
+    # Value when the path is missing or null
+    default: Any = None
+
+
+def _count(value):
+    return int(value)
+
+
+def _percentage(open_key, total_key):
+    def compute(values):
+        total = values[total_key]
+        return round(values[open_key] / total * 100) if total > 0 else 0
+    return compute
+
+
+def _status_text(kind):
+    open_key, total_key, percentage_key = f"{kind}_open", f"{kind}_total", f"{kind}_percentage"
+
+    def compute(values):
+        return (
+            f"{values[open_key]} of {values[total_key]} {kind} open "
+            f"({values[percentage_key]}%)"
+        )
+    return compute
+
+
+def _compass(degree):
+    return COMPASS[int((degree + 11.25) / 22.5)]
+
+
+def _resort_status(values):
+    return values["resort_status"] or ("Open" if values["resort_open"] else "Closed")
+
+
+def _describe(key, icon, unit=None, device_class=None, state_class=None, name=None, **kwargs):
+    """Return the description of a sensor, named after its key by default."""
+    return FnuggSensorDescription(
+        key=key,
+        name=name or key.replace("_", " ").title(),
+        icon=icon,
+        native_unit_of_measurement=unit,
+        device_class=device_class,
+        state_class=state_class,
+        **kwargs,
+    )
+
+
+def _diagnostic(key, icon, unit=None, device_class=None, state_class=None):
+    """Return the description of a metric sensor, disabled by default."""
+    return _describe(
+        key,
+        icon,
+        unit,
+        device_class,
+        state_class,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    )
+
+
+SENSOR_DESCRIPTIONS: dict[str, FnuggSensorDescription] = {
+    description.key: description
+    for description in (
+        # Weather Conditions
+        _describe("temp", "mdi:thermometer", UnitOfTemperature.CELSIUS, SensorDeviceClass.TEMPERATURE, MEASUREMENT, source=f"{TOP}.temperature.value"),
+        _describe("wind_speed", "mdi:weather-windy", UnitOfSpeed.METERS_PER_SECOND, SensorDeviceClass.WIND_SPEED, MEASUREMENT, source=f"{TOP}.wind.mps"),
+        _describe("wind_direction", "mdi:compass", DEGREE, source=f"{TOP}.wind.degree"),
+        _describe("wind_direction_text", "mdi:compass", source=f"{TOP}.wind.degree", transform=_compass),
+        _describe("condition_text", "mdi:weather-snowy", source=f"{TOP}.condition_description"),
+        # Snow Info
+        _describe("snow_depth", "mdi:ruler", UnitOfLength.CENTIMETERS, state_class=MEASUREMENT, source=f"{TOP}.snow.depth_slope"),
+        _describe("new_snow", "mdi:snowflake", UnitOfLength.CENTIMETERS, state_class=MEASUREMENT, source=f"{TOP}.snow.today"),
+        # Bottom station, disabled by default
+        _describe("temp_bottom", "mdi:thermometer", UnitOfTemperature.CELSIUS, SensorDeviceClass.TEMPERATURE, MEASUREMENT, source=f"{BOTTOM}.temperature.value", entity_registry_enabled_default=False),
+        _describe("wind_speed_bottom", "mdi:weather-windy", UnitOfSpeed.METERS_PER_SECOND, SensorDeviceClass.WIND_SPEED, MEASUREMENT, source=f"{BOTTOM}.wind.mps", entity_registry_enabled_default=False),
+        _describe("condition_text_bottom", "mdi:weather-snowy", source=f"{BOTTOM}.condition_description", entity_registry_enabled_default=False),
+        _describe("snow_depth_bottom", "mdi:ruler", UnitOfLength.CENTIMETERS, state_class=MEASUREMENT, source=f"{BOTTOM}.snow.depth_slope", entity_registry_enabled_default=False),
+        _describe("new_snow_bottom", "mdi:snowflake", UnitOfLength.CENTIMETERS, state_class=MEASUREMENT, source=f"{BOTTOM}.snow.today", entity_registry_enabled_default=False),
+        # Trends from the rolling history
+        _describe("snowfall_24h", "mdi:weather-snowy-heavy", UnitOfLength.CENTIMETERS, state_class=MEASUREMENT, name="Snowfall 24h"),
+        _describe("snowfall_72h", "mdi:weather-snowy-heavy", UnitOfLength.CENTIMETERS, state_class=MEASUREMENT, name="Snowfall 72h"),
+        _describe("snow_depth_change_week", "mdi:delta", UnitOfLength.CENTIMETERS, state_class=MEASUREMENT),
+        _describe("temperature_trend", "mdi:thermometer-chevron-up", f"{UnitOfTemperature.CELSIUS}/h", state_class=MEASUREMENT),
+        # Lift Status
+        _describe("lifts_total", "mdi:ski", "lifts", state_class=MEASUREMENT, source="lifts.count", transform=_count, default=0),
+        _describe("lifts_open", "mdi:ski", "lifts", state_class=MEASUREMENT, source="lifts.open", transform=_count, default=0),
+        _describe("lifts_percentage", "mdi:ski", PERCENTAGE, state_class=MEASUREMENT, compute=_percentage("lifts_open", "lifts_total")),
+        _describe("lifts_status_text", "mdi:ski", compute=_status_text("lifts")),
+        # Slope Status
+        _describe("slopes_total", "mdi:ski", "slopes", state_class=MEASUREMENT, source="slopes.count", transform=_count, default=0),
+        _describe("slopes_open", "mdi:ski", "slopes", state_class=MEASUREMENT, source="slopes.open", transform=_count, default=0),
+        _describe("slopes_percentage", "mdi:ski", PERCENTAGE, state_class=MEASUREMENT, compute=_percentage("slopes_open", "slopes_total")),
+        _describe("slopes_status_text", "mdi:ski", compute=_status_text("slopes")),
+        # Open slopes by difficulty, counted with the per-slope detail
+        *(
+            _describe(f"slopes_open_{difficulty}", "mdi:slope-downhill", "slopes", state_class=MEASUREMENT, name=f"{difficulty.title()} Slopes Open")
+            for difficulty in SLOPE_DIFFICULTIES
+        ),
+        # Resort Info
+        _describe("resort_status", "mdi:information", source="resort_status", compute=_resort_status),
+        _describe("resort_opening_date", "mdi:calendar-month", source="resort_opening_date", default=""),
+        _describe("resort_closing_date", "mdi:calendar-month", source="resort_closing_date", default=""),
+        _describe("last_updated", "mdi:clock", source="last_updated", default=""),
+        _describe("daily_report", "mdi:note-text", source=f"{REPORT}.condition_description"),
+        _describe("resort_image", "mdi:image", source="images.image_full"),
+        _describe("resort_open", "mdi:information", source="resort_open"),
+        _describe("resort_open_override", "mdi:information", source="resort_open_override"),
+        # Opening Hours
+        _describe("opening_hours", "mdi:information"),
+        _describe("next_event", "mdi:clock-outline"),
+        _describe("next_event_time", "mdi:clock-outline", device_class=SensorDeviceClass.TIMESTAMP),
+        _describe("is_open", "mdi:door-open"),
+        # Blog Post
+        _describe("blog_post_title", "mdi:post"),
+        # Across all resorts
+        _describe("top_new_snow", "mdi:snowflake", name="Most New Snow"),
+        _describe("top_snow_depth", "mdi:ruler", name="Deepest Snow"),
+        _describe("top_lifts_percentage", "mdi:ski", name="Most Lifts Open"),
+        _describe("top_slopes_percentage", "mdi:ski", name="Most Slopes Open"),
+        _describe("resorts_open", "mdi:door-open", "resorts", state_class=MEASUREMENT),
+        # Diagnostics
+        _diagnostic("fetch_latency", "mdi:timer-outline", UnitOfTime.MILLISECONDS, SensorDeviceClass.DURATION, MEASUREMENT),
+        _diagnostic("payload_size", "mdi:download", UnitOfInformation.BYTES, SensorDeviceClass.DATA_SIZE, MEASUREMENT),
+        _diagnostic("decode_time", "mdi:code-json", UnitOfTime.MILLISECONDS, SensorDeviceClass.DURATION, MEASUREMENT),
+        _diagnostic("build_time", "mdi:hammer-wrench", UnitOfTime.MILLISECONDS, SensorDeviceClass.DURATION, MEASUREMENT),
+        _diagnostic("skipped_updates", "mdi:debug-step-over", "updates", state_class=TOTAL_INCREASING),
+        _diagnostic("errors", "mdi:alert-circle-outline", "errors", state_class=TOTAL_INCREASING),
+        _diagnostic("last_success", "mdi:clock-check-outline", device_class=SensorDeviceClass.TIMESTAMP),
+    )
+}
+
+# Shared by all lift sensors; each lift entity sets its own name
+LIFT_DESCRIPTION = FnuggSensorDescription(key="lift_status", icon="mdi:ski")
+# Shared by all slope sensors, in the same way
+SLOPE_DESCRIPTION = FnuggSensorDescription(key="slope_status", icon="mdi:slope-downhill")
+
+# Sensors built from the resort's metrics
+METRIC_SENSORS = (
+    "fetch_latency",
+    "payload_size",
+    "decode_time",
+    "build_time",
+    "skipped_updates",
+    "errors",
+    "last_success",
+)
+
+
+def sensor_description(sensor_id: str) -> FnuggSensorDescription:
+    """Return the description of a sensor id."""
+    if sensor_id.startswith(LIFT_PREFIX):
+        return LIFT_DESCRIPTION
+    if sensor_id.startswith(SLOPE_PREFIX):
+        return SLOPE_DESCRIPTION
+    return SENSOR_DESCRIPTIONS[sensor_id]
@@ -0,0 +1,123 @@
+"""Device triggers for Fnugg resorts, backed by the integration's bus events."""
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components.device_automation import DEVICE_TRIGGER_BASE_SCHEMA
+from homeassistant.components.homeassistant.triggers import event as event_trigger
+from homeassistant.const import CONF_DEVICE_ID, CONF_DOMAIN, CONF_PLATFORM, CONF_TYPE
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.trigger import TriggerActionType, TriggerInfo
+from homeassistant.helpers.typing import ConfigType
+
+from .const import (
+    DOMAIN,
+    EVENT_LIFT_STATUS_CHANGED,
+    EVENT_NEW_BLOG_POST,
+    EVENT_NEW_SNOW,
+    EVENT_RESORT_CLOSED,
+    EVENT_RESORT_OPENED,
+    LIFT_STATUS,
+    NEW_SNOW_THRESHOLDS,
+)
+from .descriptions import LIFT_PREFIX
+
+CONF_LIFT_ID = "lift_id"
+CONF_THRESHOLD = "threshold"
+CONF_TO = "to"
+
+TRIGGER_EVENTS = {
+    "lift_status_changed": EVENT_LIFT_STATUS_CHANGED,
+    "resort_opened": EVENT_RESORT_OPENED,
+    "resort_closed": EVENT_RESORT_CLOSED,
+    "new_snow": EVENT_NEW_SNOW,
+    "new_blog_post": EVENT_NEW_BLOG_POST,
+}
+
+TRIGGER_SCHEMA = DEVICE_TRIGGER_BASE_SCHEMA.extend(
+    {
+        vol.Required(CONF_TYPE): vol.In(TRIGGER_EVENTS),
+        vol.Optional(CONF_LIFT_ID): str,
+        vol.Optional(CONF_TO): str,
+        vol.Optional(CONF_THRESHOLD): vol.Coerce(int),
+    }
+)
+
+
+async def async_get_triggers(
+    hass: HomeAssistant, device_id: str
+) -> list[dict[str, Any]]:
+    """List the triggers of a resort device."""
+    return [
+        {
+            CONF_PLATFORM: "device",
+            CONF_DOMAIN: DOMAIN,
+            CONF_DEVICE_ID: device_id,
+            CONF_TYPE: trigger_type,
+        }
+        for trigger_type in TRIGGER_EVENTS
+    ]
+
+
+async def async_get_trigger_capabilities(
+    hass: HomeAssistant, config: ConfigType
+) -> dict[str, vol.Schema]:
+    """Return the extra fields of a trigger."""
+    if config[CONF_TYPE] == "new_snow":
+        return {
+            "extra_fields": vol.Schema(
+                {vol.Required(CONF_THRESHOLD): vol.In(NEW_SNOW_THRESHOLDS)}
+            )
+        }
+    if config[CONF_TYPE] == "lift_status_changed":
+        lifts = {
+            sensor_id.removeprefix(LIFT_PREFIX): name
+            for sensor_id, name in _lift_names(hass, config[CONF_DEVICE_ID]).items()
+        }
+        return {
+            "extra_fields": vol.Schema(
+                {
+                    vol.Optional(CONF_LIFT_ID): vol.In(lifts),
+                    vol.Optional(CONF_TO): vol.In(
+                        [status for key, status in LIFT_STATUS.items() if key is not None]
+                    ),
+                }
+            )
+        }
+    return {}
+
+
+async def async_attach_trigger(
+    hass: HomeAssistant,
+    config: ConfigType,
+    action: TriggerActionType,
+    trigger_info: TriggerInfo,
+) -> CALLBACK_TYPE:
+    """Listen for the event of a trigger on its device."""
+    event_data = {CONF_DEVICE_ID: config[CONF_DEVICE_ID]}
+    for key in (CONF_LIFT_ID, CONF_TO, CONF_THRESHOLD):
+        if key in config:
+            event_data[key] = config[key]
+    event_config = event_trigger.TRIGGER_SCHEMA(
+        {
+            event_trigger.CONF_PLATFORM: "event",
+            event_trigger.CONF_EVENT_TYPE: TRIGGER_EVENTS[config[CONF_TYPE]],
+            event_trigger.CONF_EVENT_DATA: event_data,
+        }
+    )
+    return await event_trigger.async_attach_trigger(
+        hass, event_config, action, trigger_info, platform_type="device"
+    )
+
+
+def _lift_names(hass: HomeAssistant, device_id: str) -> dict[str, str]:
+    """Return the lift names of the resort behind a device."""
+    device = dr.async_get(hass).async_get(device_id)
+    for entry_id in device.config_entries if device else ():
+        coordinator = hass.data.get(DOMAIN, {}).get(entry_id)
+        if coordinator is not None:
+            return coordinator.fnugg_data.lift_names
+    return {}
@@ -0,0 +1,50 @@
+"""Diagnostics support for Fnugg."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .api import async_get_client
+from .const import DATA_BLOG, DATA_IMAGES, DOMAIN
+from .scheduler import async_get_scheduler
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    fnugg_data = coordinator.fnugg_data
+    client = async_get_client(hass)
+    images = hass.data[DOMAIN].get(DATA_IMAGES)
+    blog = hass.data[DOMAIN].get(DATA_BLOG)
+
+    return {
+        "entry": {
+            "data": dict(entry.data),
+            "options": dict(entry.options),
+        },
+        "last_update_success": coordinator.last_update_success,
+        "fingerprint": fnugg_data.fingerprint,
+        "metrics": fnugg_data.metrics.as_dict(),
+        "api": {
+            "circuit_open": client.circuit_open,
+            "consecutive_failures": client.consecutive_failures,
+            "metrics": client.metrics.as_dict(),
+        },
+        "scheduler": async_get_scheduler(hass).as_dict(),
+        "image_cache": images.as_dict() if images is not None else None,
+        "state_writes": {
+            "performed": fnugg_data.state_writes,
+            "skipped": fnugg_data.state_writes_skipped,
+        },
+        "history_samples": len(fnugg_data.history),
+        # Bulky data kept out of the state attributes and so out of the recorder
+        "opening_hours": fnugg_data._opening_hours,
+        "blog_images": blog.images.get(str(fnugg_data.resort_id)) if blog is not None else None,
+        "sensors": {
+            sensor_id: sensor[0] for sensor_id, sensor in fnugg_data.sensors.items()
+        },
+    }
@@ -0,0 +1,89 @@
+"""Bus events for transitions between consecutive snapshots of a resort.
+
+Automations can listen for these, or use the matching device triggers,
+instead of template triggers over many sensors. Each event carries the
+resort's device id and only the values of the transition.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+
+from .const import (
+    DOMAIN,
+    EVENT_LIFT_STATUS_CHANGED,
+    EVENT_NEW_BLOG_POST,
+    EVENT_NEW_SNOW,
+    EVENT_RESORT_CLOSED,
+    EVENT_RESORT_OPENED,
+    NEW_SNOW_THRESHOLDS,
+)
+from .descriptions import LIFT_PREFIX
+
+
+def resort_events(
+    previous: dict[str, tuple], current: dict[str, tuple], lift_names: dict[str, str]
+) -> list[tuple[str, dict[str, Any]]]:
+    """Return the events for the changes between two sets of resort sensors."""
+    events = []
+    for sensor_id, sensor in current.items():
+        if not sensor_id.startswith(LIFT_PREFIX) or sensor_id not in previous:
+            continue
+        old_status, new_status = previous[sensor_id][0], sensor[0]
+        if old_status != new_status:
+            events.append((EVENT_LIFT_STATUS_CHANGED, {
+                "lift_id": sensor_id.removeprefix(LIFT_PREFIX),
+                "lift": lift_names.get(sensor_id),
+                "from": old_status,
+                "to": new_status,
+            }))
+
+    was_open = _value(previous, "resort_open")
+    is_open = _value(current, "resort_open")
+    if was_open is not None and is_open is not None and bool(was_open) != bool(is_open):
+        events.append((EVENT_RESORT_OPENED if is_open else EVENT_RESORT_CLOSED, {}))
+
+    old_snow = _value(previous, "new_snow") or 0
+    new_snow = _value(current, "new_snow") or 0
+    # new_snow is today's snowfall, so a drop starts the count again
+    if new_snow < old_snow:
+        old_snow = 0
+    for threshold in NEW_SNOW_THRESHOLDS:
+        if old_snow < threshold <= new_snow:
+            events.append((EVENT_NEW_SNOW, {"threshold": threshold, "new_snow": new_snow}))
+    return events
+
+
+def blog_post_changed(previous: tuple | None, current: tuple | None) -> bool:
+    """Return True if ``current`` is a newer post than ``previous``."""
+    if not previous or not current or current[0] is None:
+        return False
+    return (current[0], (current[1] or {}).get("date")) != (
+        previous[0], (previous[1] or {}).get("date")
+    )
+
+
+def _value(sensors: dict[str, tuple], sensor_id: str):
+    sensor = sensors.get(sensor_id)
+    return sensor[0] if sensor is not None else None
+
+
+@callback
+def async_fire_resort_events(
+    hass: HomeAssistant, resort_id: str, events: list[tuple[str, dict[str, Any]]]
+) -> None:
+    """Fire events for a resort, tagged with its device."""
+    if not events:
+        return
+    device = dr.async_get(hass).async_get_device(identifiers={(DOMAIN, str(resort_id))})
+    base = {"device_id": device.id if device else None, "resort_id": str(resort_id)}
+    for event_type, data in events:
+        hass.bus.async_fire(event_type, {**base, **data})
+
+
+def blog_event(post: tuple) -> tuple[str, dict[str, Any]]:
+    """Return the new blog post event for a blog sensor tuple."""
+    attrs = post[1] or {}
+    return EVENT_NEW_BLOG_POST, {"title": post[0], "date": attrs.get("date")}
@@ -0,0 +1,92 @@
+"""Compile the sensor table into a single extraction function.
+
+The source paths of the resort sensors are merged into a trie, which is
+flattened into lists of lookups read by one plain function. A payload is
+walked once, and each shared prefix such as ``conditions.combined.top`` is
+looked up only once, no matter how many sensors read below it.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from .descriptions import SENSOR_DESCRIPTIONS, FnuggSensorDescription
+
+_EMPTY: dict[str, Any] = {}
+
+
+class _Node:
+    """Keys read at one level of the document."""
+
+    __slots__ = ("children", "leaves")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _Node] = {}
+        self.leaves: dict[str, list[FnuggSensorDescription]] = {}
+
+
+def compile_extractor(
+    descriptions: Iterable[FnuggSensorDescription],
+) -> Callable[[dict[str, Any]], dict[str, Any]]:
+    """Return a function extracting the described values from a ``_source``."""
+    root = _Node()
+    defaults: dict[str, Any] = {}
+    computed = []
+    for description in descriptions:
+        if description.source is None and description.compute is None:
+            continue
+        defaults[description.key] = description.default
+        if description.compute is not None:
+            computed.append(description)
+        if description.source is not None:
+            node = root
+            *parents, leaf = description.source.split(".")
+            for key in parents:
+                node = node.children.setdefault(key, _Node())
+            node.leaves.setdefault(leaf, []).append(description)
+
+    # The trie as flat lists: lookups of the nested objects, each in an
+    # earlier one, then the values read from those objects
+    branches: list[tuple[int, str]] = []
+    plain: list[tuple[int, str, str]] = []
+    transformed: list[tuple[int, str, str, Callable[[Any], Any]]] = []
+
+    def flatten(node: _Node, index: int) -> None:
+        for key, described in node.leaves.items():
+            for description in described:
+                if description.transform is None:
+                    plain.append((index, key, description.key))
+                else:
+                    transformed.append((index, key, description.key, description.transform))
+        for key, child in node.children.items():
+            branches.append((index, key))
+            flatten(child, len(branches))
+
+    flatten(root, 0)
+    computed_steps = [(description.key, description.compute) for description in computed]
+
+    def extract(source: dict[str, Any]) -> dict[str, Any]:
+        # A missing or malformed object reads as empty
+        objects = [source if type(source) is dict else _EMPTY]
+        append = objects.append
+        for index, key in branches:
+            value = objects[index].get(key)
+            append(value if type(value) is dict else _EMPTY)
+        values = dict(defaults)
+        for index, key, sensor_key in plain:
+            value = objects[index].get(key)
+            if value is not None:
+                values[sensor_key] = value
+        for index, key, sensor_key, transform in transformed:
+            value = objects[index].get(key)
+            if value is not None:
+                values[sensor_key] = transform(value)
+        for sensor_key, compute in computed_steps:
+            values[sensor_key] = compute(values)
+        return values
+
+    return extract
+
+
+# Values of all resort sensors from a resort ``_source``, in table order
+extract_resort = compile_extractor(SENSOR_DESCRIPTIONS.values())
@@ -0,0 +1,215 @@
+"""Rolling per-resort history of snow and weather values.
+
+Samples live in fixed-size typed arrays with one shared timestamp column, so
+a week of history costs a few kilobytes per resort. The snowfall sums and
+the week's depth baseline move with each new sample instead of being
+recomputed over the whole history.
+"""
+from __future__ import annotations
+
+import base64
+import math
+import sys
+from array import array
+from datetime import timedelta
+from typing import Any
+
+from .const import (
+    HISTORY_CAPACITY,
+    HISTORY_SAMPLE_INTERVAL,
+    TEMPERATURE_TREND_WINDOW,
+)
+
+# Values recorded per sample, named after the resort sensors they come from
+HISTORY_FIELDS = ("snow_depth", "new_snow", "temp", "wind_speed")
+
+# Sliding windows over the samples, by the sensor they feed
+WINDOWS = {
+    "snowfall_24h": timedelta(hours=24),
+    "snowfall_72h": timedelta(hours=72),
+    "snow_depth_change_week": timedelta(days=7),
+}
+
+NAN = math.nan
+
+
+def _as_float(value) -> float:
+    """Return a sensor value as a float, NaN when missing."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return NAN
+
+
+class _Window:
+    """First sample and snowfall sum of one sliding window."""
+
+    __slots__ = ("seconds", "start", "snowfall")
+
+    def __init__(self, seconds: float) -> None:
+        self.seconds = seconds
+        self.start = 0
+        self.snowfall = 0.0
+
+
+class ResortHistory:
+    """Ring buffer of resort samples with sliding windows over it."""
+
+    def __init__(
+        self,
+        capacity: int = HISTORY_CAPACITY,
+        interval: timedelta = HISTORY_SAMPLE_INTERVAL,
+    ) -> None:
+        self._capacity = capacity
+        self._interval = interval.total_seconds()
+        self._times = array("d", bytes(8 * capacity))
+        self._columns = {
+            field: array("f", [NAN]) * capacity for field in HISTORY_FIELDS
+        }
+        # Snow fallen since the previous sample, derived from new_snow
+        self._snowfall = array("f", bytes(4 * capacity))
+        # Samples ever added; sample n lives in slot n % capacity
+        self._count = 0
+        self._windows = {
+            key: _Window(window.total_seconds()) for key, window in WINDOWS.items()
+        }
+
+    def __len__(self) -> int:
+        return min(self._count, self._capacity)
+
+    def add(self, timestamp: float, values: dict[str, Any]) -> None:
+        """Record the values of one fetch."""
+        if self._count:
+            newest = self._times[(self._count - 1) % self._capacity]
+            if timestamp < newest:
+                return
+            if timestamp - newest < self._interval:
+                self._store(self._count - 1, timestamp, values, replace=True)
+                self._advance(timestamp)
+                return
+        if self._count >= self._capacity:
+            self._evict(self._count - self._capacity)
+        self._count += 1
+        self._store(self._count - 1, timestamp, values)
+        self._advance(timestamp)
+
+    def _store(
+        self, seq: int, timestamp: float, values: dict[str, Any], replace: bool = False
+    ) -> None:
+        """Write a sample and add its snowfall to the windows."""
+        slot = seq % self._capacity
+        new_snow = _as_float(values.get("new_snow"))
+        snowfall = 0.0
+        if seq > self._count - len(self) and not math.isnan(new_snow):
+            previous = self._columns["new_snow"][(seq - 1) % self._capacity]
+            if not math.isnan(previous):
+                # new_snow is today's snowfall, so a drop means a new day
+                snowfall = new_snow - previous if new_snow >= previous else new_snow
+        delta = snowfall - self._snowfall[slot] if replace else snowfall
+        self._times[slot] = timestamp
+        for field, column in self._columns.items():
+            column[slot] = _as_float(values.get(field))
+        self._snowfall[slot] = snowfall
+        for window in self._windows.values():
+            window.snowfall += delta
+
+    def _evict(self, seq: int) -> None:
+        """Drop the oldest sample from windows that still start at it."""
+        for window in self._windows.values():
+            if window.start <= seq:
+                window.snowfall -= self._snowfall[seq % self._capacity]
+                window.start = seq + 1
+
+    def _advance(self, now: float) -> None:
+        """Move the window starts past samples that fell out of them."""
+        for window in self._windows.values():
+            cutoff = now - window.seconds
+            while window.start < self._count - 1:
+                slot = window.start % self._capacity
+                if self._times[slot] >= cutoff:
+                    break
+                window.snowfall -= self._snowfall[slot]
+                window.start += 1
+
+    def _value(self, field: str, seq: int) -> float:
+        return self._columns[field][seq % self._capacity]
+
+    def _depth_change(self) -> float | None:
+        """Return the change in snow depth over the week's window."""
+        newest = self._value("snow_depth", self._count - 1)
+        if math.isnan(newest):
+            return None
+        for seq in range(self._windows["snow_depth_change_week"].start, self._count - 1):
+            if not math.isnan(baseline := self._value("snow_depth", seq)):
+                return round(newest - baseline, 1)
+        return None
+
+    def _temperature_trend(self) -> float | None:
+        """Return the least-squares temperature slope in degrees per hour."""
+        newest = self._times[(self._count - 1) % self._capacity]
+        window = TEMPERATURE_TREND_WINDOW.total_seconds()
+        points = []
+        for seq in range(self._count - 1, self._count - len(self) - 1, -1):
+            age = newest - self._times[seq % self._capacity]
+            if age > window:
+                break
+            if not math.isnan(temp := self._value("temp", seq)):
+                points.append((-age / 3600, temp))
+        if len(points) < 2:
+            return None
+        mean_x = sum(x for x, _ in points) / len(points)
+        mean_y = sum(y for _, y in points) / len(points)
+        spread = sum((x - mean_x) ** 2 for x, _ in points)
+        if not spread:
+            return None
+        slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / spread
+        return round(slope, 2)
+
+    def build_sensors(self) -> dict[str, tuple]:
+        """Return the derived sensors as of the newest sample."""
+        if not self._count:
+            return {}
+        return {
+            "snowfall_24h": (round(max(self._windows["snowfall_24h"].snowfall, 0), 1), None),
+            "snowfall_72h": (round(max(self._windows["snowfall_72h"].snowfall, 0), 1), None),
+            "snow_depth_change_week": (self._depth_change(), None),
+            "temperature_trend": (self._temperature_trend(), None),
+        }
+
+    def as_dict(self) -> dict[str, str]:
+        """Return the samples oldest first as base64 little-endian arrays."""
+        order = [seq % self._capacity for seq in range(self._count - len(self), self._count)]
+        columns = {"times": self._times, "snowfall": self._snowfall, **self._columns}
+        data = {}
+        for name, column in columns.items():
+            ordered = array(column.typecode, (column[slot] for slot in order))
+            if sys.byteorder == "big":
+                ordered.byteswap()
+            data[name] = base64.b64encode(ordered.tobytes()).decode()
+        return data
+
+    def load(self, data: dict[str, str] | None) -> None:
+        """Restore samples saved by as_dict."""
+        if not data:
+            return
+        current = {"times": self._times, "snowfall": self._snowfall, **self._columns}
+        columns = {}
+        for name, column in current.items():
+            loaded = array(column.typecode)
+            loaded.frombytes(base64.b64decode(data[name]))
+            if sys.byteorder == "big":
+                loaded.byteswap()
+            columns[name] = loaded[-self._capacity:]
+        count = len(columns["times"])
+        if any(len(column) != count for column in columns.values()):
+            raise ValueError("history columns differ in length")
+        for name, column in columns.items():
+            current[name][:count] = column
+        self._count = count
+        if not count:
+            return
+        total = sum(self._snowfall[:count])
+        for window in self._windows.values():
+            window.start = 0
+            window.snowfall = total
+        self._advance(self._times[count - 1])
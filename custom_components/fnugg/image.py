@@ -0,0 +1,129 @@
+"""Image entities for the resort and blog pictures, served from the local cache."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from homeassistant.components.image import ImageEntity, ImageEntityDescription
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
+
+from .blog import BLOG_IMAGE_KEYS
+from .const import DATA_BLOG, DOMAIN
+from .image_cache import async_get_image_cache
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class FnuggImageDescription(ImageEntityDescription):
+    """Metadata shared by all Fnugg images of one kind."""
+
+    # Serve the cached thumbnail instead of the full-size image
+    thumbnail: bool = False
+
+
+RESORT_IMAGES = (
+    FnuggImageDescription(key="resort_image", name="Resort Image", icon="mdi:image"),
+    FnuggImageDescription(
+        key="resort_image_thumbnail",
+        name="Resort Image Thumbnail",
+        icon="mdi:image",
+        thumbnail=True,
+    ),
+)
+BLOG_IMAGES = (
+    FnuggImageDescription(key="blog_post_image", name="Blog Post Image", icon="mdi:post"),
+    FnuggImageDescription(
+        key="blog_post_image_thumbnail",
+        name="Blog Post Image Thumbnail",
+        icon="mdi:post",
+        thumbnail=True,
+    ),
+)
+
+
+async def async_setup_entry(hass, config_entry, async_add_entities):
+    """Set up Fnugg images from a config entry."""
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    blog = hass.data[DOMAIN][DATA_BLOG]
+    cache = async_get_image_cache(hass)
+
+    entities = [
+        FnuggResortImage(hass, coordinator, coordinator.fnugg_data, description, cache)
+        for description in RESORT_IMAGES
+    ]
+    entities += [
+        FnuggBlogImage(hass, blog, coordinator.fnugg_data, description, cache)
+        for description in BLOG_IMAGES
+    ]
+    async_add_entities(entities)
+
+
+class FnuggResortImage(CoordinatorEntity, ImageEntity):
+    """Resort picture, downloaded once and served from disk."""
+
+    def __init__(self, hass, coordinator, fnugg_data, description, cache):
+        """Initialize the image."""
+        CoordinatorEntity.__init__(self, coordinator)
+        ImageEntity.__init__(self, hass)
+        self.entity_description = description
+        self._fnugg_data = fnugg_data
+        self._cache = cache
+        self._resort_id = fnugg_data._resort_id
+        self._resort_name = fnugg_data._resort_name
+        self._attr_unique_id = f"fnugg_{self._resort_id}_{description.key}"
+        self._url = self._lookup_url()
+        if self._url:
+            self._attr_image_last_updated = dt_util.utcnow()
+
+    @property
+    def device_info(self):
+        """Return device information."""
+        return {
+            "identifiers": {(DOMAIN, self._resort_id)},
+            "name": self._resort_name,
+            "manufacturer": "Fnugg",
+            "model": "Ski Resort",
+        }
+
+    @property
+    def available(self):
+        """Stay available on the last good data until it is too old."""
+        return not self.coordinator.data_expired
+
+    def _lookup_url(self):
+        """Return the URL of the picture in the current data."""
+        return self._fnugg_data.sensors.get("resort_image", (None,))[0]
+
+    async def async_image(self) -> bytes | None:
+        """Return the cached image or thumbnail."""
+        if not self._url:
+            return None
+        image = await self._cache.async_get(self._url, self.entity_description.thumbnail)
+        if image is None:
+            return None
+        content, self._attr_content_type = image
+        return content
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when the picture changed."""
+        url = self._lookup_url()
+        if url != self._url:
+            self._url = url
+            self._attr_image_last_updated = dt_util.utcnow() if url else None
+            self.async_write_ha_state()
+
+
+class FnuggBlogImage(FnuggResortImage):
+    """Picture of the latest blog post, updated by the shared blog coordinator."""
+
+    @property
+    def available(self):
+        """Keep serving the cached post when a blog refresh fails."""
+        return str(self._resort_id) in (self.coordinator.data or {})
+
+    def _lookup_url(self):
+        """Return the largest picture of the latest post."""
+        post = (self.coordinator.data or {}).get(str(self._resort_id))
+        attrs = (post[1] if post else None) or {}
+        return next((attrs[key] for key in BLOG_IMAGE_KEYS if attrs.get(key)), None)
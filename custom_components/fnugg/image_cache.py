@@ -0,0 +1,277 @@
+"""On-disk cache of resort and blog images for the image entities.
+
+Each image is downloaded once and a JPEG thumbnail is made next to it, so
+dashboards are served local files instead of the full-size CDN originals.
+Cached images are revalidated with ``If-None-Match``/``If-Modified-Since``
+after ``IMAGE_REVALIDATE_INTERVAL``, and the least recently used images are
+removed once the cache grows past ``IMAGE_CACHE_MAX_BYTES``.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+import hashlib
+import io
+import logging
+import os
+import time
+from typing import Any
+
+import aiohttp
+from aiohttp import hdrs
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DATA_IMAGES,
+    DOMAIN,
+    IMAGE_CACHE_DIR,
+    IMAGE_CACHE_MAX_BYTES,
+    IMAGE_CACHE_STORAGE_KEY,
+    IMAGE_REVALIDATE_INTERVAL,
+    IMAGE_THUMBNAIL_SIZE,
+    REQUEST_TIMEOUT,
+    SNAPSHOT_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+THUMBNAIL_SUFFIX = ".thumb.jpg"
+THUMBNAIL_CONTENT_TYPE = "image/jpeg"
+
+
+def _write_image(directory: str, name: str, content: bytes) -> int:
+    """Write an image and its thumbnail, returning the thumbnail size or 0."""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, name)
+    _write_atomic(path, content)
+    data = _make_thumbnail(name, content)
+    if data is None:
+        _remove_files(directory, [name + THUMBNAIL_SUFFIX])
+        return 0
+    _write_atomic(path + THUMBNAIL_SUFFIX, data)
+    return len(data)
+
+
+def _make_thumbnail(name: str, content: bytes) -> bytes | None:
+    """Return a JPEG thumbnail of an image, or None if it cannot be made."""
+    try:
+        # Only needed when a new image arrives, so not imported at startup
+        from PIL import Image  # pylint: disable=import-outside-toplevel
+    except ImportError as err:
+        _LOGGER.debug("No thumbnail for %s: %s", name, err)
+        return None
+    try:
+        with Image.open(io.BytesIO(content)) as image:
+            image.thumbnail(IMAGE_THUMBNAIL_SIZE)
+            thumbnail = io.BytesIO()
+            image.convert("RGB").save(thumbnail, "JPEG", quality=80, optimize=True)
+    except (Image.DecompressionBombError, OSError, ValueError) as err:
+        # Pillow refuses images with more pixels than it considers safe
+        _LOGGER.debug("No thumbnail for %s: %s", name, err)
+        return None
+    return thumbnail.getvalue()
+
+
+def _write_atomic(path: str, content: bytes) -> None:
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(content)
+    os.replace(temp_path, path)
+
+
+def _read_file(path: str) -> bytes | None:
+    try:
+        with open(path, "rb") as file:
+            return file.read()
+    except FileNotFoundError:
+        return None
+
+
+def _remove_files(directory: str, names: list[str]) -> None:
+    for name in names:
+        try:
+            os.remove(os.path.join(directory, name))
+        except FileNotFoundError:
+            pass
+
+
+class FnuggImageCache:
+    """Images kept on disk by URL, least recently used first."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        directory: str,
+        max_bytes: int = IMAGE_CACHE_MAX_BYTES,
+    ) -> None:
+        """Initialize the cache."""
+        self._hass = hass
+        self._session = async_get_clientsession(hass)
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._store = Store(hass, STORAGE_VERSION, IMAGE_CACHE_STORAGE_KEY)
+        self._entries: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._bytes = 0
+        self._load_task: asyncio.Task | None = None
+        self._pending: dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.downloads = 0
+        self.revalidated = 0
+        self.evicted = 0
+
+    @property
+    def size(self) -> int:
+        """Return the bytes used by the cached images and thumbnails."""
+        return self._bytes
+
+    async def async_get(self, url: str, thumbnail: bool = False) -> tuple[bytes, str] | None:
+        """Return the content and content type of an image, downloading it if needed."""
+        if self._load_task is None:
+            self._load_task = self._hass.async_create_task(self._async_load())
+        await self._load_task
+
+        entry = self._entries.get(url)
+        age = time.time() - entry["checked"] if entry else None
+        if age is None or age > IMAGE_REVALIDATE_INTERVAL.total_seconds():
+            if (task := self._pending.get(url)) is None:
+                task = self._hass.async_create_task(self._async_fetch(url, entry))
+                self._pending[url] = task
+                task.add_done_callback(lambda _: self._pending.pop(url, None))
+            if (entry := await asyncio.shield(task)) is None:
+                return None
+        else:
+            self.hits += 1
+        if url in self._entries:
+            self._entries.move_to_end(url)
+            self._async_schedule_save()
+
+        name = entry["file"]
+        content_type = entry["content_type"]
+        if thumbnail and entry["thumbnail_size"]:
+            name += THUMBNAIL_SUFFIX
+            content_type = THUMBNAIL_CONTENT_TYPE
+        content = await self._hass.async_add_executor_job(
+            _read_file, os.path.join(self._directory, name)
+        )
+        if content is None:
+            _LOGGER.debug("Cached image %s is missing, it is fetched on the next request", url)
+            self._async_drop(url)
+            return None
+        return content, content_type
+
+    async def _async_load(self) -> None:
+        """Load the index of cached images."""
+        stored = await self._store.async_load() or {}
+        for url, entry in stored.get("entries", []):
+            self._entries[url] = entry
+            self._bytes += entry["size"] + entry["thumbnail_size"]
+
+    async def _async_fetch(self, url: str, entry: dict[str, Any] | None) -> dict[str, Any] | None:
+        """Download an image, or revalidate the cached copy."""
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers[hdrs.IF_NONE_MATCH] = entry["etag"]
+            if entry.get("last_modified"):
+                headers[hdrs.IF_MODIFIED_SINCE] = entry["last_modified"]
+        try:
+            async with self._session.get(
+                url,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+            ) as resp:
+                if resp.status == 304 and entry is not None:
+                    self.revalidated += 1
+                    entry["checked"] = time.time()
+                    return entry
+                resp.raise_for_status()
+                content_type = resp.content_type
+                if not content_type.startswith("image/"):
+                    raise ValueError(f"not an image: {content_type}")
+                content = await resp.read()
+                etag = resp.headers.get(hdrs.ETAG)
+                last_modified = resp.headers.get(hdrs.LAST_MODIFIED)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as err:
+            _LOGGER.debug("Could not fetch image %s: %s", url, err)
+            if entry is not None:
+                # Serve the cached copy until the next revalidation
+                entry["checked"] = time.time()
+            return entry
+
+        self.downloads += 1
+        name = hashlib.sha1(url.encode()).hexdigest()
+        thumbnail_size = await self._hass.async_add_executor_job(
+            _write_image, self._directory, name, content
+        )
+        if (old := self._entries.pop(url, None)) is not None:
+            self._bytes -= old["size"] + old["thumbnail_size"]
+        entry = {
+            "file": name,
+            "content_type": content_type,
+            "etag": etag,
+            "last_modified": last_modified,
+            "size": len(content),
+            "thumbnail_size": thumbnail_size,
+            "checked": time.time(),
+        }
+        self._entries[url] = entry
+        self._bytes += entry["size"] + thumbnail_size
+        await self._async_evict(keep=url)
+        self._async_schedule_save()
+        return entry
+
+    async def _async_evict(self, keep: str) -> None:
+        """Remove least recently used images until the cache fits."""
+        names = []
+        while self._bytes > self._max_bytes and len(self._entries) > 1:
+            url, entry = next(iter(self._entries.items()))
+            if url == keep:
+                self._entries.move_to_end(url)
+                continue
+            del self._entries[url]
+            self._bytes -= entry["size"] + entry["thumbnail_size"]
+            names += (entry["file"], entry["file"] + THUMBNAIL_SUFFIX)
+            self.evicted += 1
+        if names:
+            _LOGGER.debug("Removing %d images from the image cache", len(names) // 2)
+            await self._hass.async_add_executor_job(_remove_files, self._directory, names)
+
+    @callback
+    def _async_drop(self, url: str) -> None:
+        """Forget an image whose file is gone."""
+        if (entry := self._entries.pop(url, None)) is not None:
+            self._bytes -= entry["size"] + entry["thumbnail_size"]
+            self._async_schedule_save()
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"entries": list(self._entries.items())}
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return cache statistics for diagnostics."""
+        return {
+            "images": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self._max_bytes,
+            "hits": self.hits,
+            "downloads": self.downloads,
+            "revalidated": self.revalidated,
+            "evicted": self.evicted,
+        }
+
+
+@callback
+def async_get_image_cache(hass: HomeAssistant) -> FnuggImageCache:
+    """Return the image cache shared by all entries."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_IMAGES not in domain_data:
+        domain_data[DATA_IMAGES] = FnuggImageCache(hass, hass.config.path(IMAGE_CACHE_DIR))
+    return domain_data[DATA_IMAGES]
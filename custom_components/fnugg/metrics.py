@@ -0,0 +1,116 @@
+"""Hot-path metrics for the Fnugg integration."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import Counter
+from typing import Any
+
+# Upper bounds (ms) of the fetch latency histogram buckets
+LATENCY_BUCKETS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Attributes of the fetch latency sensor that change on every fetch
+LATENCY_ATTRIBUTES = frozenset(
+    {
+        "count",
+        "mean_ms",
+        *(f"le_{bound}ms" for bound in LATENCY_BUCKETS),
+        f"gt_{LATENCY_BUCKETS[-1]}ms",
+    }
+)
+
+# Error kind of requests refused while the circuit is open
+THROTTLED = "throttled"
+
+
+class LatencyHistogram:
+    """Fetch latencies counted in fixed buckets."""
+
+    __slots__ = ("counts", "count", "total", "last")
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.last = None
+
+    def observe(self, seconds: float) -> None:
+        """Count one fetch."""
+        ms = seconds * 1000
+        self.counts[bisect_left(LATENCY_BUCKETS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        self.last = ms
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram as plain data."""
+        buckets = {f"le_{bound}ms": count for bound, count in zip(LATENCY_BUCKETS, self.counts)}
+        buckets[f"gt_{LATENCY_BUCKETS[-1]}ms"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "last_ms": _round(self.last),
+            "mean_ms": _round(self.total / self.count) if self.count else None,
+            "buckets": buckets,
+        }
+
+
+class FnuggMetrics:
+    """Timings and counters of one resort, or of all API requests."""
+
+    def __init__(self) -> None:
+        """Initialize empty metrics."""
+        self.fetch_latency: dict[str, LatencyHistogram] = {}
+        self.payload_bytes = None
+        self.payload_bytes_total = 0
+        self.decode_ms = None
+        self.build_ms = None
+        # Fetches whose payload was unchanged, so no sensors were rebuilt
+        self.unchanged = 0
+        self.throttled = 0
+        self.errors: Counter[str] = Counter()
+        self.last_success = None
+
+    @property
+    def error_count(self) -> int:
+        """Return the number of errors of all kinds."""
+        return sum(self.errors.values())
+
+    def observe_fetch(self, endpoint: str, seconds: float) -> None:
+        """Record the latency of a fetch from ``endpoint``."""
+        if endpoint not in self.fetch_latency:
+            self.fetch_latency[endpoint] = LatencyHistogram()
+        self.fetch_latency[endpoint].observe(seconds)
+
+    def observe_payload(self, size: int, decode_seconds: float) -> None:
+        """Record the size and decode time of a response body."""
+        self.payload_bytes = size
+        self.payload_bytes_total += size
+        self.decode_ms = decode_seconds * 1000
+
+    def record_error(self, kind: str) -> None:
+        """Count an error, or a throttled request."""
+        if kind == THROTTLED:
+            self.throttled += 1
+        else:
+            self.errors[kind] += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics as plain data."""
+        return {
+            "fetch_latency": {
+                endpoint: histogram.as_dict()
+                for endpoint, histogram in self.fetch_latency.items()
+            },
+            "payload_bytes": self.payload_bytes,
+            "payload_bytes_total": self.payload_bytes_total,
+            "decode_ms": _round(self.decode_ms),
+            "build_ms": _round(self.build_ms),
+            "unchanged": self.unchanged,
+            "throttled": self.throttled,
+            "errors": dict(self.errors),
+            "last_success": self.last_success.isoformat() if self.last_success else None,
+        }
+
+
+def _round(value):
+    return round(value, 3) if value is not None else None
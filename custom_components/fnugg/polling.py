@@ -0,0 +1,151 @@
+"""Adaptive polling interval for a resort.
+
+The interval is picked from data the integration already parses: the season
+dates, today's opening hours, whether the resort reports itself open and the
+new snow at the top station. After a failed fetch the next one is a retry,
+which backs off from the shortest interval instead.
+"""
+from __future__ import annotations
+
+import datetime
+from datetime import timedelta
+
+# Poll often around opening and on powder days
+FAST_INTERVAL = timedelta(minutes=5)
+# Poll while the lifts are running
+OPEN_INTERVAL = timedelta(minutes=15)
+# Poll overnight and on closed days
+CLOSED_INTERVAL = timedelta(hours=1)
+# Probe once a day between seasons
+OFFSEASON_INTERVAL = timedelta(days=1)
+
+# Retry failed fetches at least this often
+MAX_RETRY_INTERVAL = timedelta(hours=1)
+
+# How long before opening the fast interval starts
+PREOPEN_LEAD = timedelta(hours=1)
+# How long before the season opens off-season probing stops
+PRESEASON_LEAD = timedelta(days=7)
+# New snow (cm) that counts as a powder day
+FRESH_SNOW_CM = 5
+
+
+def parse_season_date(value):
+    """Return an aware datetime for a season date string, or None."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed
+
+
+def compute_update_interval(
+    now,
+    schedule,
+    season_start,
+    season_end,
+    resort_open,
+    new_snow,
+    min_interval,
+    max_interval,
+    failures=0,
+    expires_in=None,
+):
+    """Return the time until the next fetch, within [min_interval, max_interval]."""
+    return compute_update_schedule(
+        now,
+        schedule,
+        season_start,
+        season_end,
+        resort_open,
+        new_snow,
+        min_interval,
+        max_interval,
+        failures,
+        expires_in,
+    )[0]
+
+
+def compute_update_schedule(
+    now,
+    schedule,
+    season_start,
+    season_end,
+    resort_open,
+    new_snow,
+    min_interval,
+    max_interval,
+    failures=0,
+    expires_in=None,
+):
+    """Return the time until the next fetch and whether it is a regular poll.
+
+    A fetch that is not a regular poll is a wake-up timed for the run-up to
+    opening or to the season, or a retry after ``failures`` failed fetches in
+    a row, which should not be moved.
+    """
+    interval, periodic = _pick_interval(
+        now, schedule, season_start, season_end, resort_open, new_snow
+    )
+    if interval >= max_interval:
+        interval, periodic = max_interval, True
+    else:
+        interval = max(min_interval, interval)
+    if failures:
+        # Back off, but never past the next regular fetch
+        return compute_retry_interval(failures, min_interval, interval, expires_in), False
+    return interval, periodic
+
+
+def compute_retry_interval(failures, min_interval, max_interval, expires_in=None):
+    """Return the time until retrying after ``failures`` failed fetches in a row.
+
+    The delay starts at ``min_interval`` and doubles with every failure, up to
+    ``max_interval`` or an hour. It is no longer than ``expires_in``, the time
+    left before the last good data becomes too old, while that is still ahead.
+    """
+    retry = min(
+        min_interval * 2 ** min(failures - 1, 30),
+        max(min_interval, min(max_interval, MAX_RETRY_INTERVAL)),
+    )
+    if expires_in is not None and timedelta(0) < expires_in < retry:
+        return expires_in
+    return retry
+
+
+def _pick_interval(now, schedule, season_start, season_end, resort_open, new_snow):
+    """Return the interval and whether it is a regular poll rather than a wake-up."""
+    if season_start is not None and season_end is not None and not resort_open:
+        preseason = season_start - PRESEASON_LEAD
+        if now > season_end:
+            return OFFSEASON_INTERVAL, True
+        if now < preseason:
+            # Probe daily, but wake up in time for the run-up to the season
+            if preseason - now < OFFSEASON_INTERVAL:
+                return preseason - now, False
+            return OFFSEASON_INTERVAL, True
+        if now < season_start:
+            return CLOSED_INTERVAL, True
+
+    if schedule.is_open(now):
+        if new_snow is not None and new_snow >= FRESH_SNOW_CM:
+            return FAST_INTERVAL, True
+        return OPEN_INTERVAL, True
+
+    transition = schedule.next_transition(now)
+    if transition is not None and transition[1]:
+        until_open = transition[0] - now
+        if until_open <= PREOPEN_LEAD:
+            return FAST_INTERVAL, True
+        if until_open - PREOPEN_LEAD < CLOSED_INTERVAL:
+            return until_open - PREOPEN_LEAD, False
+        return CLOSED_INTERVAL, True
+
+    if resort_open:
+        # Open without known opening hours
+        return OPEN_INTERVAL, True
+    return CLOSED_INTERVAL, True
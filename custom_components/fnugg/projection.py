@@ -0,0 +1,100 @@
+"""Field projection for Fnugg API documents.
+
+The sensors only read a handful of paths from a resort document. The API is
+asked for just those paths with ``sourceFields``. The response is decoded
+with ``project_document``, which decodes it with ``json.loads`` and keeps
+only the requested paths. When the server applies the filter there is
+nothing to drop. When it ignores the filter, the unused subtrees
+(description, forecasts, webcams, trail maps, ...) are dropped before the
+document is stored or fingerprinted.
+
+Walking the raw text in Python and only decoding the requested values was
+measured too; the C decoder is faster even when most of the document is
+thrown away.
+"""
+from __future__ import annotations
+
+import json
+from typing import Any
+
+# Paths in the resort ``_source`` the sensors are built from
+SOURCE_FIELDS = (
+    "name",
+    "conditions.combined.top",
+    "conditions.combined.bottom",
+    "conditions.current_report.top",
+    "lifts",
+    "slopes",
+    "opening_hours",
+    "images.image_full",
+    "resort_opening_date",
+    "resort_closing_date",
+    "resort_open",
+    "resort_open_override",
+    "resort_status",
+    "last_updated",
+)
+
+# Paths in a resort ``_source`` the resort catalog is built from
+CATALOG_SOURCE_FIELDS = ("name", "location")
+
+# Paths in a blog post ``_source`` the blog sensor is built from
+BLOG_SOURCE_FIELDS = (
+    "title",
+    "description",
+    "date",
+    "modified",
+    "site",
+    "author.name",
+    "images",
+)
+
+
+def build_tree(paths) -> dict[str, Any]:
+    """Turn dotted paths into a nested dict, with None marking a whole subtree."""
+    tree: dict[str, Any] = {}
+    for path in paths:
+        node = tree
+        *parents, leaf = path.split(".")
+        for key in parents:
+            child = node.get(key, {})
+            if child is None:
+                break
+            node = node.setdefault(key, child)
+        else:
+            node[leaf] = None
+    return tree
+
+
+SOURCE_TREE = build_tree(SOURCE_FIELDS)
+RESORT_TREE = {"_id": None, "_source": SOURCE_TREE}
+SEARCH_TREE = {"hits": {"total": None, "hits": RESORT_TREE}}
+CATALOG_SEARCH_TREE = {
+    "hits": {
+        "total": None,
+        "hits": {"_id": None, "_source": build_tree(CATALOG_SOURCE_FIELDS)},
+    }
+}
+BLOG_SEARCH_TREE = {
+    "hits": {"hits": {"_id": None, "_source": build_tree(BLOG_SOURCE_FIELDS)}}
+}
+
+
+def project_document(text: str | bytes, tree: dict[str, Any]) -> Any:
+    """Decode ``text`` keeping only the keys described by ``tree``.
+
+    Objects are filtered key by key, arrays apply the same tree to every
+    element, and a None leaf keeps the value in full.
+    """
+    return _select(json.loads(text), tree)
+
+
+def _select(value: Any, tree: dict[str, Any] | None) -> Any:
+    """Return ``value`` filtered by ``tree``."""
+    if tree is None:
+        return value
+    if isinstance(value, dict):
+        return {key: _select(item, tree[key]) for key, item in value.items() if key in tree}
+    if isinstance(value, list):
+        return [_select(item, tree) for item in value]
+    return value
@@ -0,0 +1,145 @@
+"""Opening hours compiled once per payload."""
+from __future__ import annotations
+
+from bisect import bisect_right
+import datetime
+
+# Days ahead of today searched for the next opening
+LOOKAHEAD_DAYS = 8
+
+WEEKDAYS = (
+    "monday",
+    "tuesday",
+    "wednesday",
+    "thursday",
+    "friday",
+    "saturday",
+    "sunday",
+)
+
+# Marker for a day the resort is explicitly closed
+CLOSED = "closed"
+
+
+def _parse_time(value):
+    """Return a time for an "HH:MM" string, or None if it cannot be parsed."""
+    try:
+        hour, minute = map(int, value.split(":"))
+        return datetime.time(hour, minute)
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def _compile_day(day):
+    """Compile one opening_hours entry into CLOSED, (from, to, text) or None."""
+    if not day:
+        return None
+    if day.get("closed"):
+        return CLOSED
+    from_str, to_str = day.get("from"), day.get("to")
+    if not from_str or not to_str:
+        return None
+    return (_parse_time(from_str), _parse_time(to_str), f"{from_str} - {to_str}")
+
+
+class OpeningSchedule:
+    """Date-indexed opening hours with precomputed open/close transitions.
+
+    ``exception_days`` are parsed once when the schedule is built instead of
+    for every date that is looked up. Transitions are computed for a window of
+    ``LOOKAHEAD_DAYS`` starting today and rebuilt when the date changes.
+    """
+
+    def __init__(self, opening_hours):
+        """Compile the ``opening_hours`` structure of a resort document."""
+        if not isinstance(opening_hours, dict):
+            opening_hours = {}
+        self._weekly = tuple(_compile_day(opening_hours.get(day)) for day in WEEKDAYS)
+        self._exceptions = {}
+        for exc in opening_hours.get("exception_days") or []:
+            try:
+                exc_date = datetime.datetime.fromisoformat(
+                    exc["date"].replace("Z", "+00:00")
+                ).date()
+            except (KeyError, TypeError, AttributeError, ValueError):
+                continue
+            # The first exception listed for a date wins
+            self._exceptions.setdefault(exc_date, _compile_day(exc) or CLOSED)
+        self._window_start = None
+        self._window_tz = None
+        self._instants = []
+        self._opens = []
+
+    def day(self, check_date):
+        """Return CLOSED, (from, to, text) or None for a date."""
+        if check_date in self._exceptions:
+            return self._exceptions[check_date]
+        return self._weekly[check_date.weekday()]
+
+    def hours_text(self, check_date):
+        """Return the opening hours of a date as text, e.g. "09:00 - 16:00"."""
+        day = self.day(check_date)
+        if day is None:
+            return None
+        if day is CLOSED:
+            return "Closed"
+        return day[2]
+
+    def _transitions(self, now):
+        """Return (instants, opens) for the window containing ``now``."""
+        today = now.date()
+        if self._window_start != today or self._window_tz != now.tzinfo:
+            instants, opens = [], []
+            for days_ahead in range(LOOKAHEAD_DAYS):
+                check_date = today + datetime.timedelta(days=days_ahead)
+                day = self.day(check_date)
+                if day is None or day is CLOSED or day[0] is None or day[1] is None:
+                    continue
+                open_dt = datetime.datetime.combine(check_date, day[0], now.tzinfo)
+                close_dt = datetime.datetime.combine(check_date, day[1], now.tzinfo)
+                instants.append(open_dt)
+                opens.append(True)
+                # A day whose closing time is not after its opening time never opens
+                if close_dt > open_dt:
+                    instants.append(close_dt)
+                    opens.append(False)
+                else:
+                    instants.pop()
+                    opens.pop()
+            self._instants, self._opens = instants, opens
+            self._window_start, self._window_tz = today, now.tzinfo
+        return self._instants, self._opens
+
+    def is_open(self, now):
+        """Return True if the resort is open at ``now``."""
+        instants, opens = self._transitions(now)
+        index = bisect_right(instants, now)
+        return index > 0 and opens[index - 1]
+
+    def next_transition(self, now):
+        """Return (instant, opens) of the next open/close transition, or None."""
+        instants, opens = self._transitions(now)
+        index = bisect_right(instants, now)
+        if index == len(instants):
+            return None
+        return instants[index], opens[index]
+
+    def next_event_text(self, now):
+        """Return human-readable time until the next open/close event."""
+        transition = self.next_transition(now)
+        if transition is None:
+            return None
+        instant, opens = transition
+        label = "Opening" if opens else "Closing"
+
+        total_minutes = int((instant - now).total_seconds() // 60)
+        hours, minutes = divmod(total_minutes, 60)
+
+        if hours > 0 and minutes > 0:
+            return f"{label} in {hours} hours and {minutes} minutes"
+        elif hours > 0:
+            return f"{label} in {hours} hours"
+        elif minutes > 0:
+            return f"{label} in {minutes} minutes"
+        else:
+            return f"{label} now"
@@ -0,0 +1,190 @@
+"""Integration-wide pacing of requests to the Fnugg API.
+
+Every entry, the batcher and the blog coordinator get a phase when they
+register. Their next refresh is moved to the slot of their phase within the
+polling interval, so entries set up at the same moment do not keep polling
+in lockstep. Phases come from the van der Corput sequence (0, 1/2, 1/4,
+3/4, ...), which keeps any number of registrations evenly spread without
+moving the ones already placed.
+
+Each request to the API also takes a token from a bucket that refills at
+``REQUEST_RATE`` per minute, up to ``REQUEST_BURST``, and at most
+``REQUEST_CONCURRENCY`` requests run at once. Waiting requests are served by
+priority, so open resorts go before closed ones and blog posts.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Hashable
+from contextlib import asynccontextmanager
+from datetime import timedelta
+import heapq
+import itertools
+import math
+import time
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    DATA_SCHEDULER,
+    DOMAIN,
+    REQUEST_BURST,
+    REQUEST_CONCURRENCY,
+    REQUEST_RATE,
+    STARTUP_SPREAD,
+)
+
+# Request priorities, served lowest first
+PRIORITY_OPEN = 0
+PRIORITY_DEFAULT = 1
+PRIORITY_BACKGROUND = 2
+
+
+def _phase(index: int) -> float:
+    """Return the index-th element of the base 2 van der Corput sequence."""
+    phase, denominator = 0.0, 1
+    while index:
+        denominator *= 2
+        index, bit = divmod(index, 2)
+        phase += bit / denominator
+    return phase
+
+
+class FnuggScheduler:
+    """Refresh phases and a prioritized token bucket for all API requests."""
+
+    def __init__(
+        self,
+        rate: float = REQUEST_RATE,
+        burst: int = REQUEST_BURST,
+        concurrency: int = REQUEST_CONCURRENCY,
+    ) -> None:
+        """Initialize the scheduler."""
+        self._rate = rate / 60
+        self._burst = burst
+        self._concurrency = concurrency
+        self._tokens = float(burst)
+        self._refilled = time.monotonic()
+        self._active = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._wakeup: asyncio.TimerHandle | None = None
+        self._slots: dict[Hashable, int] = {}
+        # Requests that had to wait for a token or a free slot
+        self.delayed = 0
+
+    def register(self, key: Hashable) -> float:
+        """Give ``key`` the first free phase, returning it as a share of the interval."""
+        if key not in self._slots:
+            taken = set(self._slots.values())
+            self._slots[key] = next(i for i in itertools.count() if i not in taken)
+        return _phase(self._slots[key])
+
+    def unregister(self, key: Hashable) -> None:
+        """Free the phase of ``key``."""
+        self._slots.pop(key, None)
+
+    def startup_delay(self, key: Hashable) -> float:
+        """Return the seconds to wait before the first background refresh of ``key``."""
+        return self.register(key) * STARTUP_SPREAD.total_seconds()
+
+    def stagger(
+        self,
+        key: Hashable,
+        interval: timedelta,
+        earliest: timedelta | None = None,
+        latest: timedelta | None = None,
+    ) -> timedelta:
+        """Return the delay that puts the next refresh of ``key`` on its phase.
+
+        The slot is between half and one and a half ``interval`` away, and
+        never sooner than ``earliest``, so refreshes happen once per
+        ``interval`` on average. It is never later than ``latest``.
+        """
+        period = interval.total_seconds()
+        if period <= 0:
+            return interval
+        now = time.time()
+        offset = self.register(key) * period
+        soonest = max(period / 2, earliest.total_seconds() if earliest else 0)
+        slot = math.floor((now + soonest - offset) / period) * period + offset + period
+        delay = timedelta(seconds=slot - now)
+        return min(delay, latest) if latest is not None else delay
+
+    @asynccontextmanager
+    async def request(self, priority: int = PRIORITY_DEFAULT) -> AsyncIterator[None]:
+        """Hold a request slot and token for the duration of a request."""
+        await self._async_acquire(priority)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _async_acquire(self, priority: int) -> None:
+        """Wait for a free slot and a token, higher priorities first."""
+        self._refill()
+        if not self._waiters and self._active < self._concurrency and self._tokens >= 1:
+            self._tokens -= 1
+            self._active += 1
+            return
+        self.delayed += 1
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just before the caller was cancelled
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        self._active -= 1
+        self._dispatch()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._burst, self._tokens + (now - self._refilled) * self._rate)
+        self._refilled = now
+
+    def _dispatch(self) -> None:
+        """Grant waiting requests while there are slots and tokens."""
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+            self._wakeup = None
+        self._refill()
+        while self._waiters and self._active < self._concurrency:
+            if self._waiters[0][2].done():
+                # Cancelled while waiting
+                heapq.heappop(self._waiters)
+                continue
+            if self._tokens < 1:
+                self._wakeup = asyncio.get_running_loop().call_later(
+                    (1 - self._tokens) / self._rate, self._dispatch
+                )
+                return
+            _, _, future = heapq.heappop(self._waiters)
+            self._tokens -= 1
+            self._active += 1
+            future.set_result(None)
+
+    def as_dict(self) -> dict[str, float | int]:
+        """Return the scheduler state for diagnostics."""
+        self._refill()
+        return {
+            "registered": len(self._slots),
+            "active_requests": self._active,
+            "waiting_requests": sum(not future.done() for _, _, future in self._waiters),
+            "tokens": round(self._tokens, 2),
+            "delayed_requests": self.delayed,
+        }
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant) -> FnuggScheduler:
+    """Return the scheduler shared by the whole integration."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_SCHEDULER not in domain_data:
+        domain_data[DATA_SCHEDULER] = FnuggScheduler()
+    return domain_data[DATA_SCHEDULER]
@@ -2,28 +2,50 @@
 
 import asyncio
 import datetime
+import hashlib
 import json
 import logging
 import time
 
-import aiohttp
-import async_timeout
 import voluptuous as vol
 from homeassistant.components.sensor import PLATFORM_SCHEMA
 
+from homeassistant.core import callback
 from homeassistant.helpers import config_validation
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.device_registry import DeviceEntryType
 from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.event import (
+    async_track_point_in_time,
+    async_track_time_interval,
+)
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from homeassistant.const import (
     UnitOfTemperature,
 )
 from homeassistant.util import dt as dt_util
 
+from .aggregates import RANKED_METRICS, RESORTS_OPEN, async_get_aggregates
+from .api import FnuggApiError
+from .blog import BLOG_IMAGE_KEYS, build_blog_sensor
+from .extraction import extract_resort
+from .history import HISTORY_FIELDS, ResortHistory
+from .metrics import LATENCY_ATTRIBUTES, FnuggMetrics
+from .polling import parse_season_date
+from .schedule import OpeningSchedule
+from .projection import RESORT_TREE, SOURCE_FIELDS
+from .scheduler import PRIORITY_DEFAULT, PRIORITY_OPEN
 from .const import (
+    DATA_BLOG,
     LIFT_STATUS,
-    SENSOR_TYPES,
-    NUMERIC_SENSORS,
+)
+from .descriptions import (
+    LIFT_PREFIX,
+    METRIC_SENSORS,
+    SLOPE_DIFFICULTIES,
+    SLOPE_PREFIX,
+    sensor_description,
 )
 
 from homeassistant.components.sensor import (
@@ -36,96 +58,218 @@ _LOGGER = logging.getLogger(__name__)
 
 DOMAIN = "fnugg"
 
+# Parts of the resort document the sensors are built from, besides the
+# top station conditions
+FINGERPRINT_KEYS = (
+    "lifts",
+    "slopes",
+    "opening_hours",
+    "images",
+    "resort_open",
+    "resort_open_override",
+    "resort_status",
+    "resort_opening_date",
+    "resort_closing_date",
+    "last_updated",
+)
+
+# Sensors computed from the opening hours and the current time
+SCHEDULE_SENSORS = ("opening_hours", "next_event", "next_event_time", "is_open")
+
+
+def lift_slug_id(lift_name):
+    """Return the name-based sensor id used for lifts without an API id."""
+    return f"{LIFT_PREFIX}{lift_name.lower().replace(' ', '_')}"
+
+
+class LiftReconciler:
+    """Keep the lift entities in line with the lifts in the latest payload.
+
+    Runs after every fetch but only does work when the lifts were rebuilt.
+    New lifts get entities, and lifts missing from the payload are removed
+    from the entity registry. A payload without any lifts is ignored, so a
+    partial response does not wipe them all.
+    """
+
+    _prefix = LIFT_PREFIX
+    _kind = "lift"
+
+    def __init__(self, hass, config_entry, coordinator, async_add_entities):
+        """Initialize the reconciler."""
+        self._registry = er.async_get(hass)
+        self._entry_id = config_entry.entry_id
+        self._coordinator = coordinator
+        self._fnugg_data = coordinator.fnugg_data
+        self._async_add_entities = async_add_entities
+        self._unique_prefix = f"fnugg_{self._fnugg_data._resort_id}_"
+        self._names = self._current_names()
+
+    def _current_names(self):
+        """Return the name per sensor id in the latest payload."""
+        return self._fnugg_data.lift_names
+
+    @callback
+    def async_migrate_unique_ids(self) -> None:
+        """Move lift entities from name-based to id-based unique ids."""
+        for sensor_id, lift_name in self._fnugg_data.lift_names.items():
+            legacy_id = lift_slug_id(lift_name)
+            if legacy_id == sensor_id:
+                continue
+            entity_id = self._registry.async_get_entity_id(
+                "sensor", DOMAIN, self._unique_id(legacy_id)
+            )
+            if entity_id and not self._registry.async_get_entity_id(
+                "sensor", DOMAIN, self._unique_id(sensor_id)
+            ):
+                _LOGGER.debug("Migrating %s to a stable lift id", entity_id)
+                self._registry.async_update_entity(
+                    entity_id, new_unique_id=self._unique_id(sensor_id)
+                )
+
+    @callback
+    def async_retire_missing(self) -> None:
+        """Remove registered lifts that are no longer in the payload."""
+        current = self._current_names()
+        if not current:
+            return
+        for entry in er.async_entries_for_config_entry(self._registry, self._entry_id):
+            sensor_id = entry.unique_id.removeprefix(self._unique_prefix)
+            if sensor_id.startswith(self._prefix) and sensor_id not in current:
+                self._async_remove(entry.entity_id)
+
+    @callback
+    def async_reconcile(self) -> None:
+        """Add and retire lift entities after a fetch."""
+        current = self._current_names()
+        previous = self._names
+        if current is previous or not current:
+            return
+        self._names = current
+        added = [sensor_id for sensor_id in current if sensor_id not in previous]
+        removed = [sensor_id for sensor_id in previous if sensor_id not in current]
+        if not added and not removed:
+            return
+        if added:
+            _LOGGER.info(
+                "Adding %d new %ss for %s",
+                len(added),
+                self._kind,
+                self._fnugg_data.resort_name,
+            )
+            sensors = self._fnugg_data.sensors
+            self._async_add_entities(
+                Fnugg(self._coordinator, self._fnugg_data, sensor_id, sensors[sensor_id])
+                for sensor_id in added
+            )
+        for sensor_id in removed:
+            entity_id = self._registry.async_get_entity_id(
+                "sensor", DOMAIN, self._unique_id(sensor_id)
+            )
+            if entity_id:
+                self._async_remove(entity_id)
+
+    @callback
+    def _async_remove(self, entity_id) -> None:
+        """Remove an entity from the registry, and with it from hass."""
+        _LOGGER.info("Removing %s, the %s is gone from Fnugg", entity_id, self._kind)
+        self._registry.async_remove(entity_id)
+
+    def _unique_id(self, sensor_id):
+        return f"{self._unique_prefix}{sensor_id}"
+
+
+class SlopeReconciler(LiftReconciler):
+    """Keep the per-slope entities in line with the slopes, in the same way.
+
+    When per-slope sensors are turned off in the options, every registered
+    slope entity is removed instead.
+    """
+
+    _prefix = SLOPE_PREFIX
+    _kind = "slope"
+
+    def _current_names(self):
+        """Return the name per slope sensor id in the latest payload."""
+        return self._fnugg_data.slope_names
+
+    @callback
+    def async_retire_missing(self) -> None:
+        """Remove registered slopes that are gone, or all of them when disabled."""
+        if self._fnugg_data.slope_sensors:
+            super().async_retire_missing()
+            return
+        for entry in er.async_entries_for_config_entry(self._registry, self._entry_id):
+            if entry.unique_id.removeprefix(self._unique_prefix).startswith(SLOPE_PREFIX):
+                self._registry.async_remove(entry.entity_id)
+
+
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Set up Fnugg from a config entry."""
-    resort_id = config_entry.data["resort_id"]
-    resort_name = config_entry.data["name"]
-    
-    fnugg_data = FnuggData(
-        async_get_clientsession(hass),
-        resort_id,
-        resort_name
-    )
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    fnugg_data = coordinator.fnugg_data
 
-    if not await fnugg_data.update_data():
-        _LOGGER.error("Failed to get data from Fnugg")
-        return
+    lifts = LiftReconciler(hass, config_entry, coordinator, async_add_entities)
+    lifts.async_migrate_unique_ids()
+    lifts.async_retire_missing()
+    config_entry.async_on_unload(coordinator.async_add_listener(lifts.async_reconcile))
+    slopes = SlopeReconciler(hass, config_entry, coordinator, async_add_entities)
+    slopes.async_retire_missing()
+    config_entry.async_on_unload(coordinator.async_add_listener(slopes.async_reconcile))
 
     dev = []
-    for sensor_id, sensor_data in fnugg_data.sensors.items():
-        dev.append(Fnugg(sensor_id, sensor_data, fnugg_data))
+    for sensor_id, sensor_data in coordinator.data.items():
+        if sensor_id in SCHEDULE_SENSORS:
+            dev.append(FnuggScheduleSensor(coordinator, fnugg_data, sensor_id, sensor_data))
+        else:
+            dev.append(Fnugg(coordinator, fnugg_data, sensor_id, sensor_data))
+    dev.append(FnuggBlogSensor(hass.data[DOMAIN][DATA_BLOG], fnugg_data))
+    for sensor_id in METRIC_SENSORS:
+        dev.append(FnuggMetricSensor(coordinator, fnugg_data, sensor_id))
+
+    # One loaded entry provides the sensors across all resorts, and they move
+    # to another one when it unloads
+    aggregates = async_get_aggregates(hass)
+
+    @callback
+    def _async_add_aggregate_sensors() -> None:
+        async_add_entities(
+            FnuggAggregateSensor(aggregates, sensor_id)
+            for sensor_id in (*RANKED_METRICS, RESORTS_OPEN)
+        )
+
+    aggregates.async_add_platform(config_entry.entry_id, _async_add_aggregate_sensors)
 
     async_add_entities(dev)
 
-class Fnugg(SensorEntity):
-    """Representation of a Fnugg sensor."""
+class Fnugg(CoordinatorEntity, SensorEntity):
+    """Representation of a Fnugg sensor.
 
-    def __init__(self, sensor_id, sensor, fnugg_data):
+    Static metadata comes from the shared ``entity_description``. The sensor
+    data is a ``(value, attributes)`` tuple whose attributes are already
+    filtered, or None when there are none.
+    """
+
+    def __init__(self, coordinator, fnugg_data, sensor_id, sensor):
         """Initialize the sensor."""
-        super().__init__()
+        super().__init__(coordinator)
+        self.entity_description = sensor_description(sensor_id)
         self._sensor_id = sensor_id
         self._sensor = sensor
+        self._last_available = True
         self._fnugg_data = fnugg_data
-        self._attr_device_class = None
-        
+
         # Get resort info for device info
         self._resort_id = fnugg_data._resort_id
         self._resort_name = fnugg_data._resort_name
 
-        _LOGGER.debug("Creating SensorEntity: %s" % sensor_id)
-
-        
-        # Create friendly name for sensors
-        if sensor_id.startswith("lift_"):
-            lift_name = sensor_id.replace("lift_", "").replace("_", " ").title()
-            if sensor_id.endswith("_numeric"):
-                self._attr_name = f"{lift_name} Status Numeric"
-            else:
-                self._attr_name = f"{lift_name} Status"
-        elif sensor_id.startswith("facility_"):
-            facility_name = sensor_id.replace("facility_", "").replace("_", " ").title()
-            self._attr_name = f"{facility_name}"
-        else:
-            self._attr_name = sensor_id.replace("_", " ").title()
-            
+        if sensor_id.startswith(LIFT_PREFIX):
+            lift_name = fnugg_data.lift_names.get(sensor_id, sensor_id[len(LIFT_PREFIX):])
+            self._attr_name = f"{lift_name.title()} Status"
+        elif sensor_id.startswith(SLOPE_PREFIX):
+            slope_name = fnugg_data.slope_names.get(sensor_id, sensor_id[len(SLOPE_PREFIX):])
+            self._attr_name = f"{slope_name.title()} Slope"
         self._attr_unique_id = f"fnugg_{self._resort_id}_{sensor_id}"
-        
-        # Define text-based sensors
-        TEXT_SENSORS = [
-            "lifts_status_text",
-            "slopes_status",
-            "resort_status",
-            "condition_description",
-            "resort_opening_date",
-            "resort_closing_date",
-            "facility_status",
-            "blog_post_title",
-        ]
-        
-        # Modify the state class logic
-        if (sensor_id in NUMERIC_SENSORS or 
-            sensor_id.endswith("_numeric")):
-            self._attr_state_class = SensorStateClass.MEASUREMENT
-        elif sensor_id in TEXT_SENSORS or sensor_id.endswith("_text"):
-            self._attr_state_class = None  # Explicitly set None for text sensors
-
-        # Get the unit and device class from SENSOR_TYPES
-        sensor_type = sensor[1]
-        if sensor_type in SENSOR_TYPES:
-            self._attr_native_unit_of_measurement = SENSOR_TYPES[sensor_type][0] or None
-            if SENSOR_TYPES[sensor_type][1]:
-                self._attr_device_class = SENSOR_TYPES[sensor_type][1]
-                _LOGGER.debug(
-                    "Setting device class for sensor %s to %s",
-                    self._attr_name,
-                    self._attr_device_class
-                )
-
-        # Set any additional attributes
-        if len(sensor) > 2 and isinstance(sensor[2], dict):
-            for key, value in sensor[2].items():
-                if key != "device_class":
-                    setattr(self, f"_attr_{key}", value)
+        self._last_data_age = self._data_age()
 
     @property
     def device_info(self):
@@ -136,485 +280,543 @@ class Fnugg(SensorEntity):
             "manufacturer": "Fnugg",
             "model": "Ski Resort",
         }
+
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        if self._sensor_id in self._fnugg_data.sensors:
-            return self._fnugg_data.sensors[self._sensor_id][0]
+        if self._sensor is not None:
+            return self._sensor[0]
         return None
 
-    @property
-    def device_class(self):
-        """Return the device class."""
-        return self._attr_device_class
-
     @property
     def extra_state_attributes(self):
         """Return the state attributes of the sensor."""
-        sensor = self._fnugg_data.sensors.get(self._sensor_id, (None, None, {}))
-        raw_attrs = sensor[2] if len(sensor) > 2 else {}
-        attrs = {}
+        attrs = self._sensor[1] if self._sensor is not None else None
+        data_age = self._data_age()
+        if data_age is None:
+            return attrs
+        return {**(attrs or {}), "data_age": data_age}
+
+    @property
+    def available(self):
+        """Stay available on the last good data until it is too old."""
+        return not self.coordinator.data_expired
+
+    def _data_age(self):
+        """Return the age in minutes of stale data, or None if it is current."""
+        if not self.coordinator.stale or self.coordinator.data_age is None:
+            return None
+        return int(self.coordinator.data_age.total_seconds() // 60)
+
+    def _lookup_sensor(self):
+        """Return the current sensor tuple from the coordinator data."""
+        return self._fnugg_data.sensors.get(self._sensor_id)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when the value, attributes or availability changed."""
+        sensor = self._lookup_sensor()
+        if sensor is None and self._sensor_id.startswith((LIFT_PREFIX, SLOPE_PREFIX)):
+            # The lift or slope is gone and the reconciler is removing this entity
+            return
+        available = self.available
+        # The age changes at most once per fetch attempt, since only those
+        # notify the entities
+        data_age = self._data_age()
+        if (
+            sensor == self._sensor
+            and available == self._last_available
+            and data_age == self._last_data_age
+        ):
+            self._fnugg_data.state_writes_skipped += 1
+            return
+        self._sensor = sensor
+        self._last_available = available
+        self._last_data_age = data_age
+        self._fnugg_data.state_writes += 1
+        self.async_write_ha_state()
+
+
+class FnuggScheduleSensor(Fnugg):
+    """Opening hours sensor updated by timers instead of by polling the API.
+
+    A timer fires at the next open/close transition or local midnight,
+    whichever comes first, and ``next_event`` also ticks once a minute for
+    its countdown text. ``next_event_time`` is the time of the next
+    transition, so it only changes at one.
+    """
+
+    # The countdown writes a state every minute; keep the age of the resort
+    # data, which changes as often while stale, out of its attribute rows
+    _unrecorded_attributes = frozenset({"data_age"})
+
+    def __init__(self, coordinator, fnugg_data, sensor_id, sensor):
+        """Initialize the sensor."""
+        super().__init__(coordinator, fnugg_data, sensor_id, sensor)
+        self._unsub_transition = None
+
+    async def async_added_to_hass(self) -> None:
+        """Start the timers when added to hass."""
+        await super().async_added_to_hass()
+        self._schedule_transition()
+        if self._sensor_id == "next_event":
+            self.async_on_remove(
+                async_track_time_interval(
+                    self.hass, self._handle_tick, datetime.timedelta(minutes=1)
+                )
+            )
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel the transition timer."""
+        await super().async_will_remove_from_hass()
+        if self._unsub_transition:
+            self._unsub_transition()
+            self._unsub_transition = None
+
+    def _lookup_sensor(self):
+        """Return the sensor tuple computed for the current time."""
+        return self._fnugg_data.build_schedule_sensors()[self._sensor_id]
+
+    @callback
+    def _schedule_transition(self) -> None:
+        """Set a timer for the next transition or midnight."""
+        if self._unsub_transition:
+            self._unsub_transition()
+        now = dt_util.now()
+        wake_at = dt_util.start_of_local_day(now + datetime.timedelta(days=1))
+        transition = self._fnugg_data.schedule.next_transition(now)
+        if transition is not None and transition[0] < wake_at:
+            wake_at = transition[0]
+        self._unsub_transition = async_track_point_in_time(
+            self.hass, self._handle_transition, wake_at
+        )
+
+    @callback
+    def _update_state(self) -> None:
+        """Recompute the state, writing it only if it changed."""
+        super()._handle_coordinator_update()
+
+    @callback
+    def _handle_transition(self, _now) -> None:
+        """Recompute the state at a transition."""
+        self._unsub_transition = None
+        self._update_state()
+        self._schedule_transition()
+
+    @callback
+    def _handle_tick(self, _now) -> None:
+        """Recompute the countdown text."""
+        self._update_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Recompute the state and timer for a possibly new schedule."""
+        self._update_state()
+        self._schedule_transition()
+
 
-        for key, value in raw_attrs.items():
-            if key not in ("icon", "device_class", "extra_state_attributes", "latestSample"):
-                attrs[key] = value
+class FnuggBlogSensor(Fnugg):
+    """Latest blog post of a resort, updated by the shared blog coordinator."""
 
-        latest = raw_attrs.get("latestSample")
-        if latest:
-            try:
-                attrs["timestamp"] = datetime.datetime.fromisoformat(latest)
-            except ValueError:
-                pass
+    # The post text and picture URLs only change with the post; the blog
+    # image entities carry the pictures
+    _unrecorded_attributes = frozenset({"description", *BLOG_IMAGE_KEYS})
 
-        return attrs
+    def __init__(self, blog_coordinator, fnugg_data):
+        """Initialize the sensor."""
+        resort_id = str(fnugg_data._resort_id)
+        super().__init__(
+            blog_coordinator,
+            fnugg_data,
+            "blog_post_title",
+            (blog_coordinator.data or {}).get(resort_id, build_blog_sensor(None)),
+        )
+        self._blog_resort_id = resort_id
+
+    @property
+    def available(self):
+        """Keep serving the cached post when a blog refresh fails."""
+        return self._blog_resort_id in (self.coordinator.data or {})
+
+    def _data_age(self):
+        """Blog posts are not aged."""
+        return None
+
+    def _lookup_sensor(self):
+        """Return the blog sensor tuple for this resort."""
+        return (self.coordinator.data or {}).get(self._blog_resort_id)
 
-    async def async_update(self):
-        """Get the latest data."""
-        await self._fnugg_data.update()
-        self._sensor = self._fnugg_data.sensors.get(self._sensor_id)
+
+class FnuggMetricSensor(Fnugg):
+    """Hot-path metric of a resort, disabled by default."""
+
+    # Counters that change on every fetch would add an attributes row each time
+    _unrecorded_attributes = frozenset(
+        {
+            *LATENCY_ATTRIBUTES,
+            "total_bytes",
+            "unchanged_payloads",
+            "throttled",
+            "state_writes",
+            "state_writes_skipped",
+        }
+    )
+
+    def __init__(self, coordinator, fnugg_data, sensor_id):
+        """Initialize the sensor."""
+        super().__init__(
+            coordinator, fnugg_data, sensor_id, fnugg_data.build_metric_sensor(sensor_id)
+        )
+
+    @property
+    def available(self):
+        """Metrics are kept also while fetches fail."""
+        return True
+
+    def _data_age(self):
+        """Metrics are not aged."""
+        return None
+
+    def _lookup_sensor(self):
+        """Return the metric sensor tuple."""
+        return self._fnugg_data.build_metric_sensor(self._sensor_id)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state when the metric changed, without counting the write."""
+        sensor = self._lookup_sensor()
+        if sensor != self._sensor:
+            self._sensor = sensor
+            self.async_write_ha_state()
+
+
+class FnuggAggregateSensor(SensorEntity):
+    """Ranking or count across all configured resorts."""
+
+    _attr_should_poll = False
+    # The ranking changes with any resort in it; only the leading value is recorded
+    _unrecorded_attributes = frozenset({"ranking"})
+
+    def __init__(self, aggregates, sensor_id):
+        """Initialize the sensor."""
+        self.entity_description = sensor_description(sensor_id)
+        self._aggregates = aggregates
+        self._sensor_id = sensor_id
+        self._attr_unique_id = f"fnugg_aggregate_{sensor_id}"
+        self._sensor = self._build_sensor()
+
+    @property
+    def device_info(self):
+        """Return device information."""
+        return {
+            "identifiers": {(DOMAIN, "aggregates")},
+            "name": "Fnugg",
+            "manufacturer": "Fnugg",
+            "model": "All Resorts",
+            "entry_type": DeviceEntryType.SERVICE,
+        }
+
+    @property
+    def native_value(self):
+        """Return the leading resort, or the count."""
+        return self._sensor[0]
+
+    @property
+    def extra_state_attributes(self):
+        """Return the leading value and the ranking."""
+        return self._sensor[1]
+
+    def _build_sensor(self):
+        """Return the sensor tuple from the current aggregates."""
+        if self._sensor_id == RESORTS_OPEN:
+            return (self._aggregates.open_count, None)
+        top = self._aggregates.tops[self._sensor_id]
+        if not top:
+            return (None, None)
+        return (
+            self._aggregates.resort_name(top[0][0]),
+            {
+                "value": top[0][1],
+                "ranking": [
+                    {"resort": self._aggregates.resort_name(resort_id), "value": value}
+                    for resort_id, value in top
+                ],
+            },
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the aggregates."""
+        self.async_on_remove(self._aggregates.async_add_listener(self._handle_update))
+        self._handle_update()
+
+    @callback
+    def _handle_update(self) -> None:
+        """Write state when this aggregate changed."""
+        sensor = self._build_sensor()
+        if sensor != self._sensor:
+            self._sensor = sensor
+            self.async_write_ha_state()
 
 
 class FnuggData:
-    def __init__(self, session, resort_id, resort_name):
+    def __init__(self, client, resort_id, resort_name, batcher=None, slope_sensors=False):
         """Initialize the data object."""
-        self._session = session
+        self._client = client
         self._resort_id = resort_id
         self._resort_name = resort_name
+        self._batcher = batcher
+        # Build one sensor per slope besides the counts by difficulty
+        self.slope_sensors = slope_sensors
         self.sensors = {}
-        self._timeout = 10
-        self._updated_at = datetime.datetime.now()
+        # Last good resort document and when it was fetched
+        self.document = None
+        self.fetched_at = None
+        self.fingerprint = None
+        self._resort_sensors = {}
+        # Lift name per lift sensor id, replaced whenever the lifts are rebuilt
+        self.lift_names = {}
+        # Slope name per slope sensor id, empty unless slope sensors are enabled
+        self.slope_names = {}
+        self._opening_hours = {}
+        self.schedule = OpeningSchedule(None)
+        # Inputs for the adaptive polling interval
+        self.season = (None, None)
+        self.resort_open = False
+        self.new_snow = None
+        # Entity state writes performed and skipped because nothing changed
+        self.state_writes = 0
+        self.state_writes_skipped = 0
+        self.metrics = FnuggMetrics()
+        # Recent snow and weather values behind the trend sensors
+        self.history = ResortHistory()
         _LOGGER.debug("FnuggData initialized for resort: %s", resort_name)
 
-    @staticmethod
-    def _get_todays_hours(opening_hours, exception_days):
-        today = datetime.date.today()
-        for exc in (exception_days or []):
-            try:
-                exc_date = datetime.datetime.fromisoformat(
-                    exc["date"].replace("Z", "+00:00")
-                ).date()
-            except (KeyError, ValueError):
-                continue
-            if exc_date == today:
-                if exc.get("closed"):
-                    return "Closed"
-                return f"{exc['from']} - {exc['to']}"
-        if not isinstance(opening_hours, dict):
-            return None
-        day_key = today.strftime("%A").lower()
-        day = opening_hours.get(day_key)
-        if not day:
-            return None
-        if day.get("closed"):
-            return "Closed"
-        return f"{day['from']} - {day['to']}"
+    @property
+    def resort_id(self):
+        """Return the Fnugg id of the resort."""
+        return self._resort_id
 
-    @staticmethod
-    def _get_day_hours(opening_hours, exception_days, check_date):
-        """Return (from_str, to_str, closed) for a given date."""
-        for exc in (exception_days or []):
-            try:
-                exc_date = datetime.datetime.fromisoformat(
-                    exc["date"].replace("Z", "+00:00")
-                ).date()
-            except (KeyError, ValueError):
-                continue
-            if exc_date == check_date:
-                if exc.get("closed"):
-                    return None, None, True
-                return exc.get("from"), exc.get("to"), False
-        if isinstance(opening_hours, dict):
-            day_key = check_date.strftime("%A").lower()
-            day = opening_hours.get(day_key)
-            if day:
-                if day.get("closed"):
-                    return None, None, True
-                return day.get("from"), day.get("to"), False
-        return None, None, False
+    @property
+    def resort_name(self):
+        """Return the name of the resort."""
+        return self._resort_name
+
+    async def _fetch_resort(self):
+        """Return the resort document, from the shared batch when possible."""
+        # Open resorts go first when requests have to wait for the scheduler
+        priority = PRIORITY_OPEN if self.resort_open else PRIORITY_DEFAULT
+        if self._batcher is not None:
+            result = await self._batcher.async_get_resort(
+                self._resort_id, self.metrics, priority
+            )
+            if result is not None:
+                return result
+            _LOGGER.debug(
+                "Resort %s missing from batch response, fetching it directly",
+                self._resort_name,
+            )
 
-    @staticmethod
-    def _is_open(opening_hours, exception_days):
-        """Return True if the resort is currently open."""
-        now = dt_util.now()
-        from_str, to_str, closed = FnuggData._get_day_hours(
-            opening_hours, exception_days, now.date()
+        return await self._client.async_get(
+            f"/get/resort/{self._resort_id}/",
+            {"sourceFields": ",".join(SOURCE_FIELDS)},
+            RESORT_TREE,
+            endpoint="resort",
+            metrics=(self.metrics,),
+            priority=priority,
         )
-        if closed or not from_str or not to_str:
-            return False
-        def parse(t):
-            h, m = map(int, t.split(":"))
-            return now.replace(hour=h, minute=m, second=0, microsecond=0, fold=0)
-        return parse(from_str) <= now < parse(to_str)
 
     @staticmethod
-    def _get_next_event_text(opening_hours, exception_days):
-        """Return human-readable time until next open/close event."""
-        now = dt_util.now()
-        today = now.date()
-
-        def get_day_hours(check_date):
-            return FnuggData._get_day_hours(opening_hours, exception_days, check_date)
-
-        def parse_time_on_date(t, date):
-            h, m = map(int, t.split(":"))
-            return now.replace(
-                year=date.year, month=date.month, day=date.day,
-                hour=h, minute=m, second=0, microsecond=0, fold=0
-            )
-
-        def find_next_open():
-            """Find the next datetime the resort opens (today or future)."""
-            for days_ahead in range(0, 8):
-                check_date = today + datetime.timedelta(days=days_ahead)
-                from_str, _, closed = get_day_hours(check_date)
-                if not closed and from_str:
-                    open_dt = parse_time_on_date(from_str, check_date)
-                    if open_dt > now:
-                        return open_dt
-            return None
+    def _fingerprint(data):
+        """Return a stable hash of a JSON-like structure."""
+        return hashlib.blake2b(
+            json.dumps(data, sort_keys=True, default=str).encode(),
+            digest_size=16,
+        ).hexdigest()
+
+    def _build_resort_sensors(self, source):
+        """Build the sensors that only depend on the resort document."""
+        sensors = {
+            sensor_id: (value, None) for sensor_id, value in extract_resort(source).items()
+        }
 
-        def find_next_close():
-            """Return today's close time if the resort is currently open, else None."""
-            from_str, to_str, closed = get_day_hours(today)
-            if not closed and from_str and to_str:
-                open_dt = parse_time_on_date(from_str, today)
-                close_dt = parse_time_on_date(to_str, today)
-                if open_dt <= now < close_dt:
-                    return close_dt
-            return None
+        # Add individual lift statuses, keyed by the lift's API id so a
+        # renamed lift keeps its entity
+        lift_names = {}
+        lifts_detail = source.get("lifts", {}).get("list", [])
+        for lift in lifts_detail:
+            lift_name = lift.get("name", "").strip()
+            if lift_name:
+                if lift.get("id") is not None:
+                    lift_id = f"{LIFT_PREFIX}{lift['id']}"
+                else:
+                    lift_id = lift_slug_id(lift_name)
+                lift_names[lift_id] = lift_name
 
-        next_open = find_next_open()
-        next_close = find_next_close()
+                # Get status
+                status_value = lift.get("status")
+                status = LIFT_STATUS.get(int(status_value), "Unknown")
 
-        if next_close and (next_open is None or next_close < next_open):
-            delta = next_close - now
-            label = "Closing"
-        elif next_open:
-            delta = next_open - now
-            label = "Opening"
-        else:
-            return None
+                slope_difficulty = lift.get("slope_difficulty")
+                sensors[lift_id] = (
+                    status,
+                    {"slope_difficulty": slope_difficulty} if slope_difficulty else None,
+                )
+        self.lift_names = lift_names
+        sensors.update(self._build_slope_sensors(source))
+        return sensors
+
+    def _build_slope_sensors(self, source):
+        """Count open slopes by difficulty, and build per-slope sensors if enabled.
+
+        Both come from one pass over the slope list. The per-slope sensors
+        are keyed by the slope's API id like the lifts.
+        """
+        total = dict.fromkeys(SLOPE_DIFFICULTIES, 0)
+        open_count = dict.fromkeys(SLOPE_DIFFICULTIES, 0)
+        sensors = {}
+        slope_names = {}
+        for slope in source.get("slopes", {}).get("list", []):
+            status_value = slope.get("status")
+            status = int(status_value) if status_value is not None else None
+            difficulty = slope.get("difficulty") or slope.get("slope_difficulty")
+            if isinstance(difficulty, str):
+                difficulty = difficulty.lower()
+            if difficulty in total:
+                total[difficulty] += 1
+                open_count[difficulty] += status == 1
+            if not self.slope_sensors:
+                continue
+            slope_name = slope.get("name", "").strip()
+            if slope_name:
+                if slope.get("id") is not None:
+                    slope_id = f"{SLOPE_PREFIX}{slope['id']}"
+                else:
+                    slope_id = f"{SLOPE_PREFIX}{slope_name.lower().replace(' ', '_')}"
+                slope_names[slope_id] = slope_name
+                sensors[slope_id] = (
+                    LIFT_STATUS.get(status, "Unknown"),
+                    {"difficulty": difficulty} if difficulty else None,
+                )
+        for difficulty in SLOPE_DIFFICULTIES:
+            sensors[f"slopes_open_{difficulty}"] = (
+                open_count[difficulty],
+                {"total": total[difficulty]},
+            )
+        self.slope_names = slope_names
+        return sensors
 
-        total_minutes = int(delta.total_seconds() // 60)
-        hours, minutes = divmod(total_minutes, 60)
+    def build_schedule_sensors(self, now=None):
+        """Build the sensors that also depend on the current time."""
+        schedule = self.schedule
+        now = now or dt_util.now()
+        return {
+            "opening_hours": (schedule.hours_text(now.date()), None),
+            "next_event": (schedule.next_event_text(now), None),
+            "next_event_time": self._next_event_sensor(schedule, now),
+            "is_open": (schedule.is_open(now), None),
+        }
 
-        if hours > 0 and minutes > 0:
-            return f"{label} in {hours} hours and {minutes} minutes"
-        elif hours > 0:
-            return f"{label} in {hours} hours"
-        elif minutes > 0:
-            return f"{label} in {minutes} minutes"
+    @staticmethod
+    def _next_event_sensor(schedule, now):
+        """Return the time of the next opening or closing, which only changes with it."""
+        transition = schedule.next_transition(now)
+        if transition is None:
+            return (None, None)
+        instant, opens = transition
+        return (instant, {"event": "opening" if opens else "closing"})
+
+    def build_metric_sensor(self, sensor_id):
+        """Return the sensor tuple of one metric."""
+        metrics = self.metrics
+        if sensor_id == "fetch_latency":
+            histogram = metrics.fetch_latency.get("resort")
+            if histogram is None:
+                return (None, None)
+            attrs = histogram.as_dict()
+            return (attrs.pop("last_ms"), {**attrs, **attrs.pop("buckets")})
+        if sensor_id == "payload_size":
+            return (metrics.payload_bytes, {"total_bytes": metrics.payload_bytes_total})
+        if sensor_id == "decode_time":
+            return (_round_ms(metrics.decode_ms), None)
+        if sensor_id == "build_time":
+            return (_round_ms(metrics.build_ms), None)
+        if sensor_id == "skipped_updates":
+            return (
+                metrics.unchanged + metrics.throttled,
+                {
+                    "unchanged_payloads": metrics.unchanged,
+                    "throttled": metrics.throttled,
+                    "state_writes": self.state_writes,
+                    "state_writes_skipped": self.state_writes_skipped,
+                },
+            )
+        if sensor_id == "errors":
+            return (metrics.error_count, dict(metrics.errors) or None)
+        return (metrics.last_success, None)
+
+    def apply_document(self, result, fetched_at=None):
+        """Build the sensors from a resort document."""
+        source = result.get("_source", {})
+        conditions = source.get("conditions", {})
+        fingerprint = self._fingerprint([
+            conditions.get("combined"),
+            conditions.get("current_report", {}).get("top"),
+            *(source.get(key) for key in FINGERPRINT_KEYS),
+        ])
+        if fingerprint != self.fingerprint:
+            start = time.perf_counter()
+            self._resort_sensors = self._build_resort_sensors(source)
+            opening_hours = source.get("opening_hours", {})
+            self._opening_hours = opening_hours if isinstance(opening_hours, dict) else {}
+            self.schedule = OpeningSchedule(self._opening_hours)
+            self.season = (
+                parse_season_date(source.get("resort_opening_date")),
+                parse_season_date(source.get("resort_closing_date")),
+            )
+            self.resort_open = bool(source.get("resort_open"))
+            self.new_snow = self._resort_sensors["new_snow"][0]
+            self.fingerprint = fingerprint
+            self.metrics.build_ms = (time.perf_counter() - start) * 1000
         else:
-            return f"{label} now"
-
-    async def update(self, _=None, force_update=False):
-        now = datetime.datetime.now()
-        elapsed = now - self._updated_at
-        if elapsed < datetime.timedelta(minutes=20) and not force_update:
-            _LOGGER.debug("Skipping update, last update was %s minutes ago", elapsed.total_seconds() / 60)
-            return
-        self._updated_at = now
-        await self.update_data()
+            self.metrics.unchanged += 1
+            _LOGGER.debug("Resort data unchanged for %s, reusing sensors", self._resort_name)
+
+        self.fetched_at = fetched_at or dt_util.utcnow()
+        self.history.add(self.fetched_at.timestamp(), {
+            field: self._resort_sensors.get(field, (None,))[0] for field in HISTORY_FIELDS
+        })
+        sensors = dict(self._resort_sensors)
+        sensors.update(self.build_schedule_sensors())
+        sensors.update(self.history.build_sensors())
+        self.sensors = sensors
+        self.document = result
 
     async def update_data(self):
         """Update data from Fnugg API."""
-        headers = {
-            "accept": "application/json",
-            "content-type": "application/json",
-        }
         try:
             _LOGGER.debug("Fetching data from Fnugg API for resort: %s", self._resort_name)
-            with async_timeout.timeout(self._timeout):
-                resp = await self._session.get(
-                    f"https://api.fnugg.no/get/resort/{self._resort_id}/",
-                    headers=headers,
-                )
-            if resp.status != 200:
-                _LOGGER.error(
-                    "Error connecting to Fnugg, resp code: %s %s",
-                    resp.status,
-                    resp.reason,
-                )
+            start = time.perf_counter()
+            result = await self._fetch_resort()
+            self.metrics.observe_fetch("resort", time.perf_counter() - start)
+            if result is None:
+                self.metrics.record_error("empty_response")
                 return False
-                
-            result = await resp.json()
-            source = result.get("_source", {})
-            conditions = source.get("conditions", {}).get("combined", {}).get("top", {})
-            
-            # Get lift data
-            lifts = source.get("lifts", {})
-            lifts_total = int(lifts.get("count", 0))
-            lifts_open = int(lifts.get("open", 0))
-            lifts_percentage = round((lifts_open / lifts_total * 100) if lifts_total > 0 else 0)
-            
-            # Get slope data
-            slopes = source.get("slopes", {})
-            slopes_total = int(slopes.get("count", 0))
-            slopes_open = int(slopes.get("open", 0))
-            slopes_percentage = round((slopes_open / slopes_total * 100) if slopes_total > 0 else 0)
-            contact_info = source.get("contact", "")
-            _LOGGER.debug("Resort opening date: %s", source.get("resort_opening_date"))
-            resort_opening_date = source.get("resort_opening_date", "")
-            resort_closing_date = source.get("resort_closing_date", "")
-            last_updated = source.get("last_updated", "")
-            opening_hours = source.get("opening_hours", {})
-            exception_days = opening_hours.get("exception_days", []) if isinstance(opening_hours, dict) else []
-            current_report = source.get("conditions", {}).get("current_report", {}).get("top", {})
-            images = source.get("images", {})
-
-            wind_direction = conditions.get("wind", {}).get("degree")
-            direction = ['N','NNE','NE','ENE','E','ESE','SE','SSE','S','SSW','SW','WSW','W','WNW','NW','NNW','N']
-            wind_direction_text = direction[int((wind_direction+11.25)/22.5)] if wind_direction is not None else None
-            
-            self.sensors = {
-                # Weather Conditions
-                "temp": (
-                    conditions.get("temperature", {}).get("value"),
-                    "temp",
-                    {"icon": "mdi:thermometer"}
-                ),
-                "wind_speed": (
-                    conditions.get("wind", {}).get("mps"),
-                    "wind_speed",
-                    {"icon": "mdi:weather-windy"}
-                ),
-                "wind_direction": (
-                    wind_direction,
-                    "wind_direction",
-                    {"icon": "mdi:compass"}
-                ),
-                "wind_direction_text": (
-                    wind_direction_text,
-                    "wind_direction_text",
-                    {"icon": "mdi:compass"}
-
-                ),
-                "condition_text": (
-                    conditions.get("condition_description"),
-                    "condition_text",
-                    {"icon": "mdi:weather-snowy"}
-                ),
-                
-                # Snow Info
-                "snow_depth": (
-                    conditions.get("snow", {}).get("depth_slope"),
-                    "snow_depth",
-                    {"icon": "mdi:ruler"}
-                ),
-                "new_snow": (
-                    conditions.get("snow", {}).get("today"),
-                    "new_snow",
-                    {"icon": "mdi:snowflake"}
-                ),
-                
-                # Lift Status
-                "lifts_total": (
-                    lifts_total,
-                    "lifts_total",
-                    {"icon": "mdi:ski"}
-                ),
-                "lifts_open": (
-                    lifts_open,
-                    "lifts_open",
-                    {"icon": "mdi:ski"}
-                ),
-                "lifts_percentage": (
-                    lifts_percentage,
-                    "lifts_percentage",
-                    {"icon": "mdi:ski"}
-                ),
-                "lifts_status_text": (
-                    f"{lifts_open} of {lifts_total} lifts open ({lifts_percentage}%)",
-                    "text",
-                    {"icon": "mdi:ski"}
-                ),
-                
-                # Slope Status
-                "slopes_total": (
-                    slopes_total,
-                    "slopes_total",
-                    {"icon": "mdi:ski"}
-                ),
-                "slopes_open": (
-                    slopes_open,
-                    "slopes_open",
-                    {"icon": "mdi:ski"}
-                ),
-                "slopes_percentage": (
-                    slopes_percentage,
-                    "slopes_percentage",
-                    {"icon": "mdi:ski"}
-                ),
-                "slopes_status_text": (
-                    f"{slopes_open} of {slopes_total} slopes open ({slopes_percentage}%)",
-                    "slopes_status_text",
-                    {"icon": "mdi:ski"}
-                ),
-                
-                # Resort Info
-                "resort_status": (
-                    source.get("resort_status") or ("Open" if source.get("resort_open") else "Closed"),
-                    "resort_status",
-                    {"icon": "mdi:information"}
-                ),
-                "resort_opening_date": (
-                    resort_opening_date,
-                    "date",
-                    {
-                        "icon": "mdi:calendar-month",
-                        "device_class": SensorDeviceClass.TIMESTAMP
-                    }
-                ),
-                "resort_closing_date": (
-                    resort_closing_date,
-                    "date",
-                    {
-                        "icon": "mdi:calendar-month",
-                        "device_class": SensorDeviceClass.TIMESTAMP
-                    }
-                ),
-                "last_updated": (
-                    last_updated,
-                    "date",
-                    {
-                        "icon": "mdi:clock",
-                        "device_class": SensorDeviceClass.TIMESTAMP
-                    }
-                ),
-                "opening_hours": (
-                    self._get_todays_hours(opening_hours, exception_days),
-                    "hours",
-                    {
-                        "icon": "mdi:information",
-                        "extra_state_attributes": {
-                            "schedule": opening_hours,
-                            "exception_days": exception_days,
-                        },
-                    }
-                ),
-                "daily_report": (
-                    current_report.get("condition_description"),
-                    "text",
-                    {"icon": "mdi:note-text"},
-                ),
-                "resort_image": (
-                    images.get("image_full"),
-                    "text",
-                    {"icon": "mdi:image"},
-                ),
-                "next_event": (
-                    self._get_next_event_text(opening_hours, exception_days),
-                    "text",
-                    {"icon": "mdi:clock-outline"},
-                ),
-                "is_open": (
-                    self._is_open(opening_hours, exception_days),
-                    "is_open",
-                    {"icon": "mdi:door-open"},
-                ),
-                "resort_open": (
-                    source.get("resort_open"),
-                    "resort_open",
-                    {"icon": "mdi:information"}
-                ),
-                "resort_open_override": (
-                    source.get("resort_open_override"),
-                    "resort_open_override",
-                    {"icon": "mdi:information"}
-                ),
-            }
-            # Fetch latest blog post for this resort
-            try:
-                with async_timeout.timeout(self._timeout):
-                    blog_resp = await self._session.get(
-                        f"https://api.fnugg.no/search?type=blog_post&facet=site:{self._resort_id}&sort=date:desc&size=1",
-                        headers=headers,
-                    )
-                if blog_resp.status == 200:
-                    blog_result = await blog_resp.json()
-                    blog_hits = blog_result.get("hits", {}).get("hits", [])
-                    if blog_hits:
-                        blog = blog_hits[0].get("_source", {})
-                        blog_title = blog.get("title", "").strip() or None
-                        blog_description = blog.get("description", "").strip() or None
-                        blog_date = blog.get("date")
-                        blog_date_modified = blog.get("modified") or None
-                        blog_author = blog.get("author", {}).get("name") or None
-                        blog_images = blog.get("images", {})
-                    else:
-                        blog_title = blog_description = blog_date = blog_author = None
-                        blog_images = {}
-                else:
-                    blog_title = blog_description = blog_date = blog_author = None
-                    blog_images = {}
-            except Exception as err:
-                _LOGGER.warning("Failed to fetch blog post: %s", err)
-                blog_title = blog_description = blog_date = blog_author = None
-                blog_images = {}
-
-            blog_attrs = {
-                "icon": "mdi:post",
-                "description": blog_description,
-                "date": blog_date,
-                "date_modified": blog_date_modified,
-                "author": blog_author,
-            }
-            if blog_images:
-                mobile = blog_images.get("mobile", {})
-                for scale, scale_data in mobile.items():
-                    if isinstance(scale_data, dict):
-                        for size, url in scale_data.items():
-                            blog_attrs[f"image_mobile_{scale}_{size}"] = url
-                for key in ("image_full", "image_1_1_l", "image_1_1_s",
-                            "image_16_9_m", "image_16_9_s", "image_16_9_xl", "image_16_9_xl_nc"):
-                    if key in blog_images:
-                        blog_attrs[key] = blog_images[key]
-
-            self.sensors["blog_post_title"] = (
-                blog_title,
-                "blog_post_title",
-                blog_attrs,
-            )
 
-            # Add individual lift statuses
-            lifts_detail = source.get("lifts", {}).get("list", [])
-            for lift in lifts_detail:
-                lift_name = lift.get("name", "").strip()
-                if lift_name:
-                    # Create a safe sensor ID from the lift name
-                    lift_id = f"lift_{lift_name.lower().replace(' ', '_')}"
-                    
-                    # Get status
-                    status_value = lift.get("status")
-                    status = LIFT_STATUS.get(int(status_value), "Unknown")
-                    
-                    # Get additional info
-                    slope_difficulty = lift.get("slope_difficulty")
-                    
-                    # Create attribute dictionary
-                    attributes = {
-                        "icon": "mdi:ski",
-                    }
-                    
-                    if slope_difficulty:
-                        attributes["slope_difficulty"] = slope_difficulty
-                    
-                    # Add to sensors dictionary
-                    self.sensors[lift_id] = (
-                        status,
-                        "lift_status",
-                        attributes
-                    )
+            self.apply_document(result)
+            self.metrics.last_success = self.fetched_at
             _LOGGER.info("Data updated for resort: %s", self._resort_name)
             return True
-            
-        except aiohttp.ClientError as err:
-            _LOGGER.error("Error connecting to Fnugg: %s", err, exc_info=True)
+
+        except FnuggApiError as err:
+            # Retried by the client and reported by the coordinator
+            self.metrics.record_error(err.kind)
             raise
-        except asyncio.TimeoutError:
-            _LOGGER.error("Timeout while connecting to Fnugg")
-            return False
         except Exception as err:
+            self.metrics.record_error(type(err).__name__)
             _LOGGER.error("Unexpected error: %s", err, exc_info=True)
             return False
 
+
+def _round_ms(value):
+    """Round a duration in ms for display."""
+    return round(value, 2) if value is not None else None
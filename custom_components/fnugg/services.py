@@ -0,0 +1,179 @@
+"""Services of the Fnugg integration."""
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+import logging
+
+import voluptuous as vol
+
+from homeassistant.const import (
+    ATTR_AREA_ID,
+    ATTR_DEVICE_ID,
+    ATTR_ENTITY_ID,
+    CONF_LATITUDE,
+    CONF_LONGITUDE,
+    CONF_RADIUS,
+)
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.service import async_extract_config_entry_ids
+
+from .api import FnuggApiError
+from .catalog import async_get_catalog
+from .const import DEFAULT_SEARCH_LIMIT, DEFAULT_SEARCH_RADIUS, DOMAIN, REFRESH_DEBOUNCE
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_FIND_RESORTS = "find_resorts"
+SERVICE_REFRESH = "refresh"
+CONF_LIMIT = "limit"
+CONF_MAX_AGE = "max_age"
+
+FIND_RESORTS_SCHEMA = vol.Schema(
+    {
+        vol.Inclusive(CONF_LATITUDE, "location"): cv.latitude,
+        vol.Inclusive(CONF_LONGITUDE, "location"): cv.longitude,
+        vol.Optional(CONF_RADIUS, default=DEFAULT_SEARCH_RADIUS): vol.All(
+            vol.Coerce(float), vol.Range(min=1)
+        ),
+        vol.Optional(CONF_LIMIT, default=DEFAULT_SEARCH_LIMIT): vol.All(
+            vol.Coerce(int), vol.Range(min=1)
+        ),
+    }
+)
+
+REFRESH_SCHEMA = vol.Schema(
+    {
+        **cv.TARGET_SERVICE_FIELDS,
+        vol.Optional(CONF_MAX_AGE): cv.positive_time_period,
+    }
+)
+
+
+class FnuggRefreshQueue:
+    """Merge refresh requests into one fetch per resort.
+
+    Requests made within ``delay`` seconds of each other are collected, and
+    every caller waits for the same round of fetches. A resort is fetched
+    unless a fetch is already running or its data is younger than the
+    ``max_age`` of every request for it. The fetches start together, so
+    batched resorts share one search request.
+    """
+
+    def __init__(self, hass: HomeAssistant, delay: float = REFRESH_DEBOUNCE) -> None:
+        """Initialize the queue."""
+        self._hass = hass
+        self._delay = delay
+        # Entry id -> largest data age that is still fresh, None to always fetch
+        self._pending: dict[str, timedelta | None] = {}
+        self._done: asyncio.Future | None = None
+        self._flush_handle: asyncio.TimerHandle | None = None
+
+    async def async_refresh(
+        self, entry_ids: set[str], max_age: timedelta | None = None
+    ) -> None:
+        """Refresh the resorts of ``entry_ids`` once the current round is flushed."""
+        for entry_id in entry_ids:
+            if entry_id not in self._pending:
+                self._pending[entry_id] = max_age
+            elif max_age is None or self._pending[entry_id] is None:
+                self._pending[entry_id] = None
+            else:
+                self._pending[entry_id] = min(max_age, self._pending[entry_id])
+        if self._done is None:
+            self._done = self._hass.loop.create_future()
+        if self._flush_handle is None:
+            self._flush_handle = self._hass.loop.call_later(self._delay, self._schedule_flush)
+        await asyncio.shield(self._done)
+
+    @callback
+    def _schedule_flush(self) -> None:
+        """Start fetching the collected resorts."""
+        self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        done, self._done = self._done, None
+        self._hass.async_create_task(self._async_flush(pending, done), f"{DOMAIN} refresh")
+
+    async def _async_flush(
+        self, pending: dict[str, timedelta | None], done: asyncio.Future
+    ) -> None:
+        """Fetch every resort that needs it."""
+        coordinators = []
+        for entry_id, max_age in pending.items():
+            coordinator = self._hass.data.get(DOMAIN, {}).get(entry_id)
+            if coordinator is None:
+                continue
+            if coordinator.fetch_in_progress:
+                _LOGGER.debug("Not refreshing %s, a fetch is running", coordinator.name)
+                continue
+            age = coordinator.data_age
+            if max_age is not None and age is not None and age <= max_age:
+                _LOGGER.debug("Not refreshing %s, data is %s old", coordinator.name, age)
+                continue
+            coordinators.append(coordinator)
+        _LOGGER.debug("Refreshing %d of %d requested resorts", len(coordinators), len(pending))
+        try:
+            await asyncio.gather(*(coordinator.async_refresh() for coordinator in coordinators))
+        finally:
+            done.set_result(None)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration's services."""
+    refresh_queue = FnuggRefreshQueue(hass)
+
+    async def async_find_resorts(call: ServiceCall) -> ServiceResponse:
+        """Return the resorts within a radius, nearest first."""
+        catalog = async_get_catalog(hass)
+        try:
+            await catalog.async_get_resorts()
+        except FnuggApiError as err:
+            raise HomeAssistantError(f"Could not load the resort catalog: {err}") from err
+        resorts = catalog.nearest(
+            call.data.get(CONF_LATITUDE, hass.config.latitude),
+            call.data.get(CONF_LONGITUDE, hass.config.longitude),
+            call.data[CONF_LIMIT],
+            call.data[CONF_RADIUS],
+        )
+        return {
+            "resorts": [
+                {"id": resort_id, "name": name, "distance": distance}
+                for resort_id, name, distance in resorts
+            ]
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_FIND_RESORTS,
+        async_find_resorts,
+        schema=FIND_RESORTS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def async_refresh(call: ServiceCall) -> None:
+        """Fetch fresh data for the targeted resorts, or all of them."""
+        loaded = {
+            entry.entry_id
+            for entry in hass.config_entries.async_entries(DOMAIN)
+            if entry.entry_id in hass.data.get(DOMAIN, {})
+        }
+        if any(key in call.data for key in (ATTR_AREA_ID, ATTR_DEVICE_ID, ATTR_ENTITY_ID)):
+            entry_ids = await async_extract_config_entry_ids(hass, call) & loaded
+            if not entry_ids:
+                raise HomeAssistantError("No loaded Fnugg resort matches the target")
+        else:
+            entry_ids = loaded
+        await refresh_queue.async_refresh(entry_ids, call.data.get(CONF_MAX_AGE))
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_REFRESH, async_refresh, schema=REFRESH_SCHEMA
+    )
@@ -0,0 +1,114 @@
+"""Spatial index over resort coordinates.
+
+Resorts are placed on the unit sphere and kept in a static KD-tree, built
+once per catalog refresh. The straight-line (chord) distance between two
+points on the sphere grows with their great-circle distance, so the tree
+can prune by chord distance without longitude wrap-around or distortion
+near the poles. Queries only visit the branches that can hold a match.
+"""
+from __future__ import annotations
+
+import heapq
+import math
+from operator import itemgetter
+
+EARTH_RADIUS_KM = 6371.0
+
+_AXES = tuple(itemgetter(axis) for axis in range(3))
+
+
+def _to_unit(latitude: float, longitude: float) -> tuple[float, float, float]:
+    lat = math.radians(latitude)
+    lon = math.radians(longitude)
+    return (math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat))
+
+
+def _chord_squared(radius_km: float) -> float:
+    """Return the squared chord length of a great-circle distance."""
+    angle = min(radius_km / EARTH_RADIUS_KM, math.pi)
+    return (2 * math.sin(angle / 2)) ** 2
+
+
+def _distance_km(chord_squared: float) -> float:
+    return 2 * EARTH_RADIUS_KM * math.asin(min(math.sqrt(chord_squared) / 2, 1.0))
+
+
+class ResortIndex:
+    """Static KD-tree answering nearest and radius queries over resorts."""
+
+    def __init__(self, locations: dict[str, tuple[float, float]]) -> None:
+        """Build the tree from resort id -> (latitude, longitude)."""
+        self._points = [
+            (*_to_unit(latitude, longitude), resort_id)
+            for resort_id, (latitude, longitude) in locations.items()
+        ]
+        self._build(0, len(self._points), 0)
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def _build(self, low: int, high: int, axis: int) -> None:
+        """Order points[low:high] as a subtree split at its median on ``axis``."""
+        if high - low <= 1:
+            return
+        self._points[low:high] = sorted(self._points[low:high], key=_AXES[axis])
+        middle = (low + high) // 2
+        next_axis = (axis + 1) % 3
+        self._build(low, middle, next_axis)
+        self._build(middle + 1, high, next_axis)
+
+    def nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        limit: int | None = None,
+        radius_km: float | None = None,
+    ) -> list[tuple[str, float]]:
+        """Return (resort id, distance in km) pairs, nearest first.
+
+        At most ``limit`` resorts are returned, all within ``radius_km`` when
+        given. Without either, every resort is returned.
+        """
+        if limit is not None and limit <= 0:
+            return []
+        target = _to_unit(latitude, longitude)
+        radius = _chord_squared(radius_km) if radius_km is not None else math.inf
+        # Max-heap of the best matches so far, by negated squared chord
+        best: list[tuple[float, str]] = []
+
+        def bound() -> float:
+            if limit is not None and len(best) >= limit:
+                return min(radius, -best[0][0])
+            return radius
+
+        def search(low: int, high: int, axis: int) -> None:
+            if low >= high:
+                return
+            middle = (low + high) // 2
+            point = self._points[middle]
+            distance = (
+                (point[0] - target[0]) ** 2
+                + (point[1] - target[1]) ** 2
+                + (point[2] - target[2]) ** 2
+            )
+            if distance <= bound():
+                if limit is not None and len(best) >= limit:
+                    heapq.heapreplace(best, (-distance, point[3]))
+                else:
+                    heapq.heappush(best, (-distance, point[3]))
+            offset = target[axis] - point[axis]
+            next_axis = (axis + 1) % 3
+            if offset < 0:
+                search(low, middle, next_axis)
+                if offset * offset <= bound():
+                    search(middle + 1, high, next_axis)
+            else:
+                search(middle + 1, high, next_axis)
+                if offset * offset <= bound():
+                    search(low, middle, next_axis)
+
+        search(0, len(self._points), 0)
+        return [
+            (resort_id, round(_distance_km(-distance), 1))
+            for distance, resort_id in sorted(best, reverse=True)
+        ]